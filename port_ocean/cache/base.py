@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Any, Optional
+from typing import Any, AsyncIterator, Optional
 
 from port_ocean.core.models import CachingStorageMode
 
@@ -23,3 +23,39 @@ class CacheProvider(ABC):
     async def clear(self) -> None:
         """Clear all values from the cache."""
         pass
+
+
+class CachePagesWriter(ABC):
+    """Writes the pages of an iterator result to the cache as they arrive."""
+
+    @abstractmethod
+    async def append(self, page: list[Any]) -> None:
+        """Append a page to the result."""
+        pass
+
+    @abstractmethod
+    async def commit(self) -> None:
+        """Make the written pages visible under the key, replacing the previous result."""
+        pass
+
+    @abstractmethod
+    async def abort(self) -> None:
+        """Discard the written pages, never raises."""
+        pass
+
+
+class PagedCacheProvider(ABC):
+    """
+    Base class for cache providers that store the results of iterators as a sequence of pages,
+    which are written as they arrive and read back one at a time instead of as a single value.
+    """
+
+    @abstractmethod
+    def open_pages_writer(self, key: str) -> CachePagesWriter:
+        """Start writing the pages of an iterator result."""
+        pass
+
+    @abstractmethod
+    async def get_pages(self, key: str) -> Optional[AsyncIterator[list[Any]]]:
+        """Get an iterator over the pages of a result, None when the result isn't cached."""
+        pass
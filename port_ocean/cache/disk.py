@@ -1,10 +1,30 @@
-import pickle
+import asyncio
+import os
+import shutil
+import uuid
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, AsyncIterator, Optional
 
-from port_ocean.cache.base import CacheProvider
+from port_ocean.cache.base import CacheProvider, CachePagesWriter, PagedCacheProvider
 from port_ocean.cache.errors import FailedToReadCacheError, FailedToWriteCacheError
-from port_ocean.core.models import CachingStorageMode
+from port_ocean.cache.serializers import (
+    CacheSerializationError,
+    CacheSerializer,
+    JsonCacheSerializer,
+    PickleCacheSerializer,
+    get_cache_serializer,
+)
+from port_ocean.core.models import CachingSerializer, CachingStorageMode
+
+
+# Iterator results are stored as a directory of pages, written under a temporary name until they are committed
+PAGES_SUFFIX = ".pages"
+TEMP_SUFFIX = ".tmp"
+CACHE_FILE_PATTERNS = (
+    f"*{PickleCacheSerializer.FILE_SUFFIX}",
+    f"*{JsonCacheSerializer.FILE_SUFFIX}",
+    f"*{TEMP_SUFFIX}",
+)
 
 
 class FailedToReadCacheFileError(FailedToReadCacheError):
@@ -15,47 +35,149 @@ class FailedToWriteCacheFileError(FailedToWriteCacheError):
     pass
 
 
-class DiskCacheProvider(CacheProvider):
+def write_file_atomically(path: Path, data: bytes) -> None:
+    """Write to a temporary file and rename it over the path, so readers never see a partially written file"""
+    temp_path = path.with_name(f"{path.name}.{uuid.uuid4().hex}{TEMP_SUFFIX}")
+    try:
+        with open(temp_path, "wb") as f:
+            f.write(data)
+        os.replace(temp_path, path)
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
+
+
+class DiskCachePagesWriter(CachePagesWriter):
+    """
+    Writes every page to a file of its own in a temporary directory, off the event loop.
+    The directory is renamed to the directory of the key once committed, so readers never see a partial result.
+    """
+
+    def __init__(self, pages_path: Path, serializer: CacheSerializer) -> None:
+        self._pages_path = pages_path
+        self._serializer = serializer
+        self._temp_path = pages_path.with_name(
+            f"{pages_path.name}.{uuid.uuid4().hex}{TEMP_SUFFIX}"
+        )
+        self._pages_count = 0
+
+    def _write_page(self, page: list[Any], page_index: int) -> None:
+        data = self._serializer.dumps(page)
+        self._temp_path.mkdir(parents=True, exist_ok=True)
+        page_path = self._temp_path / f"{page_index:08d}{self._serializer.FILE_SUFFIX}"
+        page_path.write_bytes(data)
+
+    def _commit(self) -> None:
+        self._temp_path.mkdir(parents=True, exist_ok=True)
+        shutil.rmtree(self._pages_path, ignore_errors=True)
+        self._temp_path.rename(self._pages_path)
+
+    async def append(self, page: list[Any]) -> None:
+        page_index = self._pages_count
+        self._pages_count += 1
+        try:
+            await asyncio.to_thread(self._write_page, page, page_index)
+        except (CacheSerializationError, OSError) as e:
+            raise FailedToWriteCacheFileError(
+                f"Failed to write cache page: {self._temp_path}: {str(e)}"
+            )
+
+    async def commit(self) -> None:
+        try:
+            await asyncio.to_thread(self._commit)
+        except OSError as e:
+            raise FailedToWriteCacheFileError(
+                f"Failed to commit cache pages: {self._pages_path}: {str(e)}"
+            )
+
+    async def abort(self) -> None:
+        await asyncio.to_thread(shutil.rmtree, self._temp_path, True)
+
+
+class DiskCacheProvider(CacheProvider, PagedCacheProvider):
     STORAGE_TYPE = CachingStorageMode.disk
 
-    def __init__(self, cache_dir: str | None = None) -> None:
+    def __init__(
+        self,
+        cache_dir: str | None = None,
+        serializer: CachingSerializer = CachingSerializer.pickle,
+    ) -> None:
         if cache_dir is None:
             cache_dir = ".ocean_cache"
         self._cache_dir = Path(cache_dir)
         self._cache_dir.mkdir(parents=True, exist_ok=True)
+        self._serializer = get_cache_serializer(serializer)
 
     def _get_cache_path(self, key: str) -> Path:
-        return self._cache_dir / f"{key}.pkl"
+        return self._cache_dir / f"{key}{self._serializer.FILE_SUFFIX}"
 
-    async def get(self, key: str) -> Optional[Any]:
-        cache_path = self._get_cache_path(key)
-        if not cache_path.exists():
+    def _get_pages_path(self, key: str) -> Path:
+        return self._cache_dir / f"{key}{PAGES_SUFFIX}"
+
+    def _list_pages(self, pages_path: Path) -> list[Path] | None:
+        if not pages_path.is_dir():
             return None
+        return sorted(pages_path.glob(f"*{self._serializer.FILE_SUFFIX}"))
+
+    def _read(self, path: Path) -> Any:
+        return self._serializer.loads(path.read_bytes())
+
+    async def _read_pages(self, page_paths: list[Path]) -> AsyncIterator[list[Any]]:
+        for page_path in page_paths:
+            try:
+                yield await asyncio.to_thread(self._read, page_path)
+            except (CacheSerializationError, OSError) as e:
+                raise FailedToReadCacheFileError(
+                    f"Failed to read cache page: {page_path}: {str(e)}"
+                )
 
+    def open_pages_writer(self, key: str) -> DiskCachePagesWriter:
+        return DiskCachePagesWriter(self._get_pages_path(key), self._serializer)
+
+    async def get_pages(self, key: str) -> Optional[AsyncIterator[list[Any]]]:
+        page_paths = await asyncio.to_thread(
+            self._list_pages, self._get_pages_path(key)
+        )
+        if page_paths is None:
+            return None
+        return self._read_pages(page_paths)
+
+    async def get(self, key: str) -> Optional[Any]:
+        cache_path = self._get_cache_path(key)
         try:
-            with open(cache_path, "rb") as f:
-                return pickle.load(f)
-        except (pickle.PickleError, EOFError) as e:
+            return await asyncio.to_thread(self._read, cache_path)
+        except FileNotFoundError:
+            return None
+        except (CacheSerializationError, OSError) as e:
             raise FailedToReadCacheFileError(
                 f"Failed to read cache file: {cache_path}: {str(e)}"
             )
 
+    def _write(self, path: Path, value: Any) -> None:
+        write_file_atomically(path, self._serializer.dumps(value))
+
     async def set(self, key: str, value: Any) -> None:
         cache_path = self._get_cache_path(key)
         try:
-            with open(cache_path, "wb") as f:
-                pickle.dump(value, f)
-        except (pickle.PickleError, IOError) as e:
+            await asyncio.to_thread(self._write, cache_path, value)
+        except (CacheSerializationError, OSError) as e:
             raise FailedToWriteCacheFileError(
                 f"Failed to write cache file: {cache_path}: {str(e)}"
             )
 
-    async def clear(self) -> None:
-        try:
-            for cache_file in self._cache_dir.glob("*.pkl"):
+    def _clear(self) -> None:
+        # The cache directory is shared with other local stores, so only the files of the cache are removed
+        for pattern in CACHE_FILE_PATTERNS:
+            for cache_file in self._cache_dir.glob(pattern):
                 try:
                     cache_file.unlink()
                 except OSError:
                     pass
+        for pages_dir in self._cache_dir.glob(f"*{PAGES_SUFFIX}*"):
+            shutil.rmtree(pages_dir, ignore_errors=True)
+
+    async def clear(self) -> None:
+        try:
+            await asyncio.to_thread(self._clear)
         except OSError:
             pass
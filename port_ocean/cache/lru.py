@@ -0,0 +1,151 @@
+import sys
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, NamedTuple, Optional
+
+from loguru import logger
+
+from port_ocean.cache.base import CacheProvider
+from port_ocean.core.models import CachingStorageMode
+
+
+def estimate_size_in_bytes(value: Any) -> int:
+    """
+    Estimate the memory a value takes, including the containers and the strings it references.
+    Objects other than the builtin containers are counted by their shallow size.
+    """
+    size = 0
+    seen: set[int] = set()
+    stack = [value]
+    while stack:
+        current = stack.pop()
+        if id(current) in seen:
+            continue
+        seen.add(id(current))
+        size += sys.getsizeof(current)
+        if isinstance(current, dict):
+            stack.extend(current.keys())
+            stack.extend(current.values())
+        elif isinstance(current, (list, tuple, set, frozenset)):
+            stack.extend(current)
+    return size
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    entries: int = 0
+    size_in_bytes: int = 0
+
+
+class _CacheEntry(NamedTuple):
+    value: Any
+    size_in_bytes: int
+    expires_at: float | None
+
+
+class LRUCacheProvider(CacheProvider):
+    """
+    An in-memory cache provider that is bounded by the number of values and by their estimated size.
+
+    The least recently used values are evicted once a limit is exceeded, values that are larger than the max size
+    in bytes aren't cached at all, and values expire after their time to live.
+
+    Args:
+        max_entries: The max number of cached values, unlimited when None
+        max_size_in_bytes: The max estimated size of the cached values, unlimited when None
+        ttl_seconds: The default time to live of the cached values, unlimited when None
+        on_stats_update: Called with the stats of the cache whenever they change
+    """
+
+    STORAGE_TYPE = CachingStorageMode.lru
+
+    def __init__(
+        self,
+        max_entries: int | None = None,
+        max_size_in_bytes: int | None = None,
+        ttl_seconds: float | None = None,
+        on_stats_update: Callable[[CacheStats], None] | None = None,
+    ) -> None:
+        self.max_entries = max_entries
+        self.max_size_in_bytes = max_size_in_bytes
+        self.ttl_seconds = ttl_seconds
+        self.on_stats_update = on_stats_update
+        self.stats = CacheStats()
+        self._entries: OrderedDict[str, _CacheEntry] = OrderedDict()
+
+    def _report_stats(self) -> None:
+        self.stats.entries = len(self._entries)
+        if self.on_stats_update:
+            self.on_stats_update(self.stats)
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        self.stats.size_in_bytes -= entry.size_in_bytes
+
+    def _evict(self) -> None:
+        while self._entries and (
+            (self.max_entries is not None and len(self._entries) > self.max_entries)
+            or (
+                self.max_size_in_bytes is not None
+                and self.stats.size_in_bytes > self.max_size_in_bytes
+            )
+        ):
+            self._remove(next(iter(self._entries)))
+            self.stats.evictions += 1
+
+    async def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is not None and (
+            entry.expires_at is None or entry.expires_at > time.monotonic()
+        ):
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+            self._report_stats()
+            return entry.value
+
+        if entry is not None:
+            self._remove(key)
+        self.stats.misses += 1
+        self._report_stats()
+        return None
+
+    async def set(self, key: str, value: Any, ttl_seconds: float | None = None) -> None:
+        """
+        Set a value in the cache.
+
+        :param ttl_seconds: The time to live of the value, defaults to the time to live of the cache
+        """
+        if key in self._entries:
+            self._remove(key)
+
+        size_in_bytes = estimate_size_in_bytes(value)
+        if (
+            self.max_size_in_bytes is not None
+            and size_in_bytes > self.max_size_in_bytes
+        ):
+            logger.debug(
+                f"Skipping caching {key}, its size exceeds the max cache size",
+                size_in_bytes=size_in_bytes,
+                max_size_in_bytes=self.max_size_in_bytes,
+            )
+            self._report_stats()
+            return
+
+        ttl_seconds = ttl_seconds if ttl_seconds is not None else self.ttl_seconds
+        self._entries[key] = _CacheEntry(
+            value,
+            size_in_bytes,
+            time.monotonic() + ttl_seconds if ttl_seconds is not None else None,
+        )
+        self.stats.size_in_bytes += size_in_bytes
+        self._evict()
+        self._report_stats()
+
+    async def clear(self) -> None:
+        self._entries.clear()
+        self.stats.size_in_bytes = 0
+        self._report_stats()
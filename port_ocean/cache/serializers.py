@@ -0,0 +1,70 @@
+import pickle
+from abc import ABC, abstractmethod
+from typing import Any
+
+from port_ocean.core.models import CachingSerializer
+from port_ocean.utils.serialization import dumps_json, loads_json
+
+
+class CacheSerializationError(Exception):
+    pass
+
+
+class CacheSerializer(ABC):
+    """Converts the cached values to and from the bytes that are stored on the disk."""
+
+    FILE_SUFFIX: str
+
+    @abstractmethod
+    def dumps(self, value: Any) -> bytes:
+        pass
+
+    @abstractmethod
+    def loads(self, data: bytes) -> Any:
+        pass
+
+
+class PickleCacheSerializer(CacheSerializer):
+    """Supports any picklable value."""
+
+    FILE_SUFFIX = ".pkl"
+
+    def dumps(self, value: Any) -> bytes:
+        try:
+            return pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PickleError, AttributeError, TypeError) as e:
+            raise CacheSerializationError(str(e))
+
+    def loads(self, data: bytes) -> Any:
+        try:
+            return pickle.loads(data)
+        except Exception as e:
+            # A corrupted pickle can fail with almost any error
+            raise CacheSerializationError(str(e))
+
+
+class JsonCacheSerializer(CacheSerializer):
+    """
+    Faster and more compact than pickle when orjson is installed, but only supports JSON values,
+    tuples are read back as lists and values that aren't JSON serializable fail to be cached.
+    """
+
+    FILE_SUFFIX = ".json"
+
+    def dumps(self, value: Any) -> bytes:
+        try:
+            return dumps_json(value, default=None)
+        except (TypeError, ValueError) as e:
+            raise CacheSerializationError(str(e))
+
+    def loads(self, data: bytes) -> Any:
+        try:
+            return loads_json(data)
+        except ValueError as e:
+            raise CacheSerializationError(str(e))
+
+
+def get_cache_serializer(serializer: CachingSerializer) -> CacheSerializer:
+    if serializer == CachingSerializer.json:
+        return JsonCacheSerializer()
+    return PickleCacheSerializer()
@@ -0,0 +1,163 @@
+import asyncio
+import time
+
+from loguru import logger
+from starlette import status
+
+# Requests that are faster than this are never considered slow, regardless of the fastest request observed
+BATCH_CONTROLLER_MIN_SLOW_LATENCY_SECONDS = 1.0
+# A request is considered slow when it takes more than this multiplier of the fastest request observed
+BATCH_CONTROLLER_LATENCY_TOLERANCE = 2.0
+# The part of the max batch size in bytes that is added back after every successful request
+BATCH_CONTROLLER_SIZE_INCREASE_RATIO = 1 / 16
+
+
+class AdaptiveBatchController:
+    """
+    Adapts the size and the concurrency of the bulk requests of a single blueprint to the responses of Port.
+
+    The controller follows the AIMD scheme of TCP congestion control: every successful request increases the
+    limits additively, while a 413 response halves the batch size and a 429 response, a server error or a slow
+    request halves the number of requests in flight. Until the first congestion the concurrency grows by one
+    for every successful request, so it reaches the capacity of Port within a few round trips.
+    Decreases are applied once per round trip, the responses of the requests that were sent before the last
+    decrease are already accounted for.
+
+    Args:
+        max_batch_length: The max number of entities in a batch
+        max_batch_size_in_bytes: The max size in bytes of the entities in a batch
+        max_concurrency: The max number of requests in flight
+        initial_concurrency: The number of requests in flight before any response is observed
+    """
+
+    def __init__(
+        self,
+        max_batch_length: int,
+        max_batch_size_in_bytes: int,
+        max_concurrency: int,
+        initial_concurrency: int = 1,
+    ) -> None:
+        self.max_batch_length = max_batch_length
+        self.max_batch_size_in_bytes = max_batch_size_in_bytes
+        self.max_concurrency = max_concurrency
+        self.batch_length = max_batch_length
+        self.batch_size_in_bytes = max_batch_size_in_bytes
+        # Kept as a float so the concurrency grows by one for every round trip of successful requests
+        self._concurrency = float(min(initial_concurrency, max_concurrency))
+        self._slow_start = True
+        self._min_latency: float | None = None
+        self._last_decrease_at = float("-inf")
+        self._in_flight = 0
+        self._condition = asyncio.Condition()
+
+    @property
+    def concurrency(self) -> int:
+        return max(1, int(self._concurrency))
+
+    async def acquire(self) -> None:
+        """Wait until another request can be sent without exceeding the concurrency"""
+        async with self._condition:
+            await self._condition.wait_for(lambda: self._in_flight < self.concurrency)
+            self._in_flight += 1
+
+    async def release(self) -> None:
+        async with self._condition:
+            self._in_flight -= 1
+            self._condition.notify_all()
+
+    def get_batch_end(
+        self,
+        entities_sizes: list[int],
+        start: int,
+        max_batch_length: int | None = None,
+    ) -> int:
+        """
+        Get the end index of the next batch that starts at the given index.
+        The batch is never empty, even when its first entity exceeds the batch size in bytes by itself.
+        """
+        batch_length = self.batch_length
+        if max_batch_length is not None:
+            batch_length = min(batch_length, max_batch_length)
+
+        end = start + 1
+        batch_size_in_bytes = entities_sizes[start]
+        while (
+            end < len(entities_sizes)
+            and end - start < batch_length
+            and batch_size_in_bytes + entities_sizes[end] <= self.batch_size_in_bytes
+        ):
+            batch_size_in_bytes += entities_sizes[end]
+            end += 1
+        return end
+
+    def record_response(
+        self,
+        status_code: int,
+        sent_at: float,
+        payload_size_in_bytes: int,
+        entities_count: int,
+    ) -> None:
+        """
+        Adapt the limits to the response of a request.
+
+        :param status_code: The status code of the response
+        :param sent_at: The time.monotonic() in which the request was sent
+        :param payload_size_in_bytes: The size of the request payload
+        :param entities_count: The number of entities in the request
+        """
+        if status_code == status.HTTP_413_REQUEST_ENTITY_TOO_LARGE:
+            # The payload is too large regardless of the load, so the limits are halved relative to the rejected
+            # payload rather than to their current value, concurrent rejections don't shrink them any further
+            self.batch_size_in_bytes = max(
+                1, min(self.batch_size_in_bytes, payload_size_in_bytes // 2)
+            )
+            self.batch_length = max(1, min(self.batch_length, entities_count // 2))
+            logger.debug(
+                "Port rejected a too large batch, decreasing the batch size",
+                batch_length=self.batch_length,
+                batch_size_in_bytes=self.batch_size_in_bytes,
+            )
+            return
+
+        latency = time.monotonic() - sent_at
+        if (
+            status_code == status.HTTP_429_TOO_MANY_REQUESTS
+            or status_code >= status.HTTP_500_INTERNAL_SERVER_ERROR
+        ):
+            self.record_congestion(sent_at)
+            return
+        if status_code >= status.HTTP_400_BAD_REQUEST:
+            return
+
+        if self._min_latency is None or latency < self._min_latency:
+            self._min_latency = latency
+        if latency > max(
+            BATCH_CONTROLLER_MIN_SLOW_LATENCY_SECONDS,
+            self._min_latency * BATCH_CONTROLLER_LATENCY_TOLERANCE,
+        ):
+            self.record_congestion(sent_at)
+            return
+
+        if self._slow_start:
+            self._concurrency += 1
+        else:
+            self._concurrency += 1 / self._concurrency
+        self._concurrency = min(self._concurrency, self.max_concurrency)
+        self.batch_length = min(self.batch_length + 1, self.max_batch_length)
+        self.batch_size_in_bytes = min(
+            self.batch_size_in_bytes
+            + int(self.max_batch_size_in_bytes * BATCH_CONTROLLER_SIZE_INCREASE_RATIO),
+            self.max_batch_size_in_bytes,
+        )
+
+    def record_congestion(self, sent_at: float) -> None:
+        """Halve the concurrency, unless it was already halved after the request was sent"""
+        if sent_at < self._last_decrease_at:
+            return
+        self._slow_start = False
+        self._concurrency = max(1.0, self._concurrency / 2)
+        self._last_decrease_at = time.monotonic()
+        logger.debug(
+            "Port is congested, decreasing the number of concurrent requests",
+            concurrency=self.concurrency,
+        )
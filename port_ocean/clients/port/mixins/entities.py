@@ -1,18 +1,22 @@
 import asyncio
-from typing import Any, Literal
+import time
+from collections import defaultdict
+from contextlib import aclosing
+from typing import Any, AsyncGenerator, Literal
 from urllib.parse import quote_plus
-import json
 
 import httpx
 from loguru import logger
 from port_ocean.context.ocean import ocean
 from port_ocean.clients.port.authentication import PortAuthentication
+from port_ocean.clients.port.batch_controller import AdaptiveBatchController
 from port_ocean.clients.port.types import RequestOptions, UserAgentType
 from port_ocean.clients.port.utils import (
     handle_port_status_code,
     PORT_HTTP_MAX_CONNECTIONS_LIMIT,
 )
 from port_ocean.core.models import (
+    BulkDeleteResponse,
     BulkUpsertResponse,
     Entity,
     PortAPIErrorMessage,
@@ -20,10 +24,11 @@ from port_ocean.core.models import (
 from starlette import status
 
 from port_ocean.helpers.metric.metric import MetricPhase, MetricType
+from port_ocean.utils.serialization import dumps_json
 
-ENTITIES_BULK_SAMPLES_SIZE = 10
-ENTITIES_BULK_ESTIMATED_SIZE_MULTIPLIER = 1.5
-ENTITIES_BULK_MINIMUM_BATCH_SIZE = 1
+ENTITIES_BULK_INITIAL_CONCURRENCY = 10
+ENTITIES_BULK_DELETE_MAX_LENGTH = 100
+SEARCH_ENTITIES_BATCH_SIZE = 1000
 
 
 class EntityClientMixin:
@@ -36,42 +41,27 @@ class EntityClientMixin:
         self.semaphore = asyncio.Semaphore(
             round(0.5 * PORT_HTTP_MAX_CONNECTIONS_LIMIT)
         )  # 50% of the max connections limit in order to avoid overloading port
-
-    def calculate_entities_batch_size(self, entities: list[Entity]) -> int:
-        """
-        Calculate the optimal batch size based on entity size and configured limits.
-
-        Args:
-            entities: List of entities to calculate batch size for
-
-        Returns:
-            int: The optimal batch size to use
-        """
-        if not entities:
-            return ENTITIES_BULK_MINIMUM_BATCH_SIZE
-
-        # Calculate average entity size from a sample
-        SAMPLE_SIZE = min(ENTITIES_BULK_SAMPLES_SIZE, len(entities))
-        sample_entities = entities[:SAMPLE_SIZE]
-        average_entity_size = (
-            sum(
-                len(json.dumps(entity.dict(exclude_unset=True, by_alias=True)).encode())
-                for entity in sample_entities
+        # The bulk upserts of every blueprint adapt their batch size and concurrency to the responses of Port,
+        # below the configured limits and the semaphore
+        self._batch_controllers: dict[str, AdaptiveBatchController] = {}
+
+    def _get_batch_controller(self, blueprint: str) -> AdaptiveBatchController:
+        if blueprint not in self._batch_controllers:
+            self._batch_controllers[blueprint] = AdaptiveBatchController(
+                max_batch_length=ocean.config.upsert_entities_batch_max_length,
+                max_batch_size_in_bytes=ocean.config.upsert_entities_batch_max_size_in_bytes,
+                max_concurrency=round(0.5 * PORT_HTTP_MAX_CONNECTIONS_LIMIT),
+                initial_concurrency=ENTITIES_BULK_INITIAL_CONCURRENCY,
             )
-            / SAMPLE_SIZE
-        )
+        return self._batch_controllers[blueprint]
 
-        # Use a conservative estimate to ensure we stay under the limit
-        estimated_entity_size = int(
-            average_entity_size * ENTITIES_BULK_ESTIMATED_SIZE_MULTIPLIER
-        )
-        max_entities_per_batch = min(
-            ocean.config.upsert_entities_batch_max_length,
-            ocean.config.upsert_entities_batch_max_size_in_bytes
-            // estimated_entity_size,
-        )
+    @staticmethod
+    def _encode_entity(entity: Entity) -> bytes:
+        return dumps_json(entity.dict(exclude_unset=True, by_alias=True))
 
-        return max(ENTITIES_BULK_MINIMUM_BATCH_SIZE, max_entities_per_batch)
+    @staticmethod
+    def _build_bulk_upsert_body(encoded_entities: list[bytes]) -> bytes:
+        return b'{"entities":[' + b",".join(encoded_entities) + b"]}"
 
     async def upsert_entity(
         self,
@@ -175,6 +165,7 @@ class EntityClientMixin:
         request_options: RequestOptions,
         user_agent_type: UserAgentType | None = None,
         should_raise: bool = True,
+        encoded_entities: list[bytes] | None = None,
     ) -> list[tuple[bool | None, Entity]] | httpx.HTTPStatusError:
         """
         This function upserts a list of entities into Port.
@@ -193,12 +184,15 @@ class EntityClientMixin:
         :param request_options: A dictionary specifying how to upsert the entity
         :param user_agent_type: a UserAgentType specifying who is preforming the action
         :param should_raise: A boolean specifying whether the error should be raised or handled silently
+        :param encoded_entities: The entities already encoded to JSON, to avoid serializing them again
         :return: A list of tuples where each tuple contains:
             - First value: True if entity was created successfully, False if there was an error, None if there was an error and the entity use search identifier
             - Second value: The original entity (if failed) or the reduced entity with updated identifier (if successful)
         :return: httpx.HTTPStatusError if there was an HTTP error and should_raise is False
         """
         validation_only = request_options["validation_only"]
+        if encoded_entities is None:
+            encoded_entities = [self._encode_entity(entity) for entity in entities]
         async with self.semaphore:
             logger.debug(
                 f"{'Validating' if validation_only else 'Upserting'} {len(entities)} of blueprint: {blueprint}"
@@ -206,13 +200,8 @@ class EntityClientMixin:
             headers = await self.auth.headers(user_agent_type)
             response = await self.client.post(
                 f"{self.auth.api_url}/blueprints/{blueprint}/entities/bulk",
-                json={
-                    "entities": [
-                        entity.dict(exclude_unset=True, by_alias=True)
-                        for entity in entities
-                    ]
-                },
-                headers=headers,
+                content=self._build_bulk_upsert_body(encoded_entities),
+                headers={**headers, "Content-Type": "application/json"},
                 params={
                     "upsert": "true",
                     "merge": str(request_options["merge"]).lower(),
@@ -261,7 +250,6 @@ class EntityClientMixin:
 
         batch_results: list[tuple[bool | None, Entity]] = []
         for entity_index, original_entity in index_to_entity.items():
-            reduced_entity = self._reduce_entity(original_entity)
             if entity_index in successful_entities:
                 ocean.metrics.inc_metric(
                     name=MetricType.OBJECT_COUNT_NAME,
@@ -273,11 +261,15 @@ class EntityClientMixin:
                     value=1,
                 )
                 success_entity = successful_entities[entity_index]
-                # Create a copy of the original entity with the new identifier
-                updated_entity = reduced_entity.copy()
-                updated_entity.identifier = success_entity["identifier"]
+                # Reduce the original entity with the new identifier
+                updated_entity = self._reduce_entity(
+                    original_entity, success_entity["identifier"]
+                )
                 batch_results.append((True, updated_entity))
-            elif entity_index in error_entities:
+                continue
+
+            reduced_entity = self._reduce_entity(original_entity)
+            if entity_index in error_entities:
                 ocean.metrics.inc_metric(
                     name=MetricType.OBJECT_COUNT_NAME,
                     labels=[
@@ -330,65 +322,104 @@ class EntityClientMixin:
 
         return entities_results
 
-    async def upsert_entities_in_batches(
+    async def _upsert_entities_adaptively(
         self,
+        blueprint: str,
         entities: list[Entity],
+        encoded_entities: list[bytes],
         request_options: RequestOptions,
         user_agent_type: UserAgentType | None = None,
         should_raise: bool = True,
+        max_batch_length: int | None = None,
     ) -> list[tuple[bool, Entity]]:
-        """
-        This function upserts a list of entities into Port in batches.
-        The batch size is calculated based on both the number of entities and their size.
-        Batches are processed in parallel using asyncio.gather, with concurrency controlled by the semaphore.
-
-        :param entities: A list of Entities to be upserted
-        :param request_options: A dictionary specifying how to upsert the entity
-        :param user_agent_type: a UserAgentType specifying who is preforming the action
-        :param should_raise: A boolean specifying whether the error should be raised or handled silently
-        :return: A list of tuples where each tuple contains:
-            - First value: True if entity was created successfully, False if there was an error
-            - Second value: The reduced entity with updated identifier (if successful) or the original entity (if failed)
-        """
-        entities_results: list[tuple[bool, Entity]] = []
-        blueprint = entities[0].blueprint
-
-        bulk_size = self.calculate_entities_batch_size(entities)
-        bulks = [
-            entities[i : i + bulk_size] for i in range(0, len(entities), bulk_size)
-        ]
-
-        bulk_results = await asyncio.gather(
-            *(
-                self.upsert_entities_bulk(
+        batch_controller = self._get_batch_controller(blueprint)
+        entities_sizes = [len(encoded_entity) for encoded_entity in encoded_entities]
+
+        async def upsert_bulk(
+            bulk: list[Entity], encoded_bulk: list[bytes], bulk_size_in_bytes: int
+        ) -> list[tuple[bool | None, Entity]] | httpx.HTTPStatusError:
+            sent_at = time.monotonic()
+            try:
+                result = await self.upsert_entities_bulk(
                     blueprint,
                     bulk,
                     request_options,
                     user_agent_type,
                     should_raise=should_raise,
+                    encoded_entities=encoded_bulk,
                 )
-                for bulk in bulks
-            ),
-            return_exceptions=True,
-        )
+            except httpx.HTTPStatusError as error:
+                batch_controller.record_response(
+                    error.response.status_code, sent_at, bulk_size_in_bytes, len(bulk)
+                )
+                raise
+            except httpx.TimeoutException:
+                batch_controller.record_congestion(sent_at)
+                raise
+            finally:
+                await batch_controller.release()
+
+            batch_controller.record_response(
+                (
+                    result.response.status_code
+                    if isinstance(result, httpx.HTTPStatusError)
+                    else httpx.codes.OK
+                ),
+                sent_at,
+                bulk_size_in_bytes,
+                len(bulk),
+            )
+            return result
+
+        # Every batch is formed once a request can be sent, so it follows the limits adapted by the responses
+        # of the batches that were sent before it
+        bulks: list[tuple[list[Entity], list[bytes]]] = []
+        bulk_tasks = []
+        start = 0
+        while start < len(entities):
+            await batch_controller.acquire()
+            end = batch_controller.get_batch_end(
+                entities_sizes, start, max_batch_length
+            )
+            bulk, encoded_bulk = entities[start:end], encoded_entities[start:end]
+            bulks.append((bulk, encoded_bulk))
+            bulk_tasks.append(
+                asyncio.create_task(
+                    upsert_bulk(bulk, encoded_bulk, sum(entities_sizes[start:end]))
+                )
+            )
+            start = end
+
+        bulk_results = await asyncio.gather(*bulk_tasks, return_exceptions=True)
 
-        for bulk, bulk_result in zip(bulks, bulk_results):
+        entities_results: list[tuple[bool, Entity]] = []
+        for (bulk, encoded_bulk), bulk_result in zip(bulks, bulk_results):
             if isinstance(bulk_result, httpx.HTTPStatusError) or isinstance(
                 bulk_result, Exception
             ):
                 if should_raise:
                     raise bulk_result
-                # If should_raise is False, retry batch in sequential order as a fallback only for 413 errors
+                # If should_raise is False, retry a batch that was too large in smaller batches,
+                # down to upserting its entities individually
                 if (
                     isinstance(bulk_result, httpx.HTTPStatusError)
                     and bulk_result.response.status_code == 413
                 ):
-                    individual_upsert_results = (
-                        await self._upsert_entities_batch_individually(
+                    if len(bulk) > 1:
+                        retry_results = await self._upsert_entities_adaptively(
+                            blueprint,
+                            bulk,
+                            encoded_bulk,
+                            request_options,
+                            user_agent_type,
+                            should_raise,
+                            max_batch_length=len(bulk) // 2,
+                        )
+                    else:
+                        retry_results = await self._upsert_entities_batch_individually(
                             bulk, request_options, user_agent_type, should_raise
                         )
-                    )
-                    entities_results.extend(individual_upsert_results)
+                    entities_results.extend(retry_results)
                 else:
                     # For other errors, mark all entities in the batch as failed
                     for entity in bulk:
@@ -410,6 +441,41 @@ class EntityClientMixin:
 
         return entities_results
 
+    async def upsert_entities_in_batches(
+        self,
+        entities: list[Entity],
+        request_options: RequestOptions,
+        user_agent_type: UserAgentType | None = None,
+        should_raise: bool = True,
+    ) -> list[tuple[bool, Entity]]:
+        """
+        This function upserts a list of entities of the same blueprint into Port in batches.
+        The size and the concurrency of the batches adapt at runtime to the latency and the responses of Port,
+        bounded by the configured max batch length and max batch size in bytes.
+        A batch that is too large for Port is upserted again in smaller batches, and entity by entity as a last resort.
+        Every entity is encoded to JSON once, its encoded size is used for batching and the request bodies
+        are joined from the encoded entities.
+
+        :param entities: A list of Entities to be upserted
+        :param request_options: A dictionary specifying how to upsert the entity
+        :param user_agent_type: a UserAgentType specifying who is preforming the action
+        :param should_raise: A boolean specifying whether the error should be raised or handled silently
+        :return: A list of tuples where each tuple contains:
+            - First value: True if entity was created successfully, False if there was an error
+            - Second value: The reduced entity with updated identifier (if successful) or the original entity (if failed)
+        """
+        if not entities:
+            return []
+
+        return await self._upsert_entities_adaptively(
+            entities[0].blueprint,
+            entities,
+            [self._encode_entity(entity) for entity in entities],
+            request_options,
+            user_agent_type,
+            should_raise,
+        )
+
     async def delete_entity(
         self,
         entity: Entity,
@@ -446,14 +512,95 @@ class EntityClientMixin:
 
             handle_port_status_code(response, should_raise)
 
-    async def batch_delete_entities(
+    async def delete_entities_bulk(
         self,
+        blueprint: str,
         entities: list[Entity],
         request_options: RequestOptions,
         user_agent_type: UserAgentType | None = None,
         should_raise: bool = True,
-    ) -> None:
-        await asyncio.gather(
+    ) -> list[tuple[bool, Entity]] | httpx.HTTPStatusError:
+        """
+        This function deletes a list of entities of the same blueprint from Port in a single request.
+
+        :param blueprint: The blueprint of the entities to be deleted
+        :param entities: A list of Entities to be deleted
+        :param request_options: A dictionary specifying how to delete the entities
+        :param user_agent_type: a UserAgentType specifying who is preforming the action
+        :param should_raise: A boolean specifying whether the error should be raised or handled silently
+        :return: A list of tuples where each tuple contains:
+            - First value: True if the entity was deleted (or was already deleted), False if there was an error
+            - Second value: The entity
+        :return: httpx.HTTPStatusError if there was an HTTP error and should_raise is False
+        """
+        async with self.semaphore:
+            logger.info(f"Deleting {len(entities)} entities of blueprint: {blueprint}")
+            response = await self.client.request(
+                "DELETE",
+                f"{self.auth.api_url}/blueprints/{blueprint}/bulk/entities",
+                json={"entities": [entity.identifier for entity in entities]},
+                headers=await self.auth.headers(user_agent_type),
+                params={
+                    "delete_dependents": str(
+                        request_options["delete_dependent_entities"]
+                    ).lower()
+                },
+            )
+        if response.is_error:
+            logger.error(
+                f"Error deleting {len(entities)} entities of blueprint: {blueprint}"
+            )
+            handle_port_status_code(response, should_raise)
+            return httpx.HTTPStatusError(
+                f"HTTP {response.status_code}",
+                request=response.request,
+                response=response,
+            )
+        return self._parse_delete_entities_batch_response(entities, response.json())
+
+    def _parse_delete_entities_batch_response(
+        self,
+        entities: list[Entity],
+        result: BulkDeleteResponse,
+    ) -> list[tuple[bool, Entity]]:
+        """
+        Parse the response from a bulk delete operation and map it to the original entities.
+
+        :param entities: The original entities
+        :param result: The response from the bulk delete operation
+        :return: A list of tuples containing the success status and the entity
+        """
+        error_entities = {
+            error["identifier"]: error for error in result.get("errors", [])
+        }
+
+        batch_results: list[tuple[bool, Entity]] = []
+        for entity in entities:
+            error = error_entities.get(entity.identifier)
+            if error is None:
+                batch_results.append((True, entity))
+            elif error.get("statusCode") == status.HTTP_404_NOT_FOUND:
+                logger.info(
+                    f"Failed to delete entity: {entity.identifier} of blueprint: {entity.blueprint},"
+                    f" as it was already deleted from port"
+                )
+                batch_results.append((True, entity))
+            else:
+                logger.error(
+                    f"Error deleting entity: {entity.identifier} of blueprint: {entity.blueprint}",
+                    error=error.get("message"),
+                )
+                batch_results.append((False, entity))
+        return batch_results
+
+    async def _delete_entities_batch_individually(
+        self,
+        entities: list[Entity],
+        request_options: RequestOptions,
+        user_agent_type: UserAgentType | None = None,
+        should_raise: bool = True,
+    ) -> list[tuple[bool, Entity]]:
+        delete_results = await asyncio.gather(
             *(
                 self.delete_entity(
                     entity,
@@ -466,12 +613,87 @@ class EntityClientMixin:
             return_exceptions=True,
         )
 
-    async def search_entities(
+        entities_results: list[tuple[bool, Entity]] = []
+        for entity, single_result in zip(entities, delete_results):
+            if isinstance(single_result, Exception) and should_raise:
+                raise single_result
+            entities_results.append((not isinstance(single_result, Exception), entity))
+        return entities_results
+
+    async def delete_entities_in_batches(
         self,
-        user_agent_type: UserAgentType,
-        query: dict[Any, Any] | None = None,
-        parameters_to_include: list[str] | None = None,
-    ) -> list[Entity]:
+        entities: list[Entity],
+        request_options: RequestOptions,
+        user_agent_type: UserAgentType | None = None,
+        should_raise: bool = True,
+    ) -> list[tuple[bool, Entity]]:
+        """
+        This function deletes a list of entities from Port in batches.
+        The entities are grouped by their blueprint and every batch is deleted with a single request.
+        Batches are processed in parallel using asyncio.gather, with concurrency controlled by the semaphore.
+        A batch that can't be deleted in bulk is deleted entity by entity as a fallback.
+
+        :param entities: A list of Entities to be deleted
+        :param request_options: A dictionary specifying how to delete the entities
+        :param user_agent_type: a UserAgentType specifying who is preforming the action
+        :param should_raise: A boolean specifying whether the error should be raised or handled silently
+        :return: A list of tuples where each tuple contains:
+            - First value: True if the entity was deleted, False if there was an error
+            - Second value: The entity
+        """
+        entities_by_blueprint: dict[str, list[Entity]] = defaultdict(list)
+        for entity in entities:
+            entities_by_blueprint[entity.blueprint].append(entity)
+
+        bulks = [
+            (blueprint, blueprint_entities[i : i + ENTITIES_BULK_DELETE_MAX_LENGTH])
+            for blueprint, blueprint_entities in entities_by_blueprint.items()
+            for i in range(0, len(blueprint_entities), ENTITIES_BULK_DELETE_MAX_LENGTH)
+        ]
+
+        bulk_results = await asyncio.gather(
+            *(
+                self.delete_entities_bulk(
+                    blueprint,
+                    bulk,
+                    request_options,
+                    user_agent_type,
+                    should_raise=should_raise,
+                )
+                for blueprint, bulk in bulks
+            ),
+            return_exceptions=True,
+        )
+
+        entities_results: list[tuple[bool, Entity]] = []
+        for (_, bulk), bulk_result in zip(bulks, bulk_results):
+            if isinstance(bulk_result, list):
+                entities_results.extend(bulk_result)
+                continue
+            if should_raise:
+                raise bulk_result
+            entities_results.extend(
+                await self._delete_entities_batch_individually(
+                    bulk, request_options, user_agent_type, should_raise
+                )
+            )
+
+        return entities_results
+
+    async def batch_delete_entities(
+        self,
+        entities: list[Entity],
+        request_options: RequestOptions,
+        user_agent_type: UserAgentType | None = None,
+        should_raise: bool = True,
+    ) -> None:
+        await self.delete_entities_in_batches(
+            entities, request_options, user_agent_type, should_raise=should_raise
+        )
+
+    def _build_search_query(
+        self, user_agent_type: UserAgentType, query: dict[Any, Any] | None = None
+    ) -> dict[Any, Any]:
         default_query = {
             "combinator": "and",
             "rules": [
@@ -489,23 +711,71 @@ class EntityClientMixin:
         }
 
         if query is None:
-            query = default_query
-        elif query.get("rules"):
+            return default_query
+        if query.get("rules"):
             query["rules"].append(default_query)
+        return query
 
+    async def search_entities_in_batches(
+        self,
+        user_agent_type: UserAgentType,
+        query: dict[Any, Any] | None = None,
+        parameters_to_include: list[str] | None = None,
+        batch_size: int = SEARCH_ENTITIES_BATCH_SIZE,
+    ) -> AsyncGenerator[list[Entity], None]:
+        """Search the entities a page at a time, yielding them in batches of up to `batch_size` entities.
+
+        Every page is requested with a `limit` and the `next` cursor of the previous page, and its entities
+        are parsed a batch at a time, so the whole search result is never held in memory.
+        """
+        query = self._build_search_query(user_agent_type, query)
         logger.info(f"Searching entities with query {query}")
-        response = await self.client.post(
-            f"{self.auth.api_url}/entities/search",
-            json=query,
-            headers=await self.auth.headers(user_agent_type),
-            params={
+
+        cursor: str | None = None
+        while True:
+            params: dict[str, Any] = {
                 "exclude_calculated_properties": "true",
                 "include": parameters_to_include or ["blueprint", "identifier"],
-            },
-            extensions={"retryable": True},
-        )
-        handle_port_status_code(response)
-        return [Entity.parse_obj(result) for result in response.json()["entities"]]
+                "limit": batch_size,
+            }
+            if cursor:
+                params["from"] = cursor
+
+            response = await self.client.post(
+                f"{self.auth.api_url}/entities/search",
+                json=query,
+                headers=await self.auth.headers(user_agent_type),
+                params=params,
+                extensions={"retryable": True},
+            )
+            handle_port_status_code(response)
+            page = response.json()
+            del response
+
+            raw_entities: list[dict[str, Any]] = page.get("entities", [])
+            cursor = page.get("next")
+            del page
+            for index in range(0, len(raw_entities), batch_size):
+                yield [
+                    Entity.parse_obj(result)
+                    for result in raw_entities[index : index + batch_size]
+                ]
+
+            if not cursor or not raw_entities:
+                return
+
+    async def search_entities(
+        self,
+        user_agent_type: UserAgentType,
+        query: dict[Any, Any] | None = None,
+        parameters_to_include: list[str] | None = None,
+    ) -> list[Entity]:
+        async with aclosing(
+            self.search_entities_in_batches(
+                user_agent_type, query, parameters_to_include
+            )
+        ) as batches:
+            return [entity async for entities in batches for entity in entities]
 
     async def search_batch_entities(
         self, user_agent_type: UserAgentType, entities_to_search: list[Entity]
@@ -539,26 +809,27 @@ class EntityClientMixin:
         )
 
     @staticmethod
-    def _reduce_entity(entity: Entity) -> Entity:
+    def _reduce_entity(entity: Entity, identifier: Any = None) -> Entity:
         """
         Reduces an entity to only keep identifier, blueprint and processed relations.
         This helps save memory by removing unnecessary data.
+        The reduced entity is constructed without validation, since its values were already validated.
 
         Args:
             entity: The entity to reduce
+            identifier: The identifier of the reduced entity, defaults to the identifier of the entity
 
         Returns:
             Entity: A new entity with only the essential data
         """
-        reduced_entity = Entity(
-            identifier=entity.identifier, blueprint=entity.blueprint
-        )
-
         # Turning dict typed relations (raw search relations) is required
         # for us to be able to successfully calculate the participation related entities
         # and ignore the ones that don't as they weren't upserted
-        reduced_entity.relations = {
-            key: None if isinstance(relation, dict) else relation
-            for key, relation in entity.relations.items()
-        }
-        return reduced_entity
+        return Entity.construct(
+            identifier=entity.identifier if identifier is None else identifier,
+            blueprint=entity.blueprint,
+            relations={
+                key: None if isinstance(relation, dict) else relation
+                for key, relation in entity.relations.items()
+            },
+        )
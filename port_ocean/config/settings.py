@@ -10,10 +10,15 @@ from pydantic.main import BaseModel
 from port_ocean.config.base import BaseOceanModel, BaseOceanSettings
 from port_ocean.core.event_listener import EventListenerSettingsType
 from port_ocean.core.models import (
+    CachingSerializer,
     CachingStorageMode,
     CreatePortResourcesOrigin,
+    EntityProcessorMode,
     Runtime,
     ProcessExecutionMode,
+    ReconciliationMode,
+    LiveEventsQueueMode,
+    LiveEventsOverflowPolicy,
 )
 from port_ocean.utils.misc import get_integration_name, get_spec_file
 
@@ -99,13 +104,78 @@ class IntegrationConfiguration(BaseOceanSettings, extra=Extra.allow):
     )
     max_event_processing_seconds: float = 90.0
     max_wait_seconds_before_shutdown: float = 5.0
+    # The number of workers processing the live events of every webhook path concurrently,
+    # events of the same group (see AbstractWebhookProcessor.get_event_group_id) are always processed in order
+    event_workers_per_path: int = Field(default=1, ge=1)
+    # Duplicate live events of the same group are dropped when they arrive within this window
+    # while the previous one is still waiting to be processed, 0 disables the coalescing
+    event_coalescing_window_seconds: float = Field(default=0.0, ge=0)
+    # disk persists the queued live events to a local sqlite database, so bursts are bounded by the disk
+    # and the events that weren't processed are replayed after a restart
+    live_events_queue_mode: LiveEventsQueueMode = LiveEventsQueueMode.memory
+    # The maximum number of live events, and of their bytes, queued for every webhook path, unlimited by default
+    live_events_max_queue_size: int | None = Field(default=None, ge=1)
+    live_events_max_queue_bytes: int | None = Field(default=None, ge=1)
+    # What to do with a live event that arrives when its queue is full: reject it with 429 and Retry-After,
+    # drop the oldest queued event instead, or drop it and resync its kinds once the queue drains
+    live_events_overflow_policy: LiveEventsOverflowPolicy = (
+        LiveEventsOverflowPolicy.reject
+    )
+    live_events_retry_after_seconds: int = Field(default=10, ge=1)
+    # lru keeps the cache in memory, bounded by the limits below
     caching_storage_mode: Optional[CachingStorageMode] = Field(
         default=CachingStorageMode.disk
     )
+    # The serializer of the disk caching storage mode, json is faster and more compact when orjson is installed
+    # but only supports JSON values
+    caching_serializer: CachingSerializer = CachingSerializer.pickle
+    # The limits of the lru caching storage mode, the least recently used values are evicted once they are
+    # exceeded, and values that are larger than the max size in bytes aren't cached at all
+    cache_max_entries: int | None = Field(default=10000, ge=1)
+    cache_max_size_in_bytes: int | None = Field(default=256 * 1024 * 1024, ge=1)
+    # The time to live of the values of the lru caching storage mode, unlimited by default
+    cache_ttl_seconds: float | None = Field(default=None, gt=0)
     process_execution_mode: Optional[ProcessExecutionMode] = Field(
         default=ProcessExecutionMode.multi_process
     )
-
+    # jq_batch maps each batch of raw results with a single JQ program instead of a JQ call per mapping field
+    # jq_process_pool does the same in a pool of worker processes, sharding every batch between them. The pool is
+    # reused across resources in the single_process mode, in the multi_process mode every resource starts its own
+    entity_processor_mode: EntityProcessorMode = EntityProcessorMode.jq
+    # The number of worker processes of the jq_process_pool entity processor, defaults to the number of CPUs
+    entity_processor_workers: int | None = Field(default=None, ge=1)
+
+    # The number of mapping resources that are processed concurrently during a resync,
+    # resources whose blueprints relate to each other are still processed in the mapping order
+    resync_resources_concurrency: int = Field(default=1, ge=1)
+    # Run the extract, transform and load stages of the batches of a resource concurrently, connected by queues
+    # of resync_pipeline_queue_size batches. Batches are loaded in the order they were generated only when every
+    # stage has a single worker
+    resync_pipeline_enabled: bool = False
+    resync_pipeline_queue_size: int = Field(default=2, ge=1)
+    # The number of generators of a resource that are consumed concurrently
+    resync_pipeline_extract_concurrency: int = Field(default=1, ge=1)
+    resync_pipeline_transform_concurrency: int = Field(default=1, ge=1)
+    resync_pipeline_load_concurrency: int = Field(default=1, ge=1)
+
+    # Skip upserting entities that didn't change since they were last upserted, based on a local fingerprint store
+    entity_fingerprint_store_enabled: bool = False
+    # The interval in seconds in which the fingerprint store is cleared and the entities are compared with Port again
+    entity_fingerprint_store_reconcile_interval: int = 24 * 60 * 60
+
+    # Revalidate the GET responses of http_async_client with conditional requests (If-None-Match / If-Modified-Since)
+    # instead of fetching them again, the responses are stored in a local sqlite database across resyncs
+    http_response_cache_enabled: bool = False
+    # The stored responses that weren't used for this number of seconds are removed
+    http_response_cache_max_age_seconds: int = Field(default=7 * 24 * 60 * 60, ge=1)
+
+    # disk spills the keys of the generated entities and of the entities in Port to a local sqlite database
+    # during the resync, so the entities to delete are calculated in bounded memory. When delete_dependent_entities
+    # is disabled, the keys of the entities to delete are still loaded at once to order them by their dependencies
+    reconciliation_mode: ReconciliationMode = ReconciliationMode.memory
+
+    # The upper limits of the bulk upsert requests, the batches of every blueprint adapt below them
+    # to the latency and the responses of Port at runtime
     upsert_entities_batch_max_length: int = 20
     upsert_entities_batch_max_size_in_bytes: int = 1024 * 1024
 
@@ -15,6 +15,7 @@ from uuid import uuid4
 
 from loguru import logger
 from port_ocean.core.utils.entity_topological_sorter import EntityTopologicalSorter
+from port_ocean.core.utils.generated_entities_store import GeneratedEntitiesStore
 from pydispatch import dispatcher  # type: ignore
 from werkzeug.local import LocalStack, LocalProxy
 
@@ -56,6 +57,7 @@ class EventContext:
     entity_topological_sorter: EntityTopologicalSorter = field(
         default_factory=EntityTopologicalSorter
     )
+    generated_entities_store: GeneratedEntitiesStore | None = None
 
     def on_abort(self, func: AbortCallbackFunction) -> None:
         self._on_abort_callbacks.append(func)
@@ -151,6 +153,7 @@ async def event_context(
         # inherit port app config from parent event, so it can be used in nested events
         _port_app_config=parent.port_app_config if parent else None,
         entity_topological_sorter=entity_topological_sorter,
+        generated_entities_store=(parent.generated_entities_store if parent else None),
     )
     _event_context_stack.push(new_event)
 
@@ -26,6 +26,7 @@ if TYPE_CHECKING:
     from port_ocean.core.integrations.base import BaseIntegration
     from port_ocean.ocean import Ocean
     from port_ocean.clients.port.client import PortClient
+    from port_ocean.core.utils.entity_fingerprint_store import EntityFingerprintStore
 
 from loguru import logger
 
@@ -72,6 +73,10 @@ class PortOceanContext:
     def port_client(self) -> "PortClient":
         return self.app.port_client
 
+    @property
+    def entity_fingerprint_store(self) -> "EntityFingerprintStore | None":
+        return self.app.entity_fingerprint_store
+
     @property
     def event_listener_type(
         self,
@@ -8,12 +8,20 @@ from .entity_processor.base import BaseEntityProcessor
 from .entity_processor.jq_entity_processor import (
     JQEntityProcessor,
 )
+from .entity_processor.jq_batch_entity_processor import (
+    JQBatchEntityProcessor,
+)
+from .entity_processor.jq_process_pool_entity_processor import (
+    JQProcessPoolEntityProcessor,
+)
 from .port_app_config.api import APIPortAppConfig
 from .port_app_config.base import BasePortAppConfig
 
 __all__ = [
     "BaseEntityProcessor",
     "JQEntityProcessor",
+    "JQBatchEntityProcessor",
+    "JQProcessPoolEntityProcessor",
     "BasePortAppConfig",
     "APIPortAppConfig",
     "BaseEntitiesStateApplier",
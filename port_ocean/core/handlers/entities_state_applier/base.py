@@ -3,7 +3,8 @@ from abc import abstractmethod
 from port_ocean.clients.port.types import UserAgentType
 from port_ocean.core.handlers.base import BaseHandler
 from port_ocean.core.models import Entity
-from port_ocean.core.ocean_types import EntityDiff
+from port_ocean.core.ocean_types import EntityDiff, EntityRefDiff
+from port_ocean.core.utils.generated_entities_store import GeneratedEntitiesStore
 
 
 class BaseEntitiesStateApplier(BaseHandler):
@@ -33,17 +34,47 @@ class BaseEntitiesStateApplier(BaseHandler):
     @abstractmethod
     async def delete_diff(
         self,
-        entities: EntityDiff,
+        entities: EntityDiff | EntityRefDiff,
         user_agent: UserAgentType,
     ) -> None:
         """Delete the specified entity differences from the state.
 
         Args:
-            entities (EntityDiff): The differences to be deleted.
+            entities (EntityDiff | EntityRefDiff): The differences to be deleted.
             user_agent (UserAgentType): The user agent responsible for the deletion.
         """
         pass
 
+    async def delete_generated_entities_diff(
+        self,
+        store: GeneratedEntitiesStore,
+        user_agent_type: UserAgentType,
+        entity_deletion_threshold: float | None = None,
+    ) -> None:
+        """Delete the entities that exist in Port but weren't generated, based on the keys spilled to the store.
+
+        Appliers that can't stream the deletion from the store fall back to `delete_diff` over the loaded keys.
+
+        Args:
+            store (GeneratedEntitiesStore): The store with the generated and the Port entities keys.
+            user_agent_type (UserAgentType): The user agent responsible for the deletion.
+            entity_deletion_threshold (float | None): The maximal rate of Port entities that may be deleted.
+        """
+        await self.delete_diff(
+            {
+                "before": [
+                    entity for batch in store.iter_port_entities() for entity in batch
+                ],
+                "after": [
+                    entity
+                    for batch in store.iter_generated_entities()
+                    for entity in batch
+                ],
+            },
+            user_agent_type,
+            entity_deletion_threshold,  # type: ignore[call-arg]
+        )
+
     @abstractmethod
     async def upsert(
         self, entities: list[Entity], user_agent_type: UserAgentType
@@ -1,3 +1,7 @@
+import asyncio
+from typing import Sequence
+
+import httpx
 from loguru import logger
 
 from port_ocean.clients.port.types import UserAgentType
@@ -6,15 +10,25 @@ from port_ocean.core.handlers.entities_state_applier.base import (
     BaseEntitiesStateApplier,
 )
 from port_ocean.core.handlers.entities_state_applier.port.get_related_entities import (
+    get_blueprints,
     get_related_entities,
+    get_relation_targets,
 )
 from port_ocean.context.ocean import ocean
 from port_ocean.helpers.metric.metric import MetricType, MetricPhase
 from port_ocean.helpers.metric.utils import TimeMetric
-from port_ocean.core.models import Entity
-from port_ocean.core.ocean_types import EntityDiff
-from port_ocean.core.utils.entity_topological_sorter import EntityTopologicalSorter
-from port_ocean.core.utils.utils import is_same_entity, get_port_diff
+from port_ocean.core.models import Entity, EntityPortDiff, EntityRef
+from port_ocean.core.ocean_types import EntityDiff, EntityRefDiff
+from port_ocean.core.utils.entity_topological_sorter import (
+    EntityTopologicalSorter,
+    RelationTargets,
+)
+from port_ocean.core.utils.generated_entities_store import GeneratedEntitiesStore
+from port_ocean.core.utils.utils import (
+    get_entities_keys,
+    get_entity_key,
+    get_port_diff,
+)
 
 
 class HttpEntitiesStateApplier(BaseEntitiesStateApplier):
@@ -25,43 +39,59 @@ class HttpEntitiesStateApplier(BaseEntitiesStateApplier):
     through HTTP requests.
     """
 
+    DELETE_BATCH_SIZE = 1000
+
     @TimeMetric(MetricPhase.DELETE)
     async def _safe_delete(
         self,
         entities_to_delete: list[Entity],
-        entities_to_protect: list[Entity],
+        entities_to_protect: Sequence[Entity | EntityRef],
         user_agent_type: UserAgentType,
     ) -> None:
         if not entities_to_delete:
             return
 
-        related_entities = await get_related_entities(
-            entities_to_protect, self.context.port_client
+        create_missing_related_entities = (
+            event.port_app_config.create_missing_related_entities
         )
+        # Related entities are only protected when create_missing_related_entities is enabled
+        related_entities_keys = (
+            get_entities_keys(
+                await get_related_entities(
+                    entities_to_protect, self.context.port_client
+                )
+            )
+            if create_missing_related_entities
+            else set()
+        )
+        protected_entities_keys = get_entities_keys(entities_to_protect)
 
         allowed_entities_to_delete = []
 
         for entity_to_delete in entities_to_delete:
-            is_part_of_related = any(
-                is_same_entity(entity, entity_to_delete) for entity in related_entities
-            )
-            is_part_of_created = any(
-                is_same_entity(entity, entity_to_delete)
-                for entity in entities_to_protect
-            )
-            if is_part_of_related:
-                if event.port_app_config.create_missing_related_entities:
-                    logger.info(
-                        f"Skipping entity {(entity_to_delete.identifier, entity_to_delete.blueprint)} because it is "
-                        f"related to created entities and create_missing_related_entities is enabled"
-                    )
-                else:
-                    allowed_entities_to_delete.append(entity_to_delete)
-            elif not is_part_of_created:
+            entity_key = get_entity_key(entity_to_delete)
+            if entity_key in related_entities_keys:
+                logger.info(
+                    f"Skipping entity {entity_key} because it is "
+                    f"related to created entities and create_missing_related_entities is enabled"
+                )
+            elif entity_key not in protected_entities_keys:
                 allowed_entities_to_delete.append(entity_to_delete)
 
         await self.delete(allowed_entities_to_delete, user_agent_type)
 
+    async def _get_relation_targets(
+        self, entities: list[Entity]
+    ) -> RelationTargets | None:
+        try:
+            return await get_relation_targets(entities, self.context.port_client)
+        except httpx.HTTPError as error:
+            logger.warning(
+                "Failed to fetch the relations of the blueprints, relating entities by their identifiers only",
+                error=str(error),
+            )
+            return None
+
     async def apply_diff(
         self,
         entities: EntityDiff,
@@ -79,11 +109,13 @@ class HttpEntitiesStateApplier(BaseEntitiesStateApplier):
 
     async def delete_diff(
         self,
-        entities: EntityDiff,
+        entities: EntityDiff | EntityRefDiff,
         user_agent_type: UserAgentType,
         entity_deletion_threshold: float | None = None,
     ) -> None:
-        diff = get_port_diff(entities["before"], entities["after"])
+        diff: EntityPortDiff[Entity | EntityRef] = get_port_diff(
+            entities["before"], entities["after"]
+        )
 
         if not diff.deleted:
             return
@@ -102,7 +134,15 @@ class HttpEntitiesStateApplier(BaseEntitiesStateApplier):
             entity_deletion_threshold is not None
             and deletion_rate <= entity_deletion_threshold
         ):
-            await self._safe_delete(diff.deleted, kept_entities, user_agent_type)
+            # Only the deleted entities are sent to Port, the references are converted to entities just for them
+            await self._safe_delete(
+                [
+                    entity.to_entity() if isinstance(entity, EntityRef) else entity
+                    for entity in diff.deleted
+                ],
+                kept_entities,
+                user_agent_type,
+            )
             ocean.metrics.inc_metric(
                 name=MetricType.OBJECT_COUNT_NAME,
                 labels=[
@@ -120,6 +160,106 @@ class HttpEntitiesStateApplier(BaseEntitiesStateApplier):
                 total_entities=len(entities),
             )
 
+    async def _resolve_related_entities(self, store: GeneratedEntitiesStore) -> None:
+        relations = await asyncio.to_thread(store.get_relations)
+        blueprints = await get_blueprints(
+            (blueprint for blueprint, _ in relations), self.context.port_client
+        )
+        relation_targets = {
+            (blueprint, relation): blueprint_relation.target
+            for blueprint, relation in relations
+            if (blueprint_relation := blueprints[blueprint].relations.get(relation))
+        }
+        await asyncio.to_thread(store.add_related_entities, relation_targets)
+
+    async def delete_generated_entities_diff(
+        self,
+        store: GeneratedEntitiesStore,
+        user_agent_type: UserAgentType,
+        entity_deletion_threshold: float | None = None,
+    ) -> None:
+        number_of_deleted_entities = await asyncio.to_thread(
+            store.count_deleted_entities
+        )
+        if not number_of_deleted_entities:
+            return
+
+        number_of_port_entities = await asyncio.to_thread(store.count_port_entities)
+        logger.info(
+            f"Determining entities to delete ({number_of_deleted_entities}/{number_of_port_entities})",
+            deleting_entities=number_of_deleted_entities,
+            keeping_entities=await asyncio.to_thread(store.count_generated_entities),
+            entity_deletion_threshold=entity_deletion_threshold,
+        )
+
+        deletion_rate = number_of_deleted_entities / number_of_port_entities
+        if (
+            entity_deletion_threshold is None
+            or deletion_rate > entity_deletion_threshold
+        ):
+            logger.info(
+                f"Skipping deletion of entities with deletion rate {deletion_rate}",
+                deletion_rate=deletion_rate,
+                deleting_entities=number_of_deleted_entities,
+                total_entities=number_of_port_entities,
+            )
+            return
+
+        await self._safe_delete_generated_entities_diff(store, user_agent_type)
+        ocean.metrics.inc_metric(
+            name=MetricType.OBJECT_COUNT_NAME,
+            labels=[
+                ocean.metrics.current_resource_kind(),
+                MetricPhase.DELETE,
+                MetricPhase.DeletionResult.DELETED,
+            ],
+            value=number_of_deleted_entities,
+        )
+
+    @TimeMetric(MetricPhase.DELETE)
+    async def _safe_delete_generated_entities_diff(
+        self, store: GeneratedEntitiesStore, user_agent_type: UserAgentType
+    ) -> None:
+        exclude_related = event.port_app_config.create_missing_related_entities
+        if exclude_related:
+            await self._resolve_related_entities(store)
+            number_of_deleted_entities = await asyncio.to_thread(
+                store.count_deleted_entities
+            )
+            skipped_entities = number_of_deleted_entities - await asyncio.to_thread(
+                store.count_deleted_entities, True
+            )
+            if skipped_entities:
+                logger.info(
+                    f"Skipping {skipped_entities} entities because they are related to created entities"
+                    " and create_missing_related_entities is enabled"
+                )
+
+        batches = store.iter_deleted_entities(self.DELETE_BATCH_SIZE, exclude_related)
+        if not event.port_app_config.delete_dependent_entities:
+            # The entities are deleted in their dependencies order, which requires all of them at once,
+            # only their keys are held in memory, and the entity deletion threshold bounds them to a fraction
+            # of the entities in Port
+            logger.info(
+                f"Loading the {await asyncio.to_thread(store.count_deleted_entities, exclude_related)} entities"
+                " to delete to order them by their dependencies, as delete_dependent_entities is disabled"
+            )
+            all_entities = await asyncio.to_thread(
+                lambda: [entity for batch in batches for entity in batch]
+            )
+            batches = iter([all_entities])
+
+        def read_next_batch() -> list[Entity] | None:
+            return next(batches, None)
+
+        # The deletion is paged by key order, deleting entities doesn't affect the pages that follow.
+        # Every page is read from the store in a thread, off the event loop
+        while (
+            entities_to_delete := await asyncio.to_thread(read_next_batch)
+        ) is not None:
+            await self.delete(entities_to_delete, user_agent_type)
+
+    @TimeMetric(MetricPhase.LOAD)
     async def upsert(
         self, entities: list[Entity], user_agent_type: UserAgentType
     ) -> list[Entity]:
@@ -139,28 +279,57 @@ class HttpEntitiesStateApplier(BaseEntitiesStateApplier):
                 modified_entities.append(entity)
             else:
                 event.entity_topological_sorter.register_entity(entity)
+
+        if fingerprint_store := self.context.entity_fingerprint_store:
+            # Entities that are identified by a search query have no key, and aren't recorded
+            upserted_keys = {
+                key
+                for entity in modified_entities
+                if (key := fingerprint_store.get_key(entity)) is not None
+            }
+            await asyncio.to_thread(
+                fingerprint_store.record,
+                [
+                    entity
+                    for entity in entities
+                    if fingerprint_store.get_key(entity) in upserted_keys
+                ],
+            )
         return modified_entities
 
     async def delete(
         self, entities: list[Entity], user_agent_type: UserAgentType
     ) -> None:
         logger.info(f"Deleting {len(entities)} entities")
+        if fingerprint_store := self.context.entity_fingerprint_store:
+            await asyncio.to_thread(fingerprint_store.forget, entities)
+        request_options = event.port_app_config.get_port_request_options()
         if event.port_app_config.delete_dependent_entities:
-            await self.context.port_client.batch_delete_entities(
-                entities,
-                event.port_app_config.get_port_request_options(),
-                user_agent_type,
-                should_raise=False,
-            )
+            deletion_levels = [entities]
         else:
-            ordered_deleted_entities = (
-                EntityTopologicalSorter.order_by_entities_dependencies(entities)
+            # Entities are deleted before the entities they relate to, and the entities of a level
+            # don't relate to each other, so every level is deleted concurrently
+            deletion_levels = list(
+                reversed(
+                    EntityTopologicalSorter.get_dependency_levels(
+                        entities, await self._get_relation_targets(entities)
+                    )
+                )
             )
 
-            for entity in ordered_deleted_entities:
-                await self.context.port_client.delete_entity(
-                    entity,
-                    event.port_app_config.get_port_request_options(),
+        failed_entities = 0
+        for level_entities in deletion_levels:
+            deletion_results = (
+                await self.context.port_client.delete_entities_in_batches(
+                    level_entities,
+                    request_options,
                     user_agent_type,
                     should_raise=False,
                 )
+            )
+            failed_entities += sum(
+                1 for is_deleted, _ in deletion_results if not is_deleted
+            )
+
+        if failed_entities:
+            logger.warning(f"Failed to delete {failed_entities} entities")
@@ -1,51 +1,86 @@
 import asyncio
 from collections import defaultdict
-from itertools import groupby
+from typing import Iterable, Sequence
 
 from port_ocean.clients.port.client import PortClient
-from port_ocean.core.models import Entity
+from port_ocean.context.event import event
+from port_ocean.core.models import Blueprint, Entity, EntityRef
+from port_ocean.core.utils.entity_topological_sorter import RelationTargets
+from port_ocean.exceptions.context import EventContextNotFoundError
 
+BLUEPRINTS_CACHE_ATTRIBUTE = "blueprints_cache"
 
-async def get_related_entities(
-    entities: list[Entity], port_client: PortClient
-) -> list[Entity]:
-    entities_with_relations = [entity for entity in entities if entity.relations]
-    blueprint_identifier_to_entity = dict(
-        groupby(
-            entities_with_relations,
-            key=lambda x: x.blueprint,
-        )
-    )
+
+def _get_blueprints_cache() -> dict[str, Blueprint]:
+    try:
+        return event.attributes.setdefault(BLUEPRINTS_CACHE_ATTRIBUTE, {})
+    except EventContextNotFoundError:
+        return {}
+
+
+async def get_blueprints(
+    blueprint_identifiers: Iterable[str], port_client: PortClient
+) -> dict[str, Blueprint]:
+    """Fetch the given blueprints, the blueprints are cached in the scope of the running event"""
+    blueprints_cache = _get_blueprints_cache()
+    blueprint_identifiers = set(blueprint_identifiers)
+    missing_identifiers = [
+        blueprint_identifier
+        for blueprint_identifier in blueprint_identifiers
+        if blueprint_identifier not in blueprints_cache
+    ]
     blueprints = await asyncio.gather(
         *(
             port_client.get_blueprint(blueprint_identifier)
-            for blueprint_identifier in blueprint_identifier_to_entity.keys()
+            for blueprint_identifier in missing_identifiers
         )
     )
-    entity_to_blueprint = [
-        (
-            entity,
-            next(
-                blueprint
-                for blueprint in blueprints
-                if blueprint.identifier == entity.blueprint
-            ),
-        )
-        for entity in entities_with_relations
-    ]
+    blueprints_cache.update(zip(missing_identifiers, blueprints))
+    return {
+        blueprint_identifier: blueprints_cache[blueprint_identifier]
+        for blueprint_identifier in blueprint_identifiers
+    }
+
 
-    blueprints_to_relations = defaultdict(list)
-    for entity, blueprint in entity_to_blueprint:
+async def get_related_entities(
+    entities: Sequence[Entity | EntityRef], port_client: PortClient
+) -> list[Entity]:
+    entities_with_relations = [entity for entity in entities if entity.relations]
+    blueprints = await get_blueprints(
+        (entity.blueprint for entity in entities_with_relations), port_client
+    )
+
+    # multiple entities can point to the same relation in the same blueprint, for performance reasons
+    # we want to avoid fetching the same relation multiple times
+    blueprints_to_relations: dict[str, set[str]] = defaultdict(set)
+    for entity in entities_with_relations:
+        blueprint = blueprints[entity.blueprint]
         for relation_name, relation in entity.relations.items():
             relation_blueprint = blueprint.relations[relation_name].target
-            blueprints_to_relations[relation_blueprint].extend(
-                relation if isinstance(relation, list) else [relation]
+            blueprints_to_relations[relation_blueprint].update(
+                identifier
+                for identifier in (
+                    relation if isinstance(relation, list) else [relation]
+                )
+                if isinstance(identifier, str)
             )
 
     return [
         Entity(identifier=relation, blueprint=blueprint)
         for blueprint, relations in blueprints_to_relations.items()
-        # multiple entities can point to the same relation in the same blueprint, for performance reasons
-        # we want to avoid fetching the same relation multiple times
-        for relation in set(relations)
+        for relation in relations
     ]
+
+
+async def get_relation_targets(
+    entities: list[Entity], port_client: PortClient
+) -> RelationTargets:
+    """Get the target blueprint of every relation of the blueprints of the given entities"""
+    blueprints = await get_blueprints(
+        (entity.blueprint for entity in entities if entity.relations), port_client
+    )
+    return {
+        (blueprint_identifier, relation_name): relation.target
+        for blueprint_identifier, blueprint in blueprints.items()
+        for relation_name, relation in blueprint.relations.items()
+    }
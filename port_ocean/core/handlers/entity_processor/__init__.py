@@ -1,7 +1,11 @@
 from .base import BaseEntityProcessor
 from .jq_entity_processor import JQEntityProcessor
+from .jq_batch_entity_processor import JQBatchEntityProcessor
+from .jq_process_pool_entity_processor import JQProcessPoolEntityProcessor
 
 __all__ = [
     "BaseEntityProcessor",
     "JQEntityProcessor",
+    "JQBatchEntityProcessor",
+    "JQProcessPoolEntityProcessor",
 ]
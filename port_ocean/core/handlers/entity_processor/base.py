@@ -53,3 +53,7 @@ class BaseEntityProcessor(BaseHandler):
             return await self._parse_items(
                 mapping, raw_data, parse_all, send_raw_data_examples_amount
             )
+
+    def shutdown(self) -> None:
+        """Release the resources of the processor, such as its worker processes."""
+        pass
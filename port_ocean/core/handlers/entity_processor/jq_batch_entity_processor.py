@@ -0,0 +1,230 @@
+import asyncio
+import json
+from typing import Any
+
+from loguru import logger
+
+from port_ocean.core.handlers.entity_processor.jq_entity_processor import (
+    JQEntityProcessor,
+    MappedEntity,
+)
+from port_ocean.core.ocean_types import RAW_ITEM
+from port_ocean.exceptions.core import EntityProcessorException
+
+SELECTOR_VALUE_KEY = "value"
+SELECTOR_ERROR_KEY = "error"
+
+
+class JQBatchEntityProcessor(JQEntityProcessor):
+    """Processes and parses entities using a single JQ program per resource mapping.
+
+    Instead of running every mapping expression of every raw item as a separate task, the whole
+    entity mapping (selector, identifier, title, blueprint, team, properties and relations) is compiled
+    into one JQ program that is evaluated over the entire raw batch in a single executor call.
+    Each expression is evaluated in isolation, so the mapped entities are identical to the ones
+    produced by the JQEntityProcessor.
+    """
+
+    @staticmethod
+    def _first_value_expression(pattern: str) -> str:
+        # Equivalent to `_search`, the first value of the pattern or null when it fails or has no output.
+        # The new lines allow the pattern to end with a comment
+        return f"(try ([first(\n{pattern}\n)] | .[0]) catch null)"
+
+    @classmethod
+    def _mapping_expression(cls, obj: Any) -> str:
+        """Build the JQ expression that constructs the mapped object, mirroring `_search_as_object`"""
+        if isinstance(obj, dict):
+            fields = ", ".join(
+                f"{json.dumps(key)}: {cls._mapping_expression(value)}"
+                for key, value in obj.items()
+            )
+            return f"{{{fields}}}"
+        if isinstance(obj, list):
+            if not all(isinstance(item, dict) for item in obj):
+                return "null"
+            return f"[{', '.join(cls._mapping_expression(item) for item in obj)}]"
+        if isinstance(obj, str):
+            return cls._first_value_expression(obj)
+        return "null"
+
+    @classmethod
+    def _build_program(
+        cls,
+        raw_entity_mappings: dict[str, Any],
+        items_to_parse: str | None,
+        selector_query: str,
+        parse_all: bool,
+    ) -> str:
+        """Build a JQ program that maps a batch (list) of raw items.
+
+        The program outputs a list with an entry per raw item. The entry is either a list of
+        [selector result, mapped entity] pairs, or the type of the `items_to_parse` result when it is not a list.
+        """
+        selector = (
+            f'(try {{"{SELECTOR_VALUE_KEY}": ([first(\n{selector_query}\n)] | .[0])}} '
+            f'catch {{"{SELECTOR_ERROR_KEY}": .}})'
+        )
+        should_map = (
+            "true" if parse_all else f"($__selector.{SELECTOR_VALUE_KEY} == true)"
+        )
+        entity = (
+            f"{selector} as $__selector | [$__selector, "
+            f"(if {should_map} then {cls._mapping_expression(raw_entity_mappings)} else null end)]"
+        )
+
+        if not items_to_parse:
+            return f"[.[] | [{entity}]]"
+
+        return (
+            "[.[] | . as $__data "
+            f"| {cls._first_value_expression(items_to_parse)} as $__items "
+            '| if ($__items | type) == "array" '
+            f'then [$__items[] | ({{"item": .}} + $__data) | {entity}] '
+            "else ($__items | type) end]"
+        )
+
+    @classmethod
+    def _collect_misconfigurations(
+        cls,
+        obj: dict[str, Any],
+        result: dict[str, Any],
+        misconfigurations: dict[str, str],
+    ) -> None:
+        """Mark the keys that were mapped to null, the same way `_search_as_object` does"""
+        for key, value in obj.items():
+            if isinstance(value, list):
+                mapped_list = result.get(key)
+                if isinstance(mapped_list, list):
+                    for item, mapped_item in zip(value, mapped_list):
+                        cls._collect_misconfigurations(
+                            item, mapped_item, misconfigurations
+                        )
+            elif isinstance(value, dict):
+                cls._collect_misconfigurations(
+                    value, result.get(key) or {}, misconfigurations
+                )
+            elif result.get(key) is None:
+                misconfigurations[key] = value
+
+    def _map_batch(
+        self,
+        program: Any,
+        raw_results: list[RAW_ITEM],
+        raw_entity_mappings: dict[str, Any],
+        items_to_parse: str | None,
+        parse_all: bool,
+        send_raw_data_examples_amount: int,
+    ) -> tuple[list[MappedEntity], list[Exception]]:
+        outputs = program.input_value(raw_results).first()
+        mapped_entities: list[MappedEntity] = []
+        errors: list[Exception] = []
+        examples_left = send_raw_data_examples_amount
+
+        for data, output in zip(raw_results, outputs):
+            if not isinstance(output, list):
+                logger.warning(
+                    f"Failed to parse items for JQ expression {items_to_parse}, Expected list but got {output}."
+                    f" Skipping..."
+                )
+                continue
+
+            for item_index, (selector, entity) in enumerate(output):
+                if SELECTOR_ERROR_KEY in selector:
+                    errors.append(
+                        EntityProcessorException(
+                            f"Failed to evaluate the selector query, error: {selector[SELECTOR_ERROR_KEY]}"
+                        )
+                    )
+                    continue
+
+                should_run = selector[SELECTOR_VALUE_KEY]
+                if not isinstance(should_run, bool):
+                    errors.append(
+                        EntityProcessorException(
+                            f"Expected boolean value, got value:{should_run} of type: {type(should_run)} instead"
+                        )
+                    )
+                    continue
+
+                if entity is None:
+                    mapped_entities.append(MappedEntity())
+                    continue
+
+                misconfigurations: dict[str, str] = {}
+                self._collect_misconfigurations(
+                    raw_entity_mappings, entity, misconfigurations
+                )
+                raw_data = None
+                # Only the raw data that is going to be sent as an example is reconstructed
+                if (
+                    should_run
+                    and examples_left > 0
+                    and entity.get("identifier")
+                    and entity.get("blueprint")
+                ):
+                    examples_left -= 1
+                    raw_data = self._get_raw_item(data, items_to_parse, item_index)
+
+                mapped_entities.append(
+                    MappedEntity(
+                        entity,
+                        did_entity_pass_selector=should_run,
+                        raw_data=raw_data,
+                        misconfigurations=misconfigurations,
+                    )
+                )
+
+        if errors:
+            logger.error(
+                f"Failed to calculate entities with {len(errors)} errors. errors: {errors}"
+            )
+        return mapped_entities, errors
+
+    def _get_raw_item(
+        self, data: dict[str, Any], items_to_parse: str | None, item_index: int
+    ) -> dict[str, Any]:
+        if not items_to_parse:
+            return data.copy()
+        items = self._compile(items_to_parse).input_value(data).first()
+        return {"item": items[item_index], **data}
+
+    async def _calculate_entities(
+        self,
+        raw_results: list[RAW_ITEM],
+        raw_entity_mappings: dict[str, Any],
+        items_to_parse: str | None,
+        selector_query: str,
+        parse_all: bool = False,
+        send_raw_data_examples_amount: int = 0,
+    ) -> tuple[list[MappedEntity], list[Exception]]:
+        try:
+            program = self._compile(
+                self._build_program(
+                    raw_entity_mappings, items_to_parse, selector_query, parse_all
+                )
+            )
+            loop = asyncio.get_event_loop()
+            return await loop.run_in_executor(
+                None,
+                self._map_batch,
+                program,
+                raw_results,
+                raw_entity_mappings,
+                items_to_parse,
+                parse_all,
+                send_raw_data_examples_amount,
+            )
+        except Exception as exc:
+            logger.warning(
+                "Failed to map the raw results using a single JQ program, falling back to mapping each expression separately",
+                error=str(exc),
+            )
+            return await super()._calculate_entities(
+                raw_results,
+                raw_entity_mappings,
+                items_to_parse,
+                selector_query,
+                parse_all,
+                send_raw_data_examples_amount,
+            )
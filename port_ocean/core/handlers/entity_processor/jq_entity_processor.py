@@ -237,36 +237,40 @@ class JQEntityProcessor(BaseEntityProcessor):
                 exc_info=True,
             )
 
-    async def _parse_items(
+    async def _calculate_entities(
         self,
-        mapping: ResourceConfig,
         raw_results: list[RAW_ITEM],
+        raw_entity_mappings: dict[str, Any],
+        items_to_parse: str | None,
+        selector_query: str,
         parse_all: bool = False,
         send_raw_data_examples_amount: int = 0,
-    ) -> CalculationResult:
-        raw_entity_mappings: dict[str, Any] = mapping.port.entity.mappings.dict(
-            exclude_unset=True
-        )
-        logger.info(f"Parsing {len(raw_results)} raw results into entities")
-        calculated_entities_results, errors = zip_and_sum(
+    ) -> tuple[list[MappedEntity], list[Exception]]:
+        return zip_and_sum(
             await process_in_queue(
                 raw_results,
                 self._calculate_entity,
                 raw_entity_mappings,
-                mapping.port.items_to_parse,
-                mapping.selector.query,
+                items_to_parse,
+                selector_query,
                 parse_all,
             )
         )
-        logger.debug(
-            f"Finished parsing raw results into entities with {len(errors)} errors. errors: {errors}"
-        )
 
+    @staticmethod
+    def _split_entities(
+        calculated_entities_results: list[MappedEntity],
+        send_raw_data_examples_amount: int = 0,
+    ) -> tuple[EntitySelectorDiff, list[dict[str, Any]], dict[str, str], int]:
+        """Split the mapped entities into the entities that passed and failed the selector
+
+        Returns the selector diff, the raw data examples to send, the misconfigured keys
+        and the number of mapped entities that are missing required fields.
+        """
         passed_entities = []
         failed_entities = []
         examples_to_send: list[dict[str, Any]] = []
         entity_misconfigurations: dict[str, str] = {}
-        missing_required_fields: bool = False
         entity_mapping_fault_counter: int = 0
 
         for result in calculated_entities_results:
@@ -285,12 +289,50 @@ class JQEntityProcessor(BaseEntityProcessor):
                 else:
                     failed_entities.append(parsed_entity)
             else:
-                missing_required_fields = True
                 entity_mapping_fault_counter += 1
 
+        return (
+            EntitySelectorDiff(passed=passed_entities, failed=failed_entities),
+            examples_to_send,
+            entity_misconfigurations,
+            entity_mapping_fault_counter,
+        )
+
+    async def _parse_items(
+        self,
+        mapping: ResourceConfig,
+        raw_results: list[RAW_ITEM],
+        parse_all: bool = False,
+        send_raw_data_examples_amount: int = 0,
+    ) -> CalculationResult:
+        raw_entity_mappings: dict[str, Any] = mapping.port.entity.mappings.dict(
+            exclude_unset=True
+        )
+        logger.info(f"Parsing {len(raw_results)} raw results into entities")
+        calculated_entities_results, errors = await self._calculate_entities(
+            raw_results,
+            raw_entity_mappings,
+            mapping.port.items_to_parse,
+            mapping.selector.query,
+            parse_all,
+            send_raw_data_examples_amount,
+        )
+        logger.debug(
+            f"Finished parsing raw results into entities with {len(errors)} errors. errors: {errors}"
+        )
+
+        (
+            entity_selector_diff,
+            examples_to_send,
+            entity_misconfigurations,
+            entity_mapping_fault_counter,
+        ) = self._split_entities(
+            calculated_entities_results, send_raw_data_examples_amount
+        )
+
         self._notify_mapping_issues(
             entity_misconfigurations,
-            missing_required_fields,
+            entity_mapping_fault_counter > 0,
             entity_mapping_fault_counter,
         )
 
@@ -307,7 +349,7 @@ class JQEntityProcessor(BaseEntityProcessor):
         await self._send_examples(examples_to_send, mapping.kind)
 
         return CalculationResult(
-            EntitySelectorDiff(passed=passed_entities, failed=failed_entities),
+            entity_selector_diff,
             errors,
             misonfigured_entity_keys=entity_misconfigurations,
         )
@@ -0,0 +1,247 @@
+import asyncio
+import hashlib
+import math
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, NamedTuple
+
+from loguru import logger
+
+from port_ocean.context.ocean import ocean
+from port_ocean.core.handlers.entity_processor.jq_batch_entity_processor import (
+    JQBatchEntityProcessor,
+)
+from port_ocean.core.handlers.port_app_config.models import ResourceConfig
+from port_ocean.core.ocean_types import (
+    RAW_ITEM,
+    CalculationResult,
+    EntitySelectorDiff,
+)
+
+
+class ShardResult(NamedTuple):
+    calculation_result: CalculationResult
+    examples: list[dict[str, Any]]
+    number_of_mapped_entities: int
+    entity_mapping_fault_counter: int
+
+
+# Compiled JQ programs of the current worker process, keyed by the hash of the program
+_worker_programs: dict[str, Any] = {}
+_worker_processor: JQBatchEntityProcessor | None = None
+
+
+def _parse_shard(
+    program_hash: str,
+    program: str,
+    raw_results: list[RAW_ITEM],
+    raw_entity_mappings: dict[str, Any],
+    items_to_parse: str | None,
+    parse_all: bool,
+    send_raw_data_examples_amount: int,
+) -> ShardResult:
+    """Map and parse a shard of raw results inside a worker process"""
+    global _worker_processor
+    if _worker_processor is None:
+        _worker_processor = JQBatchEntityProcessor(ocean)
+
+    if program_hash not in _worker_programs:
+        _worker_programs[program_hash] = _worker_processor._compile(program)
+
+    mapped_entities, errors = _worker_processor._map_batch(
+        _worker_programs[program_hash],
+        raw_results,
+        raw_entity_mappings,
+        items_to_parse,
+        parse_all,
+        send_raw_data_examples_amount,
+    )
+    (
+        entity_selector_diff,
+        examples,
+        entity_misconfigurations,
+        entity_mapping_fault_counter,
+    ) = _worker_processor._split_entities(
+        mapped_entities, send_raw_data_examples_amount
+    )
+    return ShardResult(
+        CalculationResult(
+            entity_selector_diff,
+            errors,
+            misonfigured_entity_keys=entity_misconfigurations,
+        ),
+        examples,
+        len(mapped_entities),
+        entity_mapping_fault_counter,
+    )
+
+
+class JQProcessPoolEntityProcessor(JQBatchEntityProcessor):
+    """Processes and parses entities in a pool of worker processes.
+
+    The raw results are split into shards that are mapped by the workers using the batched JQ program
+    and parsed into entities there, so the mapping of large resyncs isn't bound to a single core.
+    The workers keep the compiled programs by their hash and return a CalculationResult per shard,
+    which are merged back in the original order.
+
+    The pool lives as long as the process that created it and is shut down with the integration. In the
+    multi_process execution mode every resource subprocess starts its own pool and shuts it down once the
+    resource is processed, so the workers are only reused across resources in the single_process mode.
+    When a worker dies, its batch is parsed in the current process and the next batch starts a new pool.
+    """
+
+    MIN_SHARD_SIZE = 50
+
+    def __init__(self, context: Any) -> None:
+        super().__init__(context)
+        self._pool: ProcessPoolExecutor | None = None
+        self._pool_pid: int | None = None
+
+    @property
+    def max_workers(self) -> int:
+        return ocean.config.entity_processor_workers or os.cpu_count() or 1
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        # A pool that was created before the process was forked can't be used by the child process
+        if self._pool is None or self._pool_pid != os.getpid():
+            logger.info(
+                f"Starting entity processor pool with {self.max_workers} workers"
+            )
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("fork"),
+            )
+            self._pool_pid = os.getpid()
+        return self._pool
+
+    def shutdown(self) -> None:
+        # A pool inherited from the parent process belongs to the parent, which shuts it down
+        if self._pool is not None and self._pool_pid == os.getpid():
+            self._pool.shutdown(wait=False, cancel_futures=True)
+        self._pool = None
+        self._pool_pid = None
+
+    def _get_shards(self, raw_results: list[RAW_ITEM]) -> list[list[RAW_ITEM]]:
+        shard_size = max(
+            self.MIN_SHARD_SIZE, math.ceil(len(raw_results) / self.max_workers)
+        )
+        return [
+            raw_results[index : index + shard_size]
+            for index in range(0, len(raw_results), shard_size)
+        ]
+
+    async def _parse_shards(
+        self,
+        program: str,
+        raw_results: list[RAW_ITEM],
+        raw_entity_mappings: dict[str, Any],
+        items_to_parse: str | None,
+        parse_all: bool,
+        send_raw_data_examples_amount: int,
+    ) -> list[ShardResult]:
+        program_hash = hashlib.sha256(program.encode()).hexdigest()
+        pool = self._get_pool()
+        loop = asyncio.get_event_loop()
+        return await asyncio.gather(
+            *(
+                loop.run_in_executor(
+                    pool,
+                    _parse_shard,
+                    program_hash,
+                    program,
+                    shard,
+                    raw_entity_mappings,
+                    items_to_parse,
+                    parse_all,
+                    send_raw_data_examples_amount,
+                )
+                for shard in self._get_shards(raw_results)
+            )
+        )
+
+    async def _parse_items(
+        self,
+        mapping: ResourceConfig,
+        raw_results: list[RAW_ITEM],
+        parse_all: bool = False,
+        send_raw_data_examples_amount: int = 0,
+    ) -> CalculationResult:
+        raw_entity_mappings: dict[str, Any] = mapping.port.entity.mappings.dict(
+            exclude_unset=True
+        )
+        items_to_parse = mapping.port.items_to_parse
+        try:
+            program = self._build_program(
+                raw_entity_mappings, items_to_parse, mapping.selector.query, parse_all
+            )
+            # Making sure the program compiles before sending it to the workers
+            self._compile(program)
+            logger.info(
+                f"Parsing {len(raw_results)} raw results into entities using the entity processor pool"
+            )
+            shard_results = await self._parse_shards(
+                program,
+                raw_results,
+                raw_entity_mappings,
+                items_to_parse,
+                parse_all,
+                send_raw_data_examples_amount,
+            )
+        except Exception as exc:
+            if isinstance(exc, BrokenProcessPool):
+                # A worker died, the next batch starts a new pool instead of falling back for good
+                self.shutdown()
+            logger.warning(
+                "Failed to parse the raw results using the entity processor pool, parsing them in the current process",
+                error=str(exc),
+            )
+            return await super()._parse_items(
+                mapping, raw_results, parse_all, send_raw_data_examples_amount
+            )
+
+        passed_entities = []
+        failed_entities = []
+        errors: list[Exception] = []
+        examples_to_send: list[dict[str, Any]] = []
+        entity_misconfigurations: dict[str, str] = {}
+        entity_mapping_fault_counter = 0
+        number_of_mapped_entities = 0
+        for shard_result in shard_results:
+            calculation_result = shard_result.calculation_result
+            passed_entities.extend(calculation_result.entity_selector_diff.passed)
+            failed_entities.extend(calculation_result.entity_selector_diff.failed)
+            errors.extend(calculation_result.errors)
+            entity_misconfigurations |= calculation_result.misonfigured_entity_keys
+            examples_to_send.extend(shard_result.examples)
+            entity_mapping_fault_counter += shard_result.entity_mapping_fault_counter
+            number_of_mapped_entities += shard_result.number_of_mapped_entities
+
+        logger.debug(
+            f"Finished parsing raw results into entities with {len(errors)} errors. errors: {errors}"
+        )
+        self._notify_mapping_issues(
+            entity_misconfigurations,
+            entity_mapping_fault_counter > 0,
+            entity_mapping_fault_counter,
+        )
+
+        examples_to_send = examples_to_send[:send_raw_data_examples_amount]
+        if (
+            not number_of_mapped_entities
+            and raw_results
+            and send_raw_data_examples_amount > 0
+        ):
+            logger.warning(
+                f"No entities were parsed from {len(raw_results)} raw results, sending raw data examples"
+            )
+            examples_to_send = raw_results[:send_raw_data_examples_amount]
+
+        await self._send_examples(examples_to_send, mapping.kind)
+
+        return CalculationResult(
+            EntitySelectorDiff(passed=passed_entities, failed=failed_entities),
+            errors,
+            misonfigured_entity_keys=entity_misconfigurations,
+        )
@@ -37,6 +37,9 @@ class PortAppConfigCache:
             or self._retrieval_time + self._cache_ttl < get_time()
         )
 
+    def invalidate(self) -> None:
+        self._port_app_config = None
+
 
 class BasePortAppConfig(BaseHandler):
     """Abstract base class for managing port application configurations.
@@ -56,6 +59,10 @@ class BasePortAppConfig(BaseHandler):
             self.context.config.port.port_app_config_cache_ttl
         )
 
+    def invalidate_cache(self) -> None:
+        """Force the next retrieval of the port application configuration to fetch it"""
+        self._app_config_cache.invalidate()
+
     @abstractmethod
     async def _get_port_app_config(self) -> dict[str, Any]:
         pass
@@ -17,6 +17,11 @@ class AbstractQueue(ABC, Generic[T]):
         """Get an item from the queue"""
         pass
 
+    @abstractmethod
+    async def drop_oldest(self) -> bool:
+        """Remove the oldest item that wasn't taken from the queue yet, returns False when there's no such item"""
+        pass
+
     @abstractmethod
     async def teardown(self) -> None:
         """Wait for all items to be processed"""
@@ -24,5 +29,20 @@ class AbstractQueue(ABC, Generic[T]):
 
     @abstractmethod
     async def commit(self) -> None:
-        """Mark item as processed"""
+        """Mark the oldest item that was taken from the queue and not committed yet as processed"""
+        pass
+
+    @abstractmethod
+    def size(self) -> int:
+        """The number of items that were put in the queue and not committed yet"""
+        pass
+
+    @abstractmethod
+    def size_bytes(self) -> int:
+        """The approximate number of bytes of the items that were put in the queue and not committed yet"""
+        pass
+
+    @abstractmethod
+    def oldest_item_age_seconds(self) -> float | None:
+        """The number of seconds since the oldest item that wasn't committed yet was put in the queue"""
         pass
@@ -0,0 +1,212 @@
+import asyncio
+import json
+import sqlite3
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, TypeVar
+
+from .abstract_queue import AbstractQueue
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class DiskQueue(AbstractQueue[T]):
+    """
+    Implementation of Queue persisted to a sqlite database in WAL mode.
+
+    A burst of items is bounded by the disk rather than by the memory, and the items that weren't committed
+    are replayed after a restart. Items put and committed concurrently are written in a single transaction,
+    so they share a single fsync.
+
+    Args:
+        path: The path of the sqlite database
+        serialize: Converts an item to a JSON serializable value
+        deserialize: Converts a JSON serializable value back to an item
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        serialize: Callable[[T], Any],
+        deserialize: Callable[[Any], T],
+    ) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._serialize = serialize
+        self._deserialize = deserialize
+        # sqlite connections can't be used concurrently, every database operation runs on this single thread
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=FULL")
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS queue ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, item TEXT NOT NULL, put_at REAL NOT NULL)"
+            )
+        self._size, self._size_bytes, self._oldest_put_at = self._connection.execute(
+            "SELECT COUNT(*), COALESCE(SUM(LENGTH(item)), 0), MIN(put_at) FROM queue"
+        ).fetchone()
+
+        # Items that weren't committed before a restart are delivered again
+        self._last_delivered_id = 0
+        # The id and the size of every item that was delivered and wasn't committed yet
+        self._delivered_items: deque[tuple[int, int]] = deque()
+        self._pending_puts: list[tuple[str, float, asyncio.Future[None]]] = []
+        self._pending_commits: list[tuple[int, int, asyncio.Future[None]]] = []
+        self._flush_task: asyncio.Task[None] | None = None
+        self._closed = False
+        self._get_lock = asyncio.Lock()
+        self._item_put = asyncio.Event()
+        self._empty = asyncio.Event()
+        if not self._size:
+            self._empty.set()
+
+    async def _run(self, function: Callable[..., R], *args: Any) -> R:
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, function, *args
+        )
+
+    def _write(
+        self, items: list[tuple[str, float]], committed_ids: list[int]
+    ) -> tuple[float] | None:
+        with self._connection:
+            self._connection.executemany(
+                "INSERT INTO queue (item, put_at) VALUES (?, ?)", items
+            )
+            self._connection.executemany(
+                "DELETE FROM queue WHERE id = ?", [(id_,) for id_ in committed_ids]
+            )
+            return self._connection.execute(
+                "SELECT put_at FROM queue ORDER BY id LIMIT 1"
+            ).fetchone()
+
+    def _read_next(self) -> tuple[int, str] | None:
+        # Runs on the database thread like _delete_next, so an item is never both delivered and dropped
+        row = self._connection.execute(
+            "SELECT id, item FROM queue WHERE id > ? ORDER BY id LIMIT 1",
+            (self._last_delivered_id,),
+        ).fetchone()
+        if row is not None:
+            self._last_delivered_id = row[0]
+        return row
+
+    def _delete_next(self) -> tuple[int, tuple[float] | None] | None:
+        with self._connection:
+            row = self._connection.execute(
+                "SELECT id, LENGTH(item) FROM queue WHERE id > ? ORDER BY id LIMIT 1",
+                (self._last_delivered_id,),
+            ).fetchone()
+            if row is None:
+                return None
+            id_, size_bytes = row
+            self._connection.execute("DELETE FROM queue WHERE id = ?", (id_,))
+            return (
+                size_bytes,
+                self._connection.execute(
+                    "SELECT put_at FROM queue ORDER BY id LIMIT 1"
+                ).fetchone(),
+            )
+
+    async def _flush(self) -> None:
+        """Write the pending puts and commits, the ones added while writing are written by the next transaction"""
+        while self._pending_puts or self._pending_commits:
+            puts, self._pending_puts = self._pending_puts, []
+            commits, self._pending_commits = self._pending_commits, []
+            futures = [future for *_, future in puts] + [
+                future for *_, future in commits
+            ]
+            try:
+                oldest = await self._run(
+                    self._write,
+                    [(item, put_at) for item, put_at, _ in puts],
+                    [id_ for id_, _, _ in commits],
+                )
+            except Exception as e:
+                # The failed puts weren't queued and the failed commits are delivered again after a restart,
+                # their callers get the error
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+            else:
+                self._size += len(puts) - len(commits)
+                self._size_bytes += sum(len(item) for item, _, _ in puts) - sum(
+                    size_bytes for _, size_bytes, _ in commits
+                )
+                self._oldest_put_at = oldest[0] if oldest else None
+                for future in futures:
+                    if not future.done():
+                        future.set_result(None)
+                if puts:
+                    self._item_put.set()
+            if not self._size and not self._pending_puts:
+                self._empty.set()
+
+    async def _schedule(self, future: asyncio.Future[None]) -> None:
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush())
+        await future
+
+    async def put(self, item: T) -> None:
+        future = asyncio.get_running_loop().create_future()
+        self._pending_puts.append(
+            (json.dumps(self._serialize(item)), time.time(), future)
+        )
+        self._empty.clear()
+        await self._schedule(future)
+
+    async def get(self) -> T:
+        async with self._get_lock:
+            while True:
+                # Cleared before reading, so a put that lands while reading wakes the next wait
+                self._item_put.clear()
+                row = await self._run(self._read_next)
+                if row is not None:
+                    break
+                await self._item_put.wait()
+
+        id_, item = row
+        self._delivered_items.append((id_, len(item)))
+        return self._deserialize(json.loads(item))
+
+    async def drop_oldest(self) -> bool:
+        deleted = await self._run(self._delete_next)
+        if deleted is None:
+            return False
+        size_bytes, oldest = deleted
+        self._size -= 1
+        self._size_bytes -= size_bytes
+        self._oldest_put_at = oldest[0] if oldest else None
+        if not self._size and not self._pending_puts:
+            self._empty.set()
+        return True
+
+    async def teardown(self) -> None:
+        try:
+            await self._empty.wait()
+        finally:
+            if not self._closed:
+                self._closed = True
+                # Closed on the database thread, after the operation that's running on it
+                await self._run(self._connection.close)
+                self._executor.shutdown(wait=False)
+
+    async def commit(self) -> None:
+        future = asyncio.get_running_loop().create_future()
+        id_, size_bytes = self._delivered_items.popleft()
+        self._pending_commits.append((id_, size_bytes, future))
+        await self._schedule(future)
+
+    def size(self) -> int:
+        return self._size
+
+    def size_bytes(self) -> int:
+        return self._size_bytes
+
+    def oldest_item_age_seconds(self) -> float | None:
+        if self._oldest_put_at is None:
+            return None
+        return time.time() - self._oldest_put_at
@@ -1,5 +1,7 @@
 import asyncio
-from typing import TypeVar
+import time
+from collections import deque
+from typing import Callable, TypeVar
 
 from .abstract_queue import AbstractQueue
 
@@ -7,19 +9,57 @@ T = TypeVar("T")
 
 
 class LocalQueue(AbstractQueue[T]):
-    """Implementation of Queue using asyncio.Queue"""
+    """Implementation of Queue using asyncio.Queue
 
-    def __init__(self) -> None:
+    Args:
+        sizeof: Measures the number of bytes of an item, the size of the items isn't tracked without it
+    """
+
+    def __init__(self, sizeof: Callable[[T], int] | None = None) -> None:
         self._queue: asyncio.Queue[T] = asyncio.Queue()
+        self._sizeof = sizeof
+        # The put time and the size of every item that wasn't committed yet
+        self._uncommitted_items: deque[tuple[float, int]] = deque()
+        self._size_bytes = 0
 
     async def put(self, item: T) -> None:
+        size_bytes = self._sizeof(item) if self._sizeof else 0
+        self._uncommitted_items.append((time.time(), size_bytes))
+        self._size_bytes += size_bytes
         await self._queue.put(item)
 
     async def get(self) -> T:
         return await self._queue.get()
 
+    async def drop_oldest(self) -> bool:
+        try:
+            self._queue.get_nowait()
+        except asyncio.QueueEmpty:
+            return False
+        # The items that were taken from the queue come before the items that are still in it
+        index = len(self._uncommitted_items) - self._queue.qsize() - 1
+        _, size_bytes = self._uncommitted_items[index]
+        del self._uncommitted_items[index]
+        self._size_bytes -= size_bytes
+        self._queue.task_done()
+        return True
+
     async def teardown(self) -> None:
         await self._queue.join()
 
     async def commit(self) -> None:
+        _, size_bytes = self._uncommitted_items.popleft()
+        self._size_bytes -= size_bytes
         self._queue.task_done()
+
+    def size(self) -> int:
+        return len(self._uncommitted_items)
+
+    def size_bytes(self) -> int:
+        return self._size_bytes
+
+    def oldest_item_age_seconds(self) -> float | None:
+        if not self._uncommitted_items:
+            return None
+        put_time, _ = self._uncommitted_items[0]
+        return time.time() - put_time
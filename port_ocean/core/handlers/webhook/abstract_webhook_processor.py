@@ -60,6 +60,15 @@ class AbstractWebhookProcessor(ABC):
         """Handle cancellation of the request. Override if needed"""
         pass
 
+    @classmethod
+    def get_event_group_id(cls, event: WebhookEvent) -> str | None:
+        """
+        The id of the resource the event is about. Override to let the events of different resources be
+        processed concurrently, events of the same group are processed in order and duplicates of them
+        may be coalesced. Events without a group are processed in the order they arrived
+        """
+        return None
+
     def validate_webhook_setup(self) -> bool:
         """Validate webhook configuration. Override if needed"""
         return True
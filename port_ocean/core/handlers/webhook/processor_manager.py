@@ -1,52 +1,207 @@
-from typing import Dict, Type, Set
-from fastapi import APIRouter, Request
+from collections import OrderedDict
+from pathlib import Path
+from typing import Coroutine, Dict, Type, Set, Any
+from urllib.parse import quote
+from fastapi import APIRouter, Request, Response, status
 from loguru import logger
 import asyncio
+import hashlib
+import itertools
+import json
+import time
+import zlib
 
 from port_ocean.context.ocean import ocean
 from port_ocean.context.event import EventType, event_context
 from port_ocean.core.handlers.port_app_config.models import ResourceConfig
 from port_ocean.core.integrations.mixins.events import EventsMixin
 from port_ocean.core.integrations.mixins.live_events import LiveEventsMixin
+from port_ocean.core.models import LiveEventsOverflowPolicy
+from port_ocean.helpers.metric.metric import MetricType
 from .webhook_event import WebhookEvent, WebhookEventRawResults, LiveEventTimestamp
 from port_ocean.context.event import event
 
 
 from .abstract_webhook_processor import AbstractWebhookProcessor
 from port_ocean.utils.signal import SignalHandler
-from port_ocean.core.handlers.queue import AbstractQueue, LocalQueue
+from port_ocean.core.handlers.queue import AbstractQueue, DiskQueue, LocalQueue
 
 
 class LiveEventsProcessorManager(LiveEventsMixin, EventsMixin):
     """Manages webhook processors and their routes"""
 
+    # Bounds the events dispatched to a worker, the rest wait in the queue of their path
+    WORKER_QUEUE_MAX_SIZE = 100
+
     def __init__(
         self,
         router: APIRouter,
         signal_handler: SignalHandler,
         max_event_processing_seconds: float,
         max_wait_seconds_before_shutdown: float,
+        event_workers_per_path: int = 1,
+        event_coalescing_window_seconds: float = 0.0,
+        event_queues_directory: str | None = None,
+        max_queue_size: int | None = None,
+        max_queue_bytes: int | None = None,
+        queue_overflow_policy: LiveEventsOverflowPolicy = LiveEventsOverflowPolicy.reject,
+        queue_retry_after_seconds: int = 10,
     ) -> None:
         self._router = router
         self._processors_classes: Dict[str, list[Type[AbstractWebhookProcessor]]] = {}
         self._event_queues: Dict[str, AbstractQueue[WebhookEvent]] = {}
+        # Whether every event taken from the queue of a path was processed, in the order they were taken
+        self._uncommitted_events: Dict[str, OrderedDict[int, bool]] = {}
         self._webhook_processor_tasks: Set[asyncio.Task[None]] = set()
         self._max_event_processing_seconds = max_event_processing_seconds
         self._max_wait_seconds_before_shutdown = max_wait_seconds_before_shutdown
+        self._event_workers_per_path = event_workers_per_path
+        self._event_coalescing_window_seconds = event_coalescing_window_seconds
+        self._event_queues_directory = event_queues_directory
+        self._max_queue_size = max_queue_size
+        self._max_queue_bytes = max_queue_bytes
+        self._queue_overflow_policy = queue_overflow_policy
+        self._queue_retry_after_seconds = queue_retry_after_seconds
+        # The number of the oldest queued events of every path to drop instead of processing them
+        # The kinds of the events dropped while their queue was full, resynced once the queue drains
+        self._dirty_kinds: Set[str] = set()
+        self._dirty_kinds_resync_task: asyncio.Task[None] | None = None
         signal_handler.register(self.shutdown)
 
     async def start_processing_event_messages(self) -> None:
         """Start processing events for all registered paths"""
         await self.initialize_handlers()
-        loop = asyncio.get_event_loop()
         for path in self._event_queues.keys():
             try:
-                task = loop.create_task(self.process_queue(path))
-                self._webhook_processor_tasks.add(task)
-                task.add_done_callback(self._webhook_processor_tasks.discard)
+                self._report_queue_metrics(path)
+                self._create_processing_task(self.process_queue(path))
             except Exception as e:
                 logger.exception(f"Error starting queue processor for {path}: {str(e)}")
 
+    def _create_processing_task(
+        self, coroutine: Coroutine[Any, Any, None]
+    ) -> asyncio.Task[None]:
+        task = asyncio.get_event_loop().create_task(coroutine)
+        self._webhook_processor_tasks.add(task)
+        task.add_done_callback(self._webhook_processor_tasks.discard)
+        return task
+
+    def _get_event_group_id(self, webhook_event: WebhookEvent, path: str) -> str | None:
+        """The group of the event, as reported by the first processor of the path that knows it"""
+        for processor_class in self._processors_classes[path]:
+            group_id = processor_class.get_event_group_id(webhook_event)
+            if group_id is not None:
+                return group_id
+        return None
+
+    def _get_event_fingerprint(
+        self, webhook_event: WebhookEvent, group_id: str | None
+    ) -> str | None:
+        """Identifies duplicate events of the same group, None when the event can't be coalesced"""
+        if group_id is None or not self._event_coalescing_window_seconds:
+            return None
+        payload = json.dumps(webhook_event.payload, sort_keys=True, default=str)
+        return hashlib.sha256(f"{group_id}:{payload}".encode()).hexdigest()
+
+    def _create_event_queue(self, path: str) -> AbstractQueue[WebhookEvent]:
+        if self._event_queues_directory is None:
+            return LocalQueue(
+                sizeof=(
+                    self._get_event_size_bytes
+                    if self._max_queue_bytes is not None
+                    else None
+                )
+            )
+        return DiskQueue(
+            Path(self._event_queues_directory) / f"{quote(path, safe='')}.sqlite",
+            serialize=WebhookEvent.to_dict,
+            deserialize=WebhookEvent.from_dict,
+        )
+
+    @staticmethod
+    def _get_event_size_bytes(webhook_event: WebhookEvent) -> int:
+        return len(json.dumps(webhook_event.payload))
+
+    def _is_queue_full(self, path: str) -> bool:
+        queue = self._event_queues[path]
+        return (
+            self._max_queue_size is not None and queue.size() >= self._max_queue_size
+        ) or (
+            self._max_queue_bytes is not None
+            and queue.size_bytes() >= self._max_queue_bytes
+        )
+
+    async def _drop_oldest_events(self, path: str) -> bool:
+        """Drop the oldest events that weren't taken by the workers until the queue has room for another event"""
+        queue = self._event_queues[path]
+        while self._is_queue_full(path):
+            if not await queue.drop_oldest():
+                return False
+            logger.info(
+                "Dropped the oldest webhook event as its queue overflowed",
+                webhook_path=path,
+            )
+        return True
+
+    async def _mark_event_kinds_dirty(
+        self, webhook_event: WebhookEvent, path: str
+    ) -> None:
+        for processor_class in self._processors_classes[path]:
+            processor = processor_class(webhook_event.clone())
+            if await processor.should_process_event(webhook_event):
+                self._dirty_kinds.update(
+                    await processor.get_matching_kinds(webhook_event)
+                )
+
+    def _schedule_dirty_kinds_resync(self) -> None:
+        if (
+            self._dirty_kinds_resync_task is not None
+            and not self._dirty_kinds_resync_task.done()
+        ):
+            return
+        self._dirty_kinds_resync_task = self._create_processing_task(
+            self._resync_dirty_kinds()
+        )
+
+    async def _resync_dirty_kinds(self) -> None:
+        kinds, self._dirty_kinds = self._dirty_kinds, set()
+        logger.info(
+            f"Resyncing kinds {sorted(kinds)} of live events that were dropped while their queue was full"
+        )
+        try:
+            await ocean.integration.sync_raw_kinds(kinds)
+        except Exception as e:
+            logger.exception(f"Failed to resync the dirty kinds: {str(e)}")
+
+    def _report_queue_metrics(self, path: str) -> None:
+        queue = self._event_queues[path]
+        ocean.metrics.set_metric(
+            MetricType.LIVE_EVENTS_QUEUE_SIZE_NAME, [path], queue.size()
+        )
+        ocean.metrics.set_metric(
+            MetricType.LIVE_EVENTS_QUEUE_AGE_NAME,
+            [path],
+            queue.oldest_item_age_seconds() or 0,
+        )
+
+    async def _commit_event(self, path: str, sequence: int) -> None:
+        """
+        Commit the processed events of the path in the order they were taken from its queue, so an event
+        is never committed before the events taken before it and a persistent queue replays every event
+        that wasn't processed
+        """
+        uncommitted_events = self._uncommitted_events[path]
+        uncommitted_events[sequence] = True
+        while uncommitted_events:
+            oldest_sequence = next(iter(uncommitted_events))
+            if not uncommitted_events[oldest_sequence]:
+                break
+            del uncommitted_events[oldest_sequence]
+            await self._event_queues[path].commit()
+        self._report_queue_metrics(path)
+        if self._dirty_kinds and not self._event_queues[path].size():
+            self._schedule_dirty_kinds_resync()
+
     async def _extract_matching_processors(
         self, webhook_event: WebhookEvent, path: str
     ) -> list[tuple[ResourceConfig, AbstractWebhookProcessor]]:
@@ -74,15 +229,97 @@ class LiveEventsProcessorManager(LiveEventsMixin, EventsMixin):
         return created_processors
 
     async def process_queue(self, path: str) -> None:
-        """Process events for a specific path in order"""
+        """Dispatch the events of a path to its workers, the events of a group are always dispatched to the same worker"""
+        queue = self._event_queues[path]
+        sequences = itertools.count()
+        workers_queues: list[
+            asyncio.Queue[tuple[WebhookEvent, tuple[str, str] | None, int]]
+        ] = [
+            asyncio.Queue(self.WORKER_QUEUE_MAX_SIZE)
+            for _ in range(self._event_workers_per_path)
+        ]
+        # The fingerprint of the last event queued for each group and the time it was queued at,
+        # as long as the event is waiting for a worker
+        queued_events: dict[str, tuple[str, float]] = {}
+        for worker_queue in workers_queues:
+            self._create_processing_task(
+                self._process_worker_queue(path, worker_queue, queued_events)
+            )
+
+        while True:
+            sequence: int | None = None
+            try:
+                webhook_event = await queue.get()
+                sequence = next(sequences)
+                self._uncommitted_events[path][sequence] = False
+                group_id = self._get_event_group_id(webhook_event, path)
+                fingerprint = self._get_event_fingerprint(webhook_event, group_id)
+                coalescing_key: tuple[str, str] | None = None
+                if group_id is not None and fingerprint is not None:
+                    # Only a duplicate of the last event queued for the group is coalesced,
+                    # otherwise the group would end up in the state of an older event
+                    latest_fingerprint, queued_at = queued_events.get(
+                        group_id, (None, 0.0)
+                    )
+                    now = time.monotonic()
+                    if (
+                        latest_fingerprint == fingerprint
+                        and now - queued_at <= self._event_coalescing_window_seconds
+                    ):
+                        logger.info(
+                            "Coalescing webhook event with a duplicate event waiting to be processed",
+                            webhook_path=path,
+                            trace_id=webhook_event.trace_id,
+                            group_id=group_id,
+                        )
+                        await self._commit_event(path, sequence)
+                        continue
+                    queued_events[group_id] = (fingerprint, now)
+                    coalescing_key = (group_id, fingerprint)
+
+                # Events without a group keep the order they arrived in, so they're all processed by the same worker
+                worker_index = (
+                    zlib.crc32(group_id.encode()) % len(workers_queues)
+                    if group_id is not None
+                    else 0
+                )
+                await workers_queues[worker_index].put(
+                    (webhook_event, coalescing_key, sequence)
+                )
+                sequence = None
+            except asyncio.CancelledError:
+                logger.info(f"Queue dispatcher for {path} is shutting down")
+                break
+            except Exception as e:
+                logger.exception(
+                    f"Unexpected error in queue dispatcher for {path}: {str(e)}"
+                )
+                # An event that couldn't be dispatched is dropped, committing it keeps the following events committable
+                if (
+                    sequence is not None
+                    and self._uncommitted_events[path].get(sequence) is False
+                ):
+                    await self._commit_event(path, sequence)
+
+    async def _process_worker_queue(
+        self,
+        path: str,
+        worker_queue: asyncio.Queue[tuple[WebhookEvent, tuple[str, str] | None, int]],
+        queued_events: dict[str, tuple[str, float]],
+    ) -> None:
+        """Process the events dispatched to a worker of a specific path in order"""
         while True:
             matching_processors_with_resource: list[
                 tuple[ResourceConfig, AbstractWebhookProcessor]
             ] = []
             webhook_event: WebhookEvent | None = None
+            sequence = 0
             try:
-                queue = self._event_queues[path]
-                webhook_event = await queue.get()
+                webhook_event, coalescing_key, sequence = await worker_queue.get()
+                if coalescing_key is not None:
+                    group_id, fingerprint = coalescing_key
+                    if queued_events.get(group_id, (None,))[0] == fingerprint:
+                        del queued_events[group_id]
                 with logger.contextualize(
                     webhook_path=path, trace_id=webhook_event.trace_id
                 ):
@@ -90,10 +327,8 @@ class LiveEventsProcessorManager(LiveEventsMixin, EventsMixin):
                         EventType.HTTP_REQUEST,
                         trigger_type="machine",
                     ):
-                        # This forces the Processor manager to fetch the latest port app config for each event
-                        await ocean.integration.port_app_config_handler.get_port_app_config(
-                            use_cache=False
-                        )
+                        # The port app config is fetched again once its cache TTL expires or it's invalidated
+                        await ocean.integration.port_app_config_handler.get_port_app_config()
                         matching_processors_with_resource = (
                             await self._extract_matching_processors(webhook_event, path)
                         )
@@ -133,7 +368,7 @@ class LiveEventsProcessorManager(LiveEventsMixin, EventsMixin):
                     self._timestamp_event_error(processor.event)
             finally:
                 if webhook_event:
-                    await self._event_queues[path].commit()
+                    await self._commit_event(path, sequence)
                     # Prevents committing empty events for cases where we shutdown while processing
                     webhook_event = None
 
@@ -236,7 +471,8 @@ class LiveEventsProcessorManager(LiveEventsMixin, EventsMixin):
 
         if path not in self._processors_classes:
             self._processors_classes[path] = []
-            self._event_queues[path] = LocalQueue()
+            self._event_queues[path] = self._create_event_queue(path)
+            self._uncommitted_events[path] = OrderedDict()
             self._register_route(path)
 
         self._processors_classes[path].append(processor)
@@ -244,12 +480,42 @@ class LiveEventsProcessorManager(LiveEventsMixin, EventsMixin):
     def _register_route(self, path: str) -> None:
         """Register a route for a specific path"""
 
-        async def handle_webhook(request: Request) -> Dict[str, str]:
+        async def handle_webhook(
+            request: Request, response: Response
+        ) -> Dict[str, str]:
             """Handle incoming webhook requests for a specific path."""
             try:
                 webhook_event = await WebhookEvent.from_request(request)
+                if self._is_queue_full(path):
+                    ocean.metrics.inc_metric(
+                        MetricType.LIVE_EVENTS_SHED_NAME,
+                        [path, self._queue_overflow_policy],
+                        1,
+                    )
+                    if self._queue_overflow_policy == LiveEventsOverflowPolicy.reject:
+                        response.status_code = status.HTTP_429_TOO_MANY_REQUESTS
+                        response.headers["Retry-After"] = str(
+                            self._queue_retry_after_seconds
+                        )
+                        return {"status": "error", "message": "Webhook queue is full"}
+                    if (
+                        self._queue_overflow_policy
+                        == LiveEventsOverflowPolicy.dirty_kinds
+                    ):
+                        await self._mark_event_kinds_dirty(webhook_event, path)
+                        return {"status": "ok"}
+                    if not await self._drop_oldest_events(path):
+                        # All the queued events were taken by the workers, so the new event is the oldest
+                        logger.info(
+                            "Dropping webhook event as its queue overflowed",
+                            webhook_path=path,
+                            trace_id=webhook_event.trace_id,
+                        )
+                        return {"status": "ok"}
+
                 webhook_event.set_timestamp(LiveEventTimestamp.AddedToQueue)
                 await self._event_queues[path].put(webhook_event)
+                self._report_queue_metrics(path)
                 return {"status": "ok"}
             except Exception as e:
                 logger.exception(f"Error processing webhook: {str(e)}")
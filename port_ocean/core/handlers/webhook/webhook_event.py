@@ -80,6 +80,13 @@ class WebhookEvent(LiveEvent):
             original_request=None,
         )
 
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "payload": self.payload,
+            "headers": self.headers,
+        }
+
     def clone(self) -> "WebhookEvent":
         return WebhookEvent(
             trace_id=self.trace_id,
@@ -9,8 +9,11 @@ from port_ocean.core.handlers import (
     BaseEntitiesStateApplier,
     HttpEntitiesStateApplier,
     JQEntityProcessor,
+    JQBatchEntityProcessor,
+    JQProcessPoolEntityProcessor,
     APIPortAppConfig,
 )
+from port_ocean.core.models import EntityProcessorMode
 from port_ocean.exceptions.core import IntegrationNotStartedException
 
 
@@ -76,7 +79,17 @@ class HandlerMixin:
         return self._entities_state_applier
 
     async def _init_entity_processor_instance(self) -> BaseEntityProcessor:
-        self._entity_processor = self.EntityProcessorClass(ocean)
+        entity_processor_class = self.EntityProcessorClass
+        # Integrations that define their own entity processor keep using it
+        if entity_processor_class is JQEntityProcessor:
+            entity_processor_mode_to_class: dict[str, Type[BaseEntityProcessor]] = {
+                EntityProcessorMode.jq_batch: JQBatchEntityProcessor,
+                EntityProcessorMode.jq_process_pool: JQProcessPoolEntityProcessor,
+            }
+            entity_processor_class = entity_processor_mode_to_class.get(
+                ocean.config.entity_processor_mode, entity_processor_class
+            )
+        self._entity_processor = entity_processor_class(ocean)
         return self._entity_processor
 
     async def _init_port_app_config_handler_instance(
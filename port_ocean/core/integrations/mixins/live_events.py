@@ -1,8 +1,12 @@
+from collections import defaultdict
+from contextlib import aclosing
+
 from loguru import logger
 from port_ocean.clients.port.types import UserAgentType
 from port_ocean.core.handlers.webhook.webhook_event import WebhookEventRawResults
 from port_ocean.core.integrations.mixins.handler import HandlerMixin
 from port_ocean.core.models import Entity
+from port_ocean.core.utils.utils import get_entities_keys, get_entity_key
 from port_ocean.context.ocean import ocean
 
 
@@ -32,59 +36,84 @@ class LiveEventsMixin(HandlerMixin):
         entities_not_passed: list[Entity] = []
         entities_to_delete: list[Entity] = []
         for webhook_event_raw_result in webhook_events_raw_result:
-            for raw_item in webhook_event_raw_result.updated_raw_results:
+            # All the raw items of a resource are parsed at once, so their mapping runs in a single batch
+            if webhook_event_raw_result.updated_raw_results:
                 calaculation_results = await self.entity_processor.parse_items(
-                    webhook_event_raw_result.resource, [raw_item], parse_all=True, send_raw_data_examples_amount=0
+                    webhook_event_raw_result.resource, webhook_event_raw_result.updated_raw_results, parse_all=True, send_raw_data_examples_amount=0
                 )
                 entities.extend(calaculation_results.entity_selector_diff.passed)
                 entities_not_passed.extend(calaculation_results.entity_selector_diff.failed)
 
-            for raw_item in webhook_event_raw_result.deleted_raw_results:
+            if webhook_event_raw_result.deleted_raw_results:
                 deletion_results = await self.entity_processor.parse_items(
-                    webhook_event_raw_result.resource, [raw_item], parse_all=True, send_raw_data_examples_amount=0
+                    webhook_event_raw_result.resource, webhook_event_raw_result.deleted_raw_results, parse_all=True, send_raw_data_examples_amount=0
                 )
                 entities_to_delete.extend(deletion_results.entity_selector_diff.passed)
 
-        entities_to_remove = []
-        for entity in entities_to_delete + entities_not_passed:
-            if (entity.blueprint, entity.identifier) not in [(entity.blueprint, entity.identifier) for entity in entities]:
-                entities_to_remove.append(entity)
+        entities_keys = get_entities_keys(entities)
+        entities_to_remove = [
+            entity for entity in entities_to_delete + entities_not_passed
+            if get_entity_key(entity) not in entities_keys
+        ]
 
         logger.info(f"Found {len(entities_to_remove)} entities to remove {', '.join(f'{entity.blueprint}/{entity.identifier}' for entity in entities_to_remove)}")
         logger.info(f"Found {len(entities)} entities to upsert {', '.join(f'{entity.blueprint}/{entity.identifier}' for entity in entities)}")
         return entities, entities_to_remove
 
-    async def _does_entity_exists(self, entity: Entity) -> bool:
-        """Check if this integration is the owner of the given entity.
+    async def _get_existing_entities(self, entities: list[Entity]) -> list[Entity]:
+        """Find which of the given entities exist in Port and are owned by this integration, in a single search.
 
         Args:
-            entity: The entity to check ownership for
+            entities: The entities to check ownership for
 
         Returns:
-            bool: True if this integration is the owner of the entity, False otherwise
+            list[Entity]: The given entities that exist in Port and are owned by this integration
         """
+        identifiers_by_blueprint: dict[str, set[str]] = defaultdict(set)
+        for entity in entities:
+            # Entities identified by a search query can't be matched to the entities found in Port
+            if isinstance(entity.identifier, str):
+                identifiers_by_blueprint[entity.blueprint].add(entity.identifier)
+        if not identifiers_by_blueprint:
+            return []
+
         query = {
             "combinator": "and",
             "rules": [
                 {
-                    "property": "$identifier",
-                    "operator": "=",
-                    "value": entity.identifier
-                },
-                {
-                    "property": "$blueprint",
-                    "operator": "=",
-                    "value": entity.blueprint
+                    "combinator": "or",
+                    "rules": [
+                        {
+                            "combinator": "and",
+                            "rules": [
+                                {
+                                    "property": "$blueprint",
+                                    "operator": "=",
+                                    "value": blueprint
+                                },
+                                {
+                                    "property": "$identifier",
+                                    "operator": "in",
+                                    "value": sorted(identifiers)
+                                }
+                            ]
+                        }
+                        for blueprint, identifiers in identifiers_by_blueprint.items()
+                    ]
                 }
             ]
         }
-        entities_at_port = await ocean.port_client.search_entities(
+        existing_entities_keys: set[tuple[str, str]] = set()
+        # The paginated search is closed even when the loop is left early, e.g. by an error
+        async with aclosing(ocean.port_client.search_entities_in_batches(
             UserAgentType.exporter,
             query
-        )
-        return len(entities_at_port) > 0
+        )) as batches:
+            async for entities_at_port in batches:
+                existing_entities_keys.update(get_entities_keys(entities_at_port))
+        return [entity for entity in entities if get_entity_key(entity) in existing_entities_keys]
 
     async def _delete_entities(self, entities: list[Entity]) -> None:
-        for entity in entities:
-            if await self._does_entity_exists(entity):
-                await self.entities_state_applier.delete([entity], UserAgentType.exporter)
+        existing_entities = await self._get_existing_entities(entities)
+        if existing_entities:
+            await self.entities_state_applier.delete(existing_entities, UserAgentType.exporter)
@@ -1,4 +1,7 @@
 import asyncio
+import json
+from collections import defaultdict
+from contextlib import aclosing
 import uuid
 from graphlib import CycleError
 import inspect
@@ -23,7 +26,7 @@ from port_ocean.core.integrations.mixins.utils import (
     resync_generator_wrapper,
     resync_function_wrapper,
 )
-from port_ocean.core.models import Entity, ProcessExecutionMode
+from port_ocean.core.models import Entity, EntityRef, ProcessExecutionMode, ReconciliationMode
 from port_ocean.core.ocean_types import (
     RAW_RESULT,
     RESYNC_RESULT,
@@ -32,13 +35,24 @@ from port_ocean.core.ocean_types import (
     RAW_ITEM,
     CalculationResult,
 )
+from port_ocean.core.utils.batch_pipeline import BatchPipeline
+from port_ocean.core.utils.generated_entities_store import GeneratedEntitiesStore
+from port_ocean.core.utils.resource_scheduler import ResourceScheduler, resolve_resources_dependencies
 from port_ocean.core.utils.utils import resolve_entities_diff, zip_and_sum, gather_and_split_errors_from_results
 from port_ocean.exceptions.core import IntegrationSubProcessFailedException, OceanAbortException
 from port_ocean.helpers.metric.metric import MetricResourceKind, SyncState, MetricType, MetricPhase
 from port_ocean.helpers.metric.utils import TimeMetric, TimeMetricWithResourceKind
-from port_ocean.utils.ipc import FileIPC
+from port_ocean.utils.cache import BYPASS_CACHE_ATTRIBUTE
+from port_ocean.utils.ipc import PipeIPC
 
 SEND_RAW_DATA_EXAMPLES_AMOUNT = 5
+COMPARE_BATCH_MAX_LENGTH = 50
+COMPARE_BATCH_MAX_SIZE_IN_BYTES = 1024 * 1024
+COMPARE_BATCH_SAMPLE_SIZE = 10
+# The types of the messages a resource subprocess streams to its parent
+SUBPROCESS_ENTITIES_MESSAGE = "entities"
+SUBPROCESS_TOPOLOGICAL_ENTITIES_MESSAGE = "topological_entities"
+SUBPROCESS_ERRORS_MESSAGE = "errors"
 
 
 class SyncRawMixin(HandlerMixin, EventsMixin):
@@ -51,9 +65,14 @@ class SyncRawMixin(HandlerMixin, EventsMixin):
         Raw entities are entities with a more primitive structure, usually fetched directly from a resource.
     """
 
+    # Set in the subprocess of a resource in multi_process mode
+    _subprocess_results_ipc: PipeIPC | None = None
+
     def __init__(self) -> None:
         HandlerMixin.__init__(self)
         EventsMixin.__init__(self)
+        # Resyncs run one at a time, as a full resync clears the cache and resets the metrics
+        self._resync_lock = asyncio.Lock()
 
     async def _on_resync(self, kind: str) -> RAW_RESULT:
         raise NotImplementedError("on_resync must be implemented")
@@ -165,6 +184,27 @@ class SyncRawMixin(HandlerMixin, EventsMixin):
             ]
         }
 
+    def _get_entities_compare_batches(self, entities: list[Entity]) -> list[list[Entity]]:
+        """Split the entities into batches that are searched in Port.
+
+        The batch size is adapted to the size of the entities, since the search response holds the mapped
+        properties and relations of every entity in the batch.
+        """
+        sample_entities = entities[:COMPARE_BATCH_SAMPLE_SIZE]
+        average_entity_size = sum(
+            len(json.dumps(entity.dict(exclude_unset=True, by_alias=True), default=str).encode())
+            for entity in sample_entities
+        ) / len(sample_entities)
+        batch_size = max(
+            1,
+            min(COMPARE_BATCH_MAX_LENGTH, int(COMPARE_BATCH_MAX_SIZE_IN_BYTES // max(average_entity_size, 1)))
+        )
+        return [
+            entities[start_index:start_index + batch_size]
+            for start_index in range(0, len(entities), batch_size)
+        ]
+
+    @TimeMetric(MetricPhase.COMPARE)
     async def _map_entities_compared_with_port(
         self,
         entities: list[Entity],
@@ -181,18 +221,20 @@ class SyncRawMixin(HandlerMixin, EventsMixin):
         if len(entities) <= MIN_ENTITIES_TO_MAP:
             return entities
 
-        BATCH_SIZE = 50
-        entities_at_port_with_properties = []
-
-        # Process entities in batches
-        for start_index in range(0, len(entities), BATCH_SIZE):
-            entities_batch = entities[start_index:start_index + BATCH_SIZE]
-            batch_results = await self._fetch_entities_batch_from_port(
-                entities_batch,
-                resource,
-                user_agent_type
+        # The batches are searched concurrently, bounded by the port client entities semaphore
+        batches_results = await asyncio.gather(
+            *(
+                self._fetch_entities_batch_from_port(
+                    entities_batch,
+                    resource,
+                    user_agent_type
+                )
+                for entities_batch in self._get_entities_compare_batches(entities)
             )
-            entities_at_port_with_properties.extend(batch_results)
+        )
+        entities_at_port_with_properties = [
+            entity for batch_results in batches_results for entity in batch_results
+        ]
 
         logger.info("Got entities from port with properties and relations", port_entities=len(entities_at_port_with_properties))
 
@@ -208,19 +250,20 @@ class SyncRawMixin(HandlerMixin, EventsMixin):
         user_agent_type: UserAgentType,
     ) -> list[Entity]:
         query = self._construct_search_query_for_entities(entities_batch)
-        return await ocean.port_client.search_entities(
-            user_agent_type,
-            parameters_to_include=["blueprint", "identifier"] + (
-                ["title"] if resource.port.entity.mappings.title != None else []
-            ) + (
-                ["team"] if resource.port.entity.mappings.team != None else []
-            ) + [
-                f"properties.{prop}" for prop in resource.port.entity.mappings.properties
-            ] + [
-                f"relations.{relation}" for relation in resource.port.entity.mappings.relations
-            ],
-            query=query
-        )
+        async with ocean.port_client.semaphore:
+            return await ocean.port_client.search_entities(
+                user_agent_type,
+                parameters_to_include=["blueprint", "identifier"] + (
+                    ["title"] if resource.port.entity.mappings.title != None else []
+                ) + (
+                    ["team"] if resource.port.entity.mappings.team != None else []
+                ) + [
+                    f"properties.{prop}" for prop in resource.port.entity.mappings.properties
+                ] + [
+                    f"relations.{relation}" for relation in resource.port.entity.mappings.relations
+                ],
+                query=query
+            )
 
     async def _register_resource_raw(
         self,
@@ -233,29 +276,52 @@ class SyncRawMixin(HandlerMixin, EventsMixin):
         objects_diff = await self._calculate_raw(
             [(resource, results)], parse_all, send_raw_data_examples_amount
         )
+        return await self._load_calculation_result(resource, objects_diff[0], user_agent_type)
 
+    async def _load_calculation_result(
+        self,
+        resource: ResourceConfig,
+        calculation_result: CalculationResult,
+        user_agent_type: UserAgentType,
+    ) -> CalculationResult:
         ocean.metrics.inc_metric(
             name=MetricType.OBJECT_COUNT_NAME,
             labels=[ocean.metrics.current_resource_kind(), MetricPhase.TRANSFORM, MetricPhase.TransformResult.FAILED],
-            value=len(objects_diff[0].entity_selector_diff.failed)
+            value=len(calculation_result.entity_selector_diff.failed)
         )
 
         modified_objects = []
+        passed_entities = calculation_result.entity_selector_diff.passed
 
         if event.event_type == EventType.RESYNC:
             try:
+                entities_to_compare = passed_entities
+                fingerprint_store = ocean.entity_fingerprint_store
+                if fingerprint_store:
+                    entities_to_compare = await asyncio.to_thread(fingerprint_store.filter_changed, entities_to_compare)
+                    logger.info("Skipping entities that didn't change since the last upsert",
+                        unchanged_entities=len(passed_entities) - len(entities_to_compare))
+
                 changed_entities = await self._map_entities_compared_with_port(
-                    objects_diff[0].entity_selector_diff.passed,
+                    entities_to_compare,
                     resource,
                     user_agent_type
                 )
+                if fingerprint_store and len(changed_entities) < len(entities_to_compare):
+                    changed_keys = {(entity.blueprint, entity.identifier) for entity in changed_entities}
+                    # Entities that are identical in Port are recorded as well, the changed ones are recorded once upserted
+                    await asyncio.to_thread(
+                        fingerprint_store.record,
+                        [entity for entity in entities_to_compare
+                        if (entity.blueprint, entity.identifier) not in changed_keys]
+                    )
                 if changed_entities:
                     logger.info("Upserting changed entities", changed_entities=len(changed_entities),
-                        total_entities=len(objects_diff[0].entity_selector_diff.passed))
+                        total_entities=len(passed_entities))
                     ocean.metrics.inc_metric(
                             name=MetricType.OBJECT_COUNT_NAME,
                             labels=[ocean.metrics.current_resource_kind(), MetricPhase.LOAD, MetricPhase.LoadResult.SKIPPED],
-                            value=len(objects_diff[0].entity_selector_diff.passed) - len(changed_entities)
+                            value=len(passed_entities) - len(changed_entities)
                         )
                     upserted_entities = await self.entities_state_applier.upsert(
                         changed_entities, user_agent_type
@@ -268,33 +334,33 @@ class SyncRawMixin(HandlerMixin, EventsMixin):
                     )
 
                 else:
-                    logger.info("Entities in batch didn't changed since last sync, skipping", total_entities=len(objects_diff[0].entity_selector_diff.passed))
+                    logger.info("Entities in batch didn't changed since last sync, skipping", total_entities=len(passed_entities))
                     ocean.metrics.inc_metric(
                             name=MetricType.OBJECT_COUNT_NAME,
                             labels=[ocean.metrics.current_resource_kind(), MetricPhase.LOAD, MetricPhase.LoadResult.SKIPPED],
-                            value=len(objects_diff[0].entity_selector_diff.passed)
+                            value=len(passed_entities)
                         )
-                modified_objects = [ocean.port_client._reduce_entity(entity) for entity in objects_diff[0].entity_selector_diff.passed]
+                modified_objects = [ocean.port_client._reduce_entity(entity) for entity in passed_entities]
             except Exception as e:
                 logger.warning(f"Failed to resolve batch entities with Port, falling back to upserting all entities: {str(e)}")
                 modified_objects = await self.entities_state_applier.upsert(
-                    objects_diff[0].entity_selector_diff.passed, user_agent_type
+                    passed_entities, user_agent_type
                     )
                 ocean.metrics.set_metric(
                         name=MetricType.OBJECT_COUNT_NAME,
                         labels=[ocean.metrics.current_resource_kind(), MetricPhase.LOAD, MetricPhase.LoadResult.LOADED],
-                        value=len(upserted_entities)
+                        value=len(modified_objects)
                     )
         else:
            modified_objects = await self.entities_state_applier.upsert(
-                    objects_diff[0].entity_selector_diff.passed, user_agent_type
+                    passed_entities, user_agent_type
                     )
 
         return CalculationResult(
-            number_of_transformed_entities=len(objects_diff[0].entity_selector_diff.passed),
-            entity_selector_diff=objects_diff[0].entity_selector_diff._replace(passed=modified_objects),
-            errors=objects_diff[0].errors,
-            misonfigured_entity_keys=objects_diff[0].misonfigured_entity_keys
+            number_of_transformed_entities=len(passed_entities),
+            entity_selector_diff=calculation_result.entity_selector_diff._replace(passed=modified_objects),
+            errors=calculation_result.errors,
+            misonfigured_entity_keys=calculation_result.misonfigured_entity_keys
         )
 
     async def _unregister_resource_raw(
@@ -318,10 +384,93 @@ class SyncRawMixin(HandlerMixin, EventsMixin):
         logger.info("Finished unregistering change")
         return entities_selector_diff.passed, errors
 
+    async def _register_generators_sequentially(
+        self,
+        resource_config: ResourceConfig,
+        async_generators: list[ASYNC_GENERATOR_RESYNC_TYPE],
+        transform: Callable[[list[RAW_ITEM]], Awaitable[CalculationResult]],
+        collect_calculation_result: Callable[[CalculationResult], Awaitable[None]],
+        errors: list[Exception],
+        user_agent_type: UserAgentType,
+    ) -> None:
+        # The next batch of a generator is transformed while the previous batch is compared with Port and upserted.
+        # Only one batch is loaded at a time, so batches are still upserted in the order they were generated
+        load_task: asyncio.Task[CalculationResult] | None = None
+
+        async def wait_for_load_task() -> None:
+            nonlocal load_task
+            if load_task is None:
+                return
+            task, load_task = load_task, None
+            await collect_calculation_result(await task)
+
+        try:
+            for generator in async_generators:
+                try:
+                    async for items in generator:
+                        calculation_result = await transform(items)
+                        await wait_for_load_task()
+                        load_task = asyncio.create_task(
+                            self._load_calculation_result(resource_config, calculation_result, user_agent_type)
+                        )
+                    await wait_for_load_task()
+                except* OceanAbortException as error:
+                    ocean.metrics.sync_state = SyncState.FAILED
+                    errors.append(error)
+                    await wait_for_load_task()
+        finally:
+            if load_task is not None:
+                load_task.cancel()
+                await asyncio.gather(load_task, return_exceptions=True)
+
+    async def _register_generators_in_pipeline(
+        self,
+        resource_config: ResourceConfig,
+        async_generators: list[ASYNC_GENERATOR_RESYNC_TYPE],
+        transform: Callable[[list[RAW_ITEM]], Awaitable[CalculationResult]],
+        collect_calculation_result: Callable[[CalculationResult], Awaitable[None]],
+        errors: list[Exception],
+        user_agent_type: UserAgentType,
+    ) -> None:
+        kind = ocean.metrics.current_resource_kind()
+
+        async def consume_generator(generator: ASYNC_GENERATOR_RESYNC_TYPE) -> ASYNC_GENERATOR_RESYNC_TYPE:
+            # An aborted generator fails the resync of the kind, without stopping the rest of its generators
+            try:
+                async for items in generator:
+                    yield items
+            except* OceanAbortException as error:
+                ocean.metrics.sync_state = SyncState.FAILED
+                errors.append(error)
+
+        async def load(calculation_result: CalculationResult) -> None:
+            await collect_calculation_result(
+                await self._load_calculation_result(resource_config, calculation_result, user_agent_type)
+            )
+
+        def report_stage(stage: str, queue_size: int, idle_seconds: float) -> None:
+            ocean.metrics.set_metric(MetricType.RESYNC_PIPELINE_QUEUE_SIZE_NAME, [kind, stage], queue_size)
+            ocean.metrics.set_metric(MetricType.RESYNC_PIPELINE_IDLE_NAME, [kind, stage], idle_seconds)
+
+        pipeline: BatchPipeline[list[RAW_ITEM], CalculationResult] = BatchPipeline(
+            transform,
+            load,
+            queue_size=ocean.config.resync_pipeline_queue_size,
+            extract_concurrency=ocean.config.resync_pipeline_extract_concurrency,
+            transform_concurrency=ocean.config.resync_pipeline_transform_concurrency,
+            load_concurrency=ocean.config.resync_pipeline_load_concurrency,
+            on_stage_update=report_stage,
+        )
+        await pipeline.run([consume_generator(generator) for generator in async_generators])
+        logger.info(
+            f"Finished the resync pipeline of kind: {kind}",
+            idle_seconds=pipeline.idle_seconds,
+        )
+
     @TimeMetric(MetricPhase.RESYNC)
     async def _register_in_batches(
         self, resource_config: ResourceConfig, user_agent_type: UserAgentType
-    ) -> tuple[list[Entity], list[Exception]]:
+    ) -> tuple[list[EntityRef], list[Exception]]:
         results, errors = await self._get_resource_raw_results(resource_config)
         async_generators: list[ASYNC_GENERATOR_RESYNC_TYPE] = []
         raw_results: RAW_RESULT = []
@@ -335,7 +484,24 @@ class SyncRawMixin(HandlerMixin, EventsMixin):
             SEND_RAW_DATA_EXAMPLES_AMOUNT if ocean.config.send_raw_data_examples else 0
         )
 
-        passed_entities = []
+        # When the generated entities are spilled to the reconciliation store, they aren't kept in memory,
+        # otherwise only compact references are kept until the reconciliation
+        generated_entities_store = event.generated_entities_store
+        passed_entities: list[EntityRef] = []
+        number_of_passed_entities = 0
+
+        async def collect_passed_entities(entities: list[Entity]) -> None:
+            nonlocal number_of_passed_entities
+            number_of_passed_entities += len(entities)
+            if generated_entities_store:
+                await asyncio.to_thread(generated_entities_store.add_generated_entities, entities)
+            elif self._subprocess_results_ipc:
+                self._subprocess_results_ipc.send(
+                    (SUBPROCESS_ENTITIES_MESSAGE, [EntityRef.from_entity(entity) for entity in entities])
+                )
+            else:
+                passed_entities.extend(EntityRef.from_entity(entity) for entity in entities)
+
         if raw_results:
             calculation_result = await self._register_resource_raw(
                 resource_config,
@@ -344,37 +510,44 @@ class SyncRawMixin(HandlerMixin, EventsMixin):
                 send_raw_data_examples_amount=send_raw_data_examples_amount
             )
             errors.extend(calculation_result.errors)
-            passed_entities = list(calculation_result.entity_selector_diff.passed)
+            await collect_passed_entities(calculation_result.entity_selector_diff.passed)
             logger.info(
-                f"Finished registering change for {len(raw_results)} raw results for kind: {resource_config.kind}. {len(passed_entities)} entities were affected"
+                f"Finished registering change for {len(raw_results)} raw results for kind: {resource_config.kind}. {number_of_passed_entities} entities were affected"
             )
 
         number_of_raw_results = 0
         number_of_transformed_entities = 0
-        for generator in async_generators:
-            try:
-                async for items in generator:
-                    number_of_raw_results += len(items)
-                    if send_raw_data_examples_amount > 0:
-                        send_raw_data_examples_amount = max(
-                            0, send_raw_data_examples_amount - len(passed_entities)
-                        )
 
-                    calculation_result = await self._register_resource_raw(
-                        resource_config,
-                        items,
-                        user_agent_type,
-                        send_raw_data_examples_amount=send_raw_data_examples_amount
-                    )
-                    passed_entities.extend(calculation_result.entity_selector_diff.passed)
-                    errors.extend(calculation_result.errors)
-                    number_of_transformed_entities += calculation_result.number_of_transformed_entities
-            except* OceanAbortException as error:
-                ocean.metrics.sync_state = SyncState.FAILED
-                errors.append(error)
+        async def collect_calculation_result(calculation_result: CalculationResult) -> None:
+            nonlocal number_of_transformed_entities
+            await collect_passed_entities(calculation_result.entity_selector_diff.passed)
+            errors.extend(calculation_result.errors)
+            number_of_transformed_entities += calculation_result.number_of_transformed_entities
+
+        async def transform(items: list[RAW_ITEM]) -> CalculationResult:
+            nonlocal number_of_raw_results, send_raw_data_examples_amount
+            number_of_raw_results += len(items)
+            if send_raw_data_examples_amount > 0:
+                send_raw_data_examples_amount = max(
+                    0, send_raw_data_examples_amount - number_of_passed_entities
+                )
+
+            objects_diff = await self._calculate_raw(
+                [(resource_config, items)], False, send_raw_data_examples_amount
+            )
+            return objects_diff[0]
+
+        if ocean.config.resync_pipeline_enabled:
+            await self._register_generators_in_pipeline(
+                resource_config, async_generators, transform, collect_calculation_result, errors, user_agent_type
+            )
+        else:
+            await self._register_generators_sequentially(
+                resource_config, async_generators, transform, collect_calculation_result, errors, user_agent_type
+            )
 
         logger.info(
-            f"Finished registering kind: {resource_config.kind}-{resource.resource.index} ,{len(passed_entities)} entities out of {number_of_raw_results} raw results"
+            f"Finished registering kind: {resource_config.kind}-{resource.resource.index} ,{number_of_passed_entities} entities out of {number_of_raw_results} raw results"
         )
 
 
@@ -586,23 +759,44 @@ class SyncRawMixin(HandlerMixin, EventsMixin):
                 user_agent_type,
             )
 
+    async def _upsert_entities_by_blueprint(self, entities: list[Entity], user_agent_type: UserAgentType) -> None:
+        entities_by_blueprint: dict[str, list[Entity]] = defaultdict(list)
+        for entity in entities:
+            entities_by_blueprint[entity.blueprint].append(entity)
+
+        port_client = self.entities_state_applier.context.port_client
+        await asyncio.gather(
+            *(
+                port_client.upsert_entities_in_batches(
+                    blueprint_entities,
+                    event.port_app_config.get_port_request_options(),
+                    user_agent_type,
+                    should_raise=False,
+                )
+                for blueprint_entities in entities_by_blueprint.values()
+            )
+        )
+
     async def sort_and_upsert_failed_entities(self,user_agent_type: UserAgentType)->None:
         try:
             if not event.entity_topological_sorter.should_execute():
                 return None
             logger.info(f"Executings topological sort of {event.entity_topological_sorter.get_entities_count()} entities failed to upsert.",failed_toupsert_entities_count=event.entity_topological_sorter.get_entities_count())
 
-            for entity in event.entity_topological_sorter.get_entities():
-                await self.entities_state_applier.context.port_client.upsert_entity(entity,event.port_app_config.get_port_request_options(),user_agent_type,should_raise=False)
+            # The entities of a level only depend on entities of the previous levels, so every level is upserted
+            # concurrently and the next level is only upserted once the current one is done
+            for entities in event.entity_topological_sorter.get_entities_levels():
+                await self._upsert_entities_by_blueprint(entities, user_agent_type)
 
         except OceanAbortException as ocean_abort:
             logger.info(f"Failed topological sort of failed to upsert entites - trying to upsert unordered {event.entity_topological_sorter.get_entities_count()} entities.",failed_topological_sort_entities_count=event.entity_topological_sorter.get_entities_count() )
             if isinstance(ocean_abort.__cause__,CycleError):
-                for entity in event.entity_topological_sorter.get_entities(False):
-                    await self.entities_state_applier.context.port_client.upsert_entity(entity,event.port_app_config.get_port_request_options(),user_agent_type,should_raise=False)
+                await self._upsert_entities_by_blueprint(
+                    list(event.entity_topological_sorter.get_entities(False)), user_agent_type
+                )
 
     def process_resource_in_subprocess(self,
-        file_ipc_map: dict[str, FileIPC],
+        results_ipc: PipeIPC,
         resource: ResourceConfig,
         index: int,
         user_agent_type: UserAgentType,
@@ -610,37 +804,51 @@ class SyncRawMixin(HandlerMixin, EventsMixin):
         logger.info(f"process started successfully for {resource.kind} with index {index}")
 
         clear_http_client_context()
+        # The references of the passed entities are streamed to the parent process as every batch is loaded
+        self._subprocess_results_ipc = results_ipc
         async def process_resource_task() -> None:
-            result = await self._process_resource(
+            _, errors = await self._process_resource(
                 resource, index, user_agent_type
             )
-            file_ipc_map["process_resource"].save(result)
-            file_ipc_map["topological_entities"].save(
-                event.entity_topological_sorter.entities
-            )
+            results_ipc.send((SUBPROCESS_TOPOLOGICAL_ENTITIES_MESSAGE, event.entity_topological_sorter.entities))
+            results_ipc.send((SUBPROCESS_ERRORS_MESSAGE, errors))
 
-        asyncio.run(process_resource_task())
+        try:
+            asyncio.run(process_resource_task())
+        finally:
+            # The workers of the entity processor started by this subprocess would outlive it otherwise
+            self.entity_processor.shutdown()
         logger.info(f"Process finished for {resource.kind} with index {index}")
 
-    async def process_resource(self, resource: ResourceConfig, index: int, user_agent_type: UserAgentType) -> tuple[list[Entity], list[Exception]]:
+    async def process_resource(self, resource: ResourceConfig, index: int, user_agent_type: UserAgentType) -> tuple[list[EntityRef], list[Exception]]:
             if ocean.app.process_execution_mode == ProcessExecutionMode.multi_process:
                 id = uuid.uuid4()
                 logger.info(f"Starting subprocess with id {id}")
-                file_ipc_map = {
-                    "process_resource": FileIPC(id, "process_resource",([],[IntegrationSubProcessFailedException(f"Subprocess failed for {resource.kind} with index {index}")])),
-                    "topological_entities": FileIPC(id, "topological_entities",[]),
-                }
-                process = ProcessWrapper(target=self.process_resource_in_subprocess, args=(file_ipc_map,resource,index,user_agent_type))
+                results_ipc = PipeIPC()
+                process = ProcessWrapper(target=self.process_resource_in_subprocess, args=(results_ipc,resource,index,user_agent_type))
                 process.start()
+                results_ipc.close_sender()
+
+                entities: list[EntityRef] = []
+                errors: list[Exception] | None = None
+                async for message_type, value in results_ipc.receive():
+                    if message_type == SUBPROCESS_ENTITIES_MESSAGE:
+                        entities.extend(value)
+                    elif message_type == SUBPROCESS_TOPOLOGICAL_ENTITIES_MESSAGE:
+                        event.entity_topological_sorter.entities.extend(value)
+                    elif message_type == SUBPROCESS_ERRORS_MESSAGE:
+                        errors = value
                 await process.join_async()
 
-                event.entity_topological_sorter.entities.extend(file_ipc_map["topological_entities"].load())
-                return file_ipc_map["process_resource"].load()
+                if errors is None:
+                    # The subprocess exited before it finished processing the resource
+                    errors = [IntegrationSubProcessFailedException(f"Subprocess failed for {resource.kind} with index {index}")]
+                return entities, errors
 
             else:
                 return await self._process_resource(resource,index,user_agent_type)
 
-    async def _process_resource(self,resource: ResourceConfig, index: int, user_agent_type: UserAgentType)-> tuple[list[Entity], list[Exception]]:
+    async def _process_resource(self,resource: ResourceConfig, index: int, user_agent_type: UserAgentType)-> tuple[list[EntityRef], list[Exception]]:
         # create resource context per resource kind, so resync method could have access to the resource
         # config as we might have multiple resources in the same event
         async with resource_context(resource,index):
@@ -651,7 +859,7 @@ class SyncRawMixin(HandlerMixin, EventsMixin):
                 self._register_in_batches(resource, user_agent_type)
             )
             event.on_abort(lambda: task.cancel())
-            kind_results: tuple[list[Entity], list[Exception]] = await task
+            kind_results: tuple[list[EntityRef], list[Exception]] = await task
 
             if ocean.metrics.sync_state != SyncState.FAILED:
                 ocean.metrics.sync_state = SyncState.COMPLETED
@@ -663,10 +871,38 @@ class SyncRawMixin(HandlerMixin, EventsMixin):
 
             return kind_results
 
+    async def _process_resources(
+        self, resources: list[ResourceConfig], user_agent_type: UserAgentType
+    ) -> list[tuple[list[EntityRef], list[Exception]]]:
+        """Process all the mapping resources, returning their results in the mapping order.
+
+        When `resync_resources_concurrency` is greater than 1, independent resources are processed concurrently
+        while resources whose blueprints relate to each other keep the mapping order.
+        """
+        concurrency = ocean.config.resync_resources_concurrency
+        if concurrency <= 1 or len(resources) <= 1:
+            creation_results: list[tuple[list[EntityRef], list[Exception]]] = []
+            for index, resource in enumerate(resources):
+                logger.info(f"Starting processing resource {resource.kind} with index {index}")
+                creation_results.append(await self.process_resource(resource, index, user_agent_type))
+            return creation_results
+
+        dependencies = await resolve_resources_dependencies(resources, ocean.port_client)
+        logger.info(
+            f"Processing {len(resources)} resources with up to {concurrency} concurrent workers",
+            resources_dependencies={index: sorted(deps) for index, deps in dependencies.items()},
+        )
+        scheduler: ResourceScheduler[tuple[list[EntityRef], list[Exception]]] = ResourceScheduler(
+            resources, dependencies, concurrency
+        )
+        return await scheduler.run(
+            lambda resource, index: self.process_resource(resource, index, user_agent_type)
+        )
+
     @TimeMetricWithResourceKind(MetricPhase.RESYNC)
     async def resync_reconciliation(
         self,
-        creation_results: list[tuple[list[Entity], list[Exception]]],
+        creation_results: list[tuple[list[EntityRef], list[Exception]]],
         did_fetched_current_state: bool,
         user_agent_type: UserAgentType,
         app_config: Any,
@@ -683,7 +919,7 @@ class SyncRawMixin(HandlerMixin, EventsMixin):
         6. Executing resync complete hooks
 
         Args:
-            creation_results (list[tuple[list[Entity], list[Exception]]]): Results from entity creation
+            creation_results (list[tuple[list[EntityRef], list[Exception]]]): Results from entity creation
             did_fetched_current_state (bool): Whether the current state was successfully fetched
             user_agent_type (UserAgentType): The type of user agent
             app_config (Any): The application configuration
@@ -717,17 +953,41 @@ class SyncRawMixin(HandlerMixin, EventsMixin):
             logger.error(message, exc_info=error_group)
             return False
 
-        logger.info(
-            f"Running resync diff calculation, number of entities created during sync: {len(generated_entities)}"
-        )
-        entities_at_port = await ocean.port_client.search_entities(
-            user_agent_type
-        )
+        if generated_entities_store := event.generated_entities_store:
+            logger.info(
+                f"Running resync diff calculation, number of entities created during sync: {await asyncio.to_thread(generated_entities_store.count_generated_entities)}"
+            )
+            async with aclosing(ocean.port_client.search_entities_in_batches(user_agent_type)) as batches:
+                async for entities_at_port in batches:
+                    await asyncio.to_thread(generated_entities_store.add_port_entities, entities_at_port)
+            if ocean.entity_fingerprint_store:
+                await asyncio.to_thread(
+                    ocean.entity_fingerprint_store.retain_database_entities,
+                    generated_entities_store.path,
+                    "port_entities",
+                )
 
-        await self.entities_state_applier.delete_diff(
-            {"before": entities_at_port, "after": generated_entities},
-            user_agent_type, app_config.get_entity_deletion_threshold()
-        )
+            await self.entities_state_applier.delete_generated_entities_diff(
+                generated_entities_store, user_agent_type, app_config.get_entity_deletion_threshold()
+            )
+        else:
+            logger.info(
+                f"Running resync diff calculation, number of entities created during sync: {len(generated_entities)}"
+            )
+            # The entities in Port are searched a batch at a time and only their references are kept
+            async with aclosing(ocean.port_client.search_entities_in_batches(user_agent_type)) as batches:
+                entities_at_port = [
+                    EntityRef.from_entity(entity)
+                    async for entities in batches
+                    for entity in entities
+                ]
+            if ocean.entity_fingerprint_store:
+                await asyncio.to_thread(ocean.entity_fingerprint_store.retain, entities_at_port)
+
+            await self.entities_state_applier.delete_diff(
+                {"before": entities_at_port, "after": generated_entities},
+                user_agent_type, app_config.get_entity_deletion_threshold()
+            )
 
         logger.info("Resync finished successfully")
 
@@ -741,6 +1001,39 @@ class SyncRawMixin(HandlerMixin, EventsMixin):
             logger.info("Finished executing resync_complete hooks")
 
 
+    async def sync_raw_kinds(
+        self,
+        kinds: typing.Iterable[str],
+        trigger_type: TriggerType = "machine",
+        user_agent_type: UserAgentType = UserAgentType.exporter,
+    ) -> None:
+        """Resync only the resources of the given kinds.
+
+        Entities are upserted the same way as in a full resync, but as the rest of the resources aren't resynced
+        the entities that weren't generated aren't deleted. The resync waits for a running full resync to finish.
+
+        Args:
+            kinds (Iterable[str]): The kinds of the resources to resync.
+            trigger_type (TriggerType): The type of trigger for the synchronization.
+            user_agent_type (UserAgentType): The type of user agent.
+        """
+        kinds = set(kinds)
+        logger.info(f"Resync of kinds {sorted(kinds)} was triggered")
+
+        # Waits for a running full resync before starting the event, so it doesn't abort it.
+        # The resync refreshes the kinds, so it doesn't read the results cached by earlier runs
+        async with self._resync_lock, event_context(
+            EventType.RESYNC,
+            trigger_type=trigger_type,
+            attributes={BYPASS_CACHE_ATTRIBUTE: True},
+        ):
+            app_config = await self.port_app_config_handler.get_port_app_config()
+            multiprocessing.set_start_method('fork', True)
+            for index, resource in enumerate(app_config.resources):
+                if resource.kind in kinds:
+                    await self.process_resource(resource, index, user_agent_type)
+            await self.sort_and_upsert_failed_entities(user_agent_type)
+
     @TimeMetric(MetricPhase.RESYNC)
     async def sync_raw_all(
         self,
@@ -761,11 +1054,18 @@ class SyncRawMixin(HandlerMixin, EventsMixin):
             silent (bool): Whether to raise exceptions or handle them silently.
         """
         logger.info("Resync was triggered")
+        # A resync is triggered by a mappings change, the live events stop using the cached mappings
+        # right away instead of once the running resync is aborted
+        self.port_app_config_handler.invalidate_cache()
 
+        # The event is started before waiting for the running resync, so the newer resync aborts it
         async with event_context(
             EventType.RESYNC,
             trigger_type=trigger_type,
-        ):
+        ), self._resync_lock:
+            if event.aborted:
+                logger.warning("Resync was aborted by a newer resync before it started")
+                raise asyncio.CancelledError()
             ocean.metrics.event_id = event.id
 
             # If a resync is triggered due to a mappings change, we want to make sure that we have the updated version
@@ -783,6 +1083,14 @@ class SyncRawMixin(HandlerMixin, EventsMixin):
             # Clear cache
             await ocean.app.cache_provider.clear()
 
+            if ocean.entity_fingerprint_store:
+                await asyncio.to_thread(ocean.entity_fingerprint_store.reconcile_if_due)
+
+            if ocean.config.reconciliation_mode == ReconciliationMode.disk:
+                event.generated_entities_store = GeneratedEntitiesStore(
+                    f".ocean_cache/reconciliation/{event.id}.sqlite"
+                )
+
             # Execute resync_start hooks
             for resync_start_fn in self.event_strategy["resync_start"]:
                 await resync_start_fn()
@@ -799,13 +1107,11 @@ class SyncRawMixin(HandlerMixin, EventsMixin):
                 )
                 did_fetched_current_state = False
 
-            creation_results: list[tuple[list[Entity], list[Exception]]] = []
+            creation_results: list[tuple[list[EntityRef], list[Exception]]] = []
 
             multiprocessing.set_start_method('fork', True)
             try:
-                for index,resource in enumerate(app_config.resources):
-                    logger.info(f"Starting processing resource {resource.kind} with index {index}")
-                    creation_results.append(await self.process_resource(resource,index,user_agent_type))
+                creation_results = await self._process_resources(app_config.resources, user_agent_type)
             except asyncio.CancelledError as e:
                 logger.warning("Resync aborted successfully, skipping delete phase. This leads to an incomplete state")
                 raise
@@ -820,5 +1126,7 @@ class SyncRawMixin(HandlerMixin, EventsMixin):
                 await ocean.metrics.report_sync_metrics(kinds=[MetricResourceKind.RECONCILIATION])
             finally:
                 await ocean.app.cache_provider.clear()
+                if event.generated_entities_store:
+                    event.generated_entities_store.remove()
                 if ocean.app.process_execution_mode == ProcessExecutionMode.multi_process:
                     ocean.metrics.cleanup_prometheus_metrics()
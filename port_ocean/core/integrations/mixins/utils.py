@@ -91,14 +91,26 @@ class ProcessWrapper(multiprocessing.Process):
         super().__init__(*args, **kwargs)
 
     async def join_async(self) -> None:
-        while self.exitcode is None:
-            await asyncio.sleep(2)
+        # The sentinel of the process becomes readable once it exits, so the event loop wakes up right away
+        # instead of polling the exit code
+        loop = asyncio.get_running_loop()
+        exited: asyncio.Future[None] = loop.create_future()
+
+        def on_exit() -> None:
+            if not exited.done():
+                exited.set_result(None)
+
+        loop.add_reader(self.sentinel, on_exit)
+        try:
+            await exited
+        finally:
+            loop.remove_reader(self.sentinel)
+        super().join()
         if self.exitcode != 0:
             logger.error(f"Process {self.pid} failed with exit code {self.exitcode}")
         else:
             logger.info(f"Process {self.pid} finished with exit code {self.exitcode}")
         ocean.metrics.cleanup_prometheus_metrics(self.pid)
-        return super().join()
 
 def clear_http_client_context() -> None:
     try:
@@ -1,6 +1,6 @@
 from dataclasses import dataclass, field
 from enum import Enum, StrEnum
-from typing import Any, TypedDict
+from typing import Any, Generic, TypedDict, TypeVar
 
 from pydantic import BaseModel
 from pydantic.fields import Field
@@ -19,6 +19,34 @@ class ProcessExecutionMode(StrEnum):
 class CachingStorageMode(StrEnum):
     disk = "disk"
     memory = "memory"
+    lru = "lru"
+
+
+class CachingSerializer(StrEnum):
+    pickle = "pickle"
+    json = "json"
+
+
+class EntityProcessorMode(StrEnum):
+    jq = "jq"
+    jq_batch = "jq_batch"
+    jq_process_pool = "jq_process_pool"
+
+
+class ReconciliationMode(StrEnum):
+    memory = "memory"
+    disk = "disk"
+
+
+class LiveEventsQueueMode(StrEnum):
+    memory = "memory"
+    disk = "disk"
+
+
+class LiveEventsOverflowPolicy(StrEnum):
+    reject = "reject"
+    drop_oldest = "drop_oldest"
+    dirty_kinds = "dirty_kinds"
 
 
 class Runtime(Enum):
@@ -67,6 +95,75 @@ class Entity(BaseModel):
         )
 
 
+class EntityRef:
+    """
+    A compact reference to an entity that was already upserted, keeping only the identifier, the blueprint
+    and the relations that the reconciliation needs.
+
+    A reduced pydantic Entity takes about 740 bytes, a reference takes about 64 bytes (and another 64 bytes
+    when it has relations), so the references of every generated entity and every entity in Port are kept
+    during the resync instead of the entities. References are converted back to entities by `to_entity`
+    when they are sent to Port.
+    """
+
+    __slots__ = ("identifier", "blueprint", "_relations")
+
+    def __init__(
+        self,
+        identifier: Any,
+        blueprint: Any,
+        relations: dict[str, Any] | None = None,
+    ) -> None:
+        self.identifier = identifier
+        self.blueprint = blueprint
+        # Most entities don't have relations, an empty dict isn't kept for each of them
+        self._relations = relations or None
+
+    @classmethod
+    def from_entity(cls, entity: Entity) -> "EntityRef":
+        # Search relations (dict typed) aren't kept, only the identifiers of the related entities are
+        return cls(
+            entity.identifier,
+            entity.blueprint,
+            {
+                key: None if isinstance(relation, dict) else relation
+                for key, relation in entity.relations.items()
+            },
+        )
+
+    @property
+    def relations(self) -> dict[str, Any]:
+        return self._relations or {}
+
+    @property
+    def is_using_search_identifier(self) -> bool:
+        return isinstance(self.identifier, dict)
+
+    def to_entity(self) -> Entity:
+        return Entity.construct(
+            identifier=self.identifier,
+            blueprint=self.blueprint,
+            relations=self.relations,
+        )
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, EntityRef):
+            return NotImplemented
+        return (self.identifier, self.blueprint, self.relations) == (
+            other.identifier,
+            other.blueprint,
+            other.relations,
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"EntityRef(identifier={self.identifier!r}, blueprint={self.blueprint!r})"
+        )
+
+
+EntityT = TypeVar("EntityT", bound=Entity | EntityRef)
+
+
 class EntityBulkResult(TypedDict):
     identifier: str
     index: int
@@ -86,6 +183,18 @@ class BulkUpsertResponse(TypedDict):
     errors: list[EntityBulkError]
 
 
+class EntityBulkDeleteError(TypedDict):
+    identifier: str
+    statusCode: int
+    error: str
+    message: str
+
+
+class BulkDeleteResponse(TypedDict):
+    entities: list[str]
+    errors: list[EntityBulkDeleteError]
+
+
 class BlueprintRelation(BaseModel):
     many: bool
     required: bool
@@ -110,13 +219,13 @@ class Migration(BaseModel):
 
 
 @dataclass
-class EntityPortDiff:
+class EntityPortDiff(Generic[EntityT]):
     """Represents the differences between entities for porting.
 
     This class holds the lists of deleted, modified, and created entities as part
     of the porting process.
     """
 
-    deleted: list[Entity] = field(default_factory=list)
-    modified: list[Entity] = field(default_factory=list)
-    created: list[Entity] = field(default_factory=list)
+    deleted: list[EntityT] = field(default_factory=list)
+    modified: list[EntityT] = field(default_factory=list)
+    created: list[EntityT] = field(default_factory=list)
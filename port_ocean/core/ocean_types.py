@@ -8,7 +8,7 @@ from typing import (
 )
 
 from dataclasses import field
-from port_ocean.core.models import Entity
+from port_ocean.core.models import Entity, EntityRef
 
 RAW_ITEM = dict[Any, Any]
 RAW_RESULT = list[RAW_ITEM]
@@ -33,6 +33,11 @@ class EntityDiff(TypedDict):
     after: list[Entity]
 
 
+class EntityRefDiff(TypedDict):
+    before: list[EntityRef]
+    after: list[EntityRef]
+
+
 class EntitySelectorDiff(NamedTuple):
     passed: list[Entity]
     failed: list[Entity]
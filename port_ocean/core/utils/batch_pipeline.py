@@ -0,0 +1,178 @@
+import asyncio
+import time
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Coroutine,
+    Generic,
+    Iterator,
+    TypeVar,
+)
+
+from loguru import logger
+
+from port_ocean.helpers.metric.metric import MetricPhase
+
+BatchT = TypeVar("BatchT")
+TransformedT = TypeVar("TransformedT")
+
+# Signals the workers of the next stage that no more batches will be put in their queue
+_END_OF_STAGE = object()
+
+PIPELINE_STAGES = (MetricPhase.EXTRACT, MetricPhase.TRANSFORM, MetricPhase.LOAD)
+
+
+def _flatten_exceptions(error: BaseException) -> Iterator[Exception]:
+    if isinstance(error, BaseExceptionGroup):
+        for inner_error in error.exceptions:
+            yield from _flatten_exceptions(inner_error)
+    elif isinstance(error, Exception):
+        yield error
+
+
+class BatchPipeline(Generic[BatchT, TransformedT]):
+    """
+    Runs the batches of async generators through concurrent extract, transform and load stages.
+
+    The stages are connected by bounded queues, so while a batch is loaded the next one is transformed and the
+    one after it is fetched, and a slow stage applies backpressure to the stages before it instead of letting
+    batches pile up in memory. Every stage runs its own number of workers, the batches are loaded in the order
+    they were generated only when every stage has a single worker.
+
+    The time the workers of every stage spend waiting on the queues is tracked, the stage that barely waits
+    is the bottleneck of the pipeline.
+
+    Args:
+        transform: Transforms a batch that was extracted from a generator
+        load: Loads a transformed batch
+        queue_size: The max number of batches waiting in front of the transform and the load stages
+        extract_concurrency: The number of generators that are consumed concurrently
+        transform_concurrency: The number of batches that are transformed concurrently
+        load_concurrency: The number of batches that are loaded concurrently
+        on_stage_update: Called with the stage, the number of batches (or generators) waiting for it and its total
+            idle seconds whenever a worker of the stage is done waiting on a queue
+    """
+
+    def __init__(
+        self,
+        transform: Callable[[BatchT], Awaitable[TransformedT]],
+        load: Callable[[TransformedT], Awaitable[None]],
+        queue_size: int = 1,
+        extract_concurrency: int = 1,
+        transform_concurrency: int = 1,
+        load_concurrency: int = 1,
+        on_stage_update: Callable[[str, int, float], None] | None = None,
+    ) -> None:
+        self.transform = transform
+        self.load = load
+        self.queue_size = queue_size
+        self.extract_concurrency = extract_concurrency
+        self.transform_concurrency = transform_concurrency
+        self.load_concurrency = load_concurrency
+        self.on_stage_update = on_stage_update
+        self.idle_seconds = {stage: 0.0 for stage in PIPELINE_STAGES}
+
+    def _record_wait(self, stage: str, waiting_since: float, waiting: int) -> None:
+        self.idle_seconds[stage] += time.monotonic() - waiting_since
+        if self.on_stage_update:
+            self.on_stage_update(stage, waiting, self.idle_seconds[stage])
+
+    async def _put(
+        self, stage: str, queue: "asyncio.Queue[Any]", item: Any, waiting: int
+    ) -> None:
+        waiting_since = time.monotonic()
+        await queue.put(item)
+        self._record_wait(stage, waiting_since, waiting)
+
+    async def _get(self, stage: str, queue: "asyncio.Queue[Any]") -> Any:
+        waiting_since = time.monotonic()
+        item = await queue.get()
+        self._record_wait(stage, waiting_since, queue.qsize())
+        return item
+
+    async def run(self, generators: list[AsyncIterator[BatchT]]) -> None:
+        """
+        Run the pipeline until all the generators are exhausted and their batches are loaded.
+        When any of the stages fails the rest of them are cancelled and the error is raised.
+        """
+        transform_queue: asyncio.Queue[Any] = asyncio.Queue(self.queue_size)
+        load_queue: asyncio.Queue[Any] = asyncio.Queue(self.queue_size)
+        pending_generators = list(reversed(generators))
+
+        async def extract_worker() -> None:
+            while pending_generators:
+                generator = pending_generators.pop()
+                async for batch in generator:
+                    await self._put(
+                        MetricPhase.EXTRACT,
+                        transform_queue,
+                        batch,
+                        len(pending_generators),
+                    )
+
+        async def transform_worker() -> None:
+            while (
+                batch := await self._get(MetricPhase.TRANSFORM, transform_queue)
+            ) is not _END_OF_STAGE:
+                transformed = await self.transform(batch)
+                await self._put(
+                    MetricPhase.TRANSFORM,
+                    load_queue,
+                    transformed,
+                    transform_queue.qsize(),
+                )
+
+        async def load_worker() -> None:
+            while (
+                transformed := await self._get(MetricPhase.LOAD, load_queue)
+            ) is not _END_OF_STAGE:
+                await self.load(transformed)
+
+        async def run_stage(
+            worker: Callable[[], Coroutine[Any, Any, None]],
+            concurrency: int,
+            next_stage_queue: "asyncio.Queue[Any] | None",
+            next_stage_concurrency: int,
+        ) -> None:
+            async with asyncio.TaskGroup() as task_group:
+                for _ in range(concurrency):
+                    task_group.create_task(worker())
+            if next_stage_queue is not None:
+                for _ in range(next_stage_concurrency):
+                    await next_stage_queue.put(_END_OF_STAGE)
+
+        try:
+            async with asyncio.TaskGroup() as task_group:
+                task_group.create_task(
+                    run_stage(
+                        extract_worker,
+                        min(self.extract_concurrency, max(1, len(generators))),
+                        transform_queue,
+                        self.transform_concurrency,
+                    )
+                )
+                task_group.create_task(
+                    run_stage(
+                        transform_worker,
+                        self.transform_concurrency,
+                        load_queue,
+                        self.load_concurrency,
+                    )
+                )
+                task_group.create_task(
+                    run_stage(load_worker, self.load_concurrency, None, 0)
+                )
+        except ExceptionGroup as error:
+            # Every stage runs its workers in a task group of its own, the errors are raised in a single flat group
+            raise ExceptionGroup(
+                "The batch pipeline failed", list(_flatten_exceptions(error))
+            ) from None
+
+        logger.debug(
+            "Finished running the batch pipeline",
+            idle_seconds={
+                stage: round(seconds, 3) for stage, seconds in self.idle_seconds.items()
+            },
+        )
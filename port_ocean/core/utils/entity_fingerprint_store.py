@@ -0,0 +1,203 @@
+import hashlib
+import json
+import sqlite3
+import time
+from contextlib import closing, contextmanager
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from loguru import logger
+
+from port_ocean.core.models import Entity, EntityRef
+
+EntityKey = tuple[str, str]
+
+
+class EntityFingerprintStore:
+    """
+    A persistent store of the content hash of every entity that is known to be up to date in Port,
+    keyed by the entity blueprint and identifier.
+
+    Entities are recorded after they were upserted successfully (or found identical in Port), so
+    resyncs can skip entities that didn't change since the last resync without querying Port.
+    Since entities can still be changed directly in Port, the store is cleared every
+    `reconcile_interval` seconds, which makes the following resync compare all of the entities with Port.
+
+    The store is a sqlite database in WAL mode, every operation opens its own connection so it
+    can be used by the resync subprocesses as well. The operations are blocking, callers on the
+    event loop should run them in a thread.
+    """
+
+    def __init__(self, path: str | Path, reconcile_interval: int | None = None) -> None:
+        self.path = Path(path)
+        self.reconcile_interval = reconcile_interval
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS entity_fingerprints ("
+                "blueprint TEXT NOT NULL, identifier TEXT NOT NULL, fingerprint TEXT NOT NULL, "
+                "PRIMARY KEY (blueprint, identifier)) WITHOUT ROWID"
+            )
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS metadata (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+            )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        with closing(sqlite3.connect(self.path, timeout=30)) as connection:
+            with connection:
+                yield connection
+
+    @staticmethod
+    def get_key(entity: Entity | EntityRef) -> EntityKey | None:
+        """Entities that are identified by a search query can't be tracked by the store"""
+        if not isinstance(entity.identifier, str) or not isinstance(
+            entity.blueprint, str
+        ):
+            return None
+        return entity.blueprint, entity.identifier
+
+    @staticmethod
+    def get_fingerprint(entity: Entity) -> str:
+        entity_json = json.dumps(
+            entity.dict(exclude_unset=True, by_alias=True),
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(entity_json.encode()).hexdigest()
+
+    def _get_fingerprints(self, keys: list[EntityKey]) -> dict[EntityKey, str]:
+        fingerprints: dict[EntityKey, str] = {}
+        with self._connect() as connection:
+            # Keeping the number of parameters of every query below the sqlite limit
+            batch_size = 400
+            for start_index in range(0, len(keys), batch_size):
+                batch = keys[start_index : start_index + batch_size]
+                values = ", ".join(["(?, ?)"] * len(batch))
+                rows = connection.execute(
+                    "SELECT blueprint, identifier, fingerprint FROM entity_fingerprints "
+                    f"WHERE (blueprint, identifier) IN (VALUES {values})",
+                    [value for key in batch for value in key],
+                )
+                for blueprint, identifier, fingerprint in rows:
+                    fingerprints[(blueprint, identifier)] = fingerprint
+        return fingerprints
+
+    def filter_changed(self, entities: list[Entity]) -> list[Entity]:
+        """Return the entities that changed since they were last recorded, or were never recorded"""
+        keys = [key for entity in entities if (key := self.get_key(entity)) is not None]
+        if not keys:
+            return entities
+
+        fingerprints = self._get_fingerprints(keys)
+        return [
+            entity
+            for entity in entities
+            if (key := self.get_key(entity)) is None
+            or fingerprints.get(key) != self.get_fingerprint(entity)
+        ]
+
+    def record(self, entities: Iterable[Entity]) -> None:
+        rows = [
+            (*key, self.get_fingerprint(entity))
+            for entity in entities
+            if (key := self.get_key(entity)) is not None
+        ]
+        if not rows:
+            return
+        with self._connect() as connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO entity_fingerprints (blueprint, identifier, fingerprint) VALUES (?, ?, ?)",
+                rows,
+            )
+
+    def forget(self, entities: Iterable[Entity]) -> None:
+        keys = [key for entity in entities if (key := self.get_key(entity)) is not None]
+        self._delete_keys(keys)
+
+    def _delete_keys(self, keys: list[EntityKey]) -> None:
+        if not keys:
+            return
+        with self._connect() as connection:
+            connection.executemany(
+                "DELETE FROM entity_fingerprints WHERE blueprint = ? AND identifier = ?",
+                keys,
+            )
+
+    def retain(self, entities: Iterable[Entity | EntityRef]) -> None:
+        """
+        Forget the recorded entities that are not part of the given entities (e.g. deleted from Port).
+
+        The keys of the given entities are streamed into a temporary table, so the entities are never
+        held in memory all at once.
+        """
+        with self._connect() as connection:
+            connection.execute(
+                "CREATE TEMP TABLE retained_entities ("
+                "blueprint TEXT NOT NULL, identifier TEXT NOT NULL, "
+                "PRIMARY KEY (blueprint, identifier)) WITHOUT ROWID"
+            )
+            connection.executemany(
+                "INSERT OR IGNORE INTO retained_entities (blueprint, identifier) VALUES (?, ?)",
+                (
+                    key
+                    for entity in entities
+                    if (key := self.get_key(entity)) is not None
+                ),
+            )
+            self._delete_missing_from(connection, "retained_entities")
+
+    def retain_database_entities(self, path: str | Path, table: str) -> None:
+        """
+        Forget the recorded entities whose keys are missing from a (blueprint, identifier) table of another
+        sqlite database, such as the Port entities of the GeneratedEntitiesStore, without reading the keys
+        into memory.
+        """
+        with self._connect() as connection:
+            connection.execute("ATTACH DATABASE ? AS retained", (str(path),))
+            self._delete_missing_from(connection, f"retained.{table}")
+
+    @staticmethod
+    def _delete_missing_from(connection: sqlite3.Connection, table: str) -> None:
+        removed_entities = connection.execute(
+            "DELETE FROM entity_fingerprints WHERE NOT EXISTS ("
+            f"SELECT 1 FROM {table} AS retained "
+            "WHERE retained.blueprint = entity_fingerprints.blueprint "
+            "AND retained.identifier = entity_fingerprints.identifier)"
+        ).rowcount
+        if removed_entities:
+            logger.info(
+                f"Removing {removed_entities} entities that no longer exist in Port from the fingerprint store"
+            )
+
+    def clear(self) -> None:
+        with self._connect() as connection:
+            connection.execute("DELETE FROM entity_fingerprints")
+
+    def reconcile_if_due(self) -> bool:
+        """
+        Clear the store when the reconcile interval has passed since the last reconciliation,
+        so the entities will be compared with Port again.
+        """
+        now = time.time()
+        with self._connect() as connection:
+            row = connection.execute(
+                "SELECT value FROM metadata WHERE key = 'last_reconciled_at'"
+            ).fetchone()
+            last_reconciled_at = float(row[0]) if row else None
+            is_due = last_reconciled_at is None or (
+                self.reconcile_interval is not None
+                and now - last_reconciled_at >= self.reconcile_interval
+            )
+            if is_due:
+                connection.execute("DELETE FROM entity_fingerprints")
+                connection.execute(
+                    "INSERT OR REPLACE INTO metadata (key, value) VALUES ('last_reconciled_at', ?)",
+                    (str(now),),
+                )
+        if is_due:
+            logger.info(
+                "Cleared the entity fingerprint store to reconcile it with Port"
+            )
+        return is_due
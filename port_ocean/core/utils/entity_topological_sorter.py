@@ -1,3 +1,4 @@
+from collections import defaultdict
 from typing import Any, Generator
 from port_ocean.context import event
 from port_ocean.core.models import Entity
@@ -5,11 +6,13 @@ from port_ocean.core.models import Entity
 from loguru import logger
 
 from graphlib import TopologicalSorter, CycleError
-from typing import Set
+from typing import NoReturn, Set
 
 from port_ocean.exceptions.core import OceanAbortException
 
 Node = tuple[str, str]
+# The target blueprint of every (blueprint, relation) pair
+RelationTargets = dict[tuple[str, str], str]
 
 
 class EntityTopologicalSorter:
@@ -43,48 +46,112 @@ class EntityTopologicalSorter:
         for entity in sorted_and_mapped:
             yield entity
 
+    def get_entities_levels(self) -> Generator[list[Entity], None, None]:
+        return EntityTopologicalSorter.iter_dependency_levels(self.entities)
+
     @staticmethod
     def node(entity: Entity) -> Node:
         return entity.identifier, entity.blueprint
 
     @staticmethod
-    def order_by_entities_dependencies(entities: list[Entity]) -> list[Entity]:
+    def _build_dependency_graph(
+        entities: list[Entity],
+        relation_targets: RelationTargets | None = None,
+    ) -> tuple[dict[Node, Set[Node]], dict[Node, Entity]]:
+        """Map every entity to the entities it relates to.
+
+        The entities are indexed by their identifier, so building the graph is linear in the number of
+        entities and relations. When the target blueprint of a relation is known from `relation_targets`,
+        only the entity of that blueprint is related, otherwise every entity with the related identifier is.
+        """
         nodes: dict[Node, Set[Node]] = {}
-        entities_map = {}
+        entities_map: dict[Node, Entity] = {}
+        nodes_by_identifier: dict[str, list[Node]] = defaultdict(list)
         for entity in entities:
-            nodes[EntityTopologicalSorter.node(entity)] = set()
-            entities_map[EntityTopologicalSorter.node(entity)] = entity
+            node = EntityTopologicalSorter.node(entity)
+            if node not in nodes:
+                nodes_by_identifier[entity.identifier].append(node)
+            nodes[node] = set()
+            entities_map[node] = entity
 
         for entity in entities:
-            relation_target_ids: list[str] = sum(
-                [
+            node = EntityTopologicalSorter.node(entity)
+            for relation_name, identifiers in entity.relations.items():
+                if identifiers is None:
+                    continue
+                target_blueprint = (
+                    relation_targets.get((entity.blueprint, relation_name))
+                    if relation_targets
+                    else None
+                )
+                for identifier in (
                     identifiers if isinstance(identifiers, list) else [identifiers]
-                    for identifiers in entity.relations.values()
-                    if identifiers is not None
-                ],
-                [],
-            )
-            related_entities = [
-                related
-                for related in entities
-                if related.identifier in relation_target_ids
-            ]
-
-            for related_entity in related_entities:
-                if (
-                    entity.blueprint is not related_entity.blueprint
-                    or entity.identifier is not related_entity.identifier
                 ):
-                    nodes[EntityTopologicalSorter.node(entity)].add(
-                        EntityTopologicalSorter.node(related_entity)
+                    # Search relations can't be resolved to a specific entity
+                    if not isinstance(identifier, str):
+                        continue
+                    if target_blueprint is None:
+                        related_nodes = nodes_by_identifier.get(identifier, [])
+                    elif (identifier, target_blueprint) in nodes:
+                        related_nodes = [(identifier, target_blueprint)]
+                    else:
+                        continue
+
+                    nodes[node].update(
+                        related_node
+                        for related_node in related_nodes
+                        if related_node != node
                     )
+        return nodes, entities_map
+
+    @staticmethod
+    def _raise_cycle_error(ex: CycleError) -> NoReturn:
+        raise OceanAbortException(
+            "Cannot order entities due to cyclic dependencies. \n"
+            "If you do want to have cyclic dependencies, please make sure to set the keys"
+            " 'createMissingRelatedEntities' and 'deleteDependentEntities' in the integration config in Port."
+        ) from ex
 
+    @staticmethod
+    def order_by_entities_dependencies(
+        entities: list[Entity], relation_targets: RelationTargets | None = None
+    ) -> list[Entity]:
+        nodes, entities_map = EntityTopologicalSorter._build_dependency_graph(
+            entities, relation_targets
+        )
         sort_op = TopologicalSorter(nodes)
         try:
             return [entities_map[item] for item in sort_op.static_order()]
         except CycleError as ex:
-            raise OceanAbortException(
-                "Cannot order entities due to cyclic dependencies. \n"
-                "If you do want to have cyclic dependencies, please make sure to set the keys"
-                " 'createMissingRelatedEntities' and 'deleteDependentEntities' in the integration config in Port."
-            ) from ex
+            EntityTopologicalSorter._raise_cycle_error(ex)
+
+    @staticmethod
+    def iter_dependency_levels(
+        entities: list[Entity], relation_targets: RelationTargets | None = None
+    ) -> Generator[list[Entity], None, None]:
+        """Yield the entities level by level, every entity only depends on entities of the previous levels.
+
+        The entities of the same level don't depend on each other, so they can be handled concurrently.
+        The next level is only calculated once the consumer is done with the current one.
+        """
+        nodes, entities_map = EntityTopologicalSorter._build_dependency_graph(
+            entities, relation_targets
+        )
+        sort_op = TopologicalSorter(nodes)
+        try:
+            sort_op.prepare()
+        except CycleError as ex:
+            EntityTopologicalSorter._raise_cycle_error(ex)
+
+        while sort_op.is_active():
+            ready_nodes = sort_op.get_ready()
+            yield [entities_map[node] for node in ready_nodes]
+            sort_op.done(*ready_nodes)
+
+    @staticmethod
+    def get_dependency_levels(
+        entities: list[Entity], relation_targets: RelationTargets | None = None
+    ) -> list[list[Entity]]:
+        return list(
+            EntityTopologicalSorter.iter_dependency_levels(entities, relation_targets)
+        )
@@ -0,0 +1,185 @@
+import sqlite3
+from contextlib import closing, contextmanager
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from port_ocean.core.models import Entity
+
+EntityKey = tuple[str, str]
+
+
+class GeneratedEntitiesStore:
+    """
+    Spills the keys of the entities generated during a resync, and of the entities that exist in Port,
+    to a sqlite database so the reconciliation can find the entities to delete in bounded memory.
+
+    Every key set is a clustered (WITHOUT ROWID) B-tree sorted by (blueprint, identifier), so the entities
+    to delete are found by walking the Port keys in order and probing the generated keys, page by page.
+    The relations of the generated entities are kept as well, as the entities they point to may need to
+    be protected from deletion.
+
+    Every operation opens its own connection so the resync subprocesses can write to the store.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            for table in ("generated_entities", "port_entities", "related_entities"):
+                connection.execute(
+                    f"CREATE TABLE IF NOT EXISTS {table} ("
+                    "blueprint TEXT NOT NULL, identifier TEXT NOT NULL, "
+                    "PRIMARY KEY (blueprint, identifier)) WITHOUT ROWID"
+                )
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS generated_relations ("
+                "blueprint TEXT NOT NULL, relation TEXT NOT NULL, identifier TEXT NOT NULL, "
+                "PRIMARY KEY (blueprint, relation, identifier)) WITHOUT ROWID"
+            )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        with closing(sqlite3.connect(self.path, timeout=30)) as connection:
+            with connection:
+                yield connection
+
+    @staticmethod
+    def _get_keys(entities: Iterable[Entity]) -> list[EntityKey]:
+        return [
+            (entity.blueprint, entity.identifier)
+            for entity in entities
+            if isinstance(entity.blueprint, str) and isinstance(entity.identifier, str)
+        ]
+
+    def add_generated_entities(self, entities: Iterable[Entity]) -> None:
+        keys: list[EntityKey] = []
+        relations: list[tuple[str, str, str]] = []
+        for entity in entities:
+            if not isinstance(entity.blueprint, str):
+                continue
+            if isinstance(entity.identifier, str):
+                keys.append((entity.blueprint, entity.identifier))
+            for relation_name, relation in entity.relations.items():
+                targets = relation if isinstance(relation, list) else [relation]
+                relations.extend(
+                    (entity.blueprint, relation_name, target)
+                    for target in targets
+                    if isinstance(target, str)
+                )
+
+        with self._connect() as connection:
+            connection.executemany(
+                "INSERT OR IGNORE INTO generated_entities (blueprint, identifier) VALUES (?, ?)",
+                keys,
+            )
+            connection.executemany(
+                "INSERT OR IGNORE INTO generated_relations (blueprint, relation, identifier) VALUES (?, ?, ?)",
+                relations,
+            )
+
+    def add_port_entities(self, entities: Iterable[Entity]) -> None:
+        with self._connect() as connection:
+            connection.executemany(
+                "INSERT OR IGNORE INTO port_entities (blueprint, identifier) VALUES (?, ?)",
+                self._get_keys(entities),
+            )
+
+    def get_relations(self) -> list[tuple[str, str]]:
+        """The (blueprint, relation) pairs used by the generated entities"""
+        with self._connect() as connection:
+            return connection.execute(
+                "SELECT DISTINCT blueprint, relation FROM generated_relations"
+            ).fetchall()
+
+    def add_related_entities(
+        self, relation_targets: dict[tuple[str, str], str]
+    ) -> None:
+        """
+        Mark the entities the generated entities relate to as related.
+
+        :param relation_targets: The target blueprint of every (blueprint, relation) pair
+        """
+        with self._connect() as connection:
+            for (blueprint, relation), target in relation_targets.items():
+                connection.execute(
+                    "INSERT OR IGNORE INTO related_entities (blueprint, identifier) "
+                    "SELECT ?, identifier FROM generated_relations WHERE blueprint = ? AND relation = ?",
+                    (target, blueprint, relation),
+                )
+
+    def count_generated_entities(self) -> int:
+        with self._connect() as connection:
+            return connection.execute(
+                "SELECT COUNT(*) FROM generated_entities"
+            ).fetchone()[0]
+
+    def count_port_entities(self) -> int:
+        with self._connect() as connection:
+            return connection.execute("SELECT COUNT(*) FROM port_entities").fetchone()[
+                0
+            ]
+
+    def _deleted_entities_condition(self, exclude_related: bool) -> str:
+        condition = (
+            "NOT EXISTS (SELECT 1 FROM generated_entities AS generated "
+            "WHERE generated.blueprint = entity.blueprint AND generated.identifier = entity.identifier)"
+        )
+        if exclude_related:
+            condition += (
+                " AND NOT EXISTS (SELECT 1 FROM related_entities AS related "
+                "WHERE related.blueprint = entity.blueprint AND related.identifier = entity.identifier)"
+            )
+        return condition
+
+    def count_deleted_entities(self, exclude_related: bool = False) -> int:
+        with self._connect() as connection:
+            return connection.execute(
+                "SELECT COUNT(*) FROM port_entities AS entity "
+                f"WHERE {self._deleted_entities_condition(exclude_related)}"
+            ).fetchone()[0]
+
+    def _iter_entities(
+        self, table: str, condition: str, batch_size: int
+    ) -> Iterator[list[Entity]]:
+        """Walk the keys of the table in order, a page at a time, so no page is held open between batches"""
+        last_key: EntityKey = ("", "")
+        while True:
+            with self._connect() as connection:
+                rows = connection.execute(
+                    f"SELECT blueprint, identifier FROM {table} AS entity "
+                    f"WHERE (blueprint, identifier) > (?, ?) AND {condition} "
+                    "ORDER BY blueprint, identifier LIMIT ?",
+                    (*last_key, batch_size),
+                ).fetchall()
+            if not rows:
+                return
+            last_key = rows[-1]
+            yield [
+                Entity(identifier=identifier, blueprint=blueprint)
+                for blueprint, identifier in rows
+            ]
+
+    def iter_generated_entities(self, batch_size: int = 1000) -> Iterator[list[Entity]]:
+        return self._iter_entities("generated_entities", "1", batch_size)
+
+    def iter_port_entities(self, batch_size: int = 1000) -> Iterator[list[Entity]]:
+        return self._iter_entities("port_entities", "1", batch_size)
+
+    def iter_deleted_entities(
+        self, batch_size: int = 1000, exclude_related: bool = False
+    ) -> Iterator[list[Entity]]:
+        """Yield the entities that exist in Port but weren't generated, in batches sorted by their key"""
+        return self._iter_entities(
+            "port_entities",
+            self._deleted_entities_condition(exclude_related),
+            batch_size,
+        )
+
+    def remove(self) -> None:
+        for path in (
+            self.path,
+            self.path.with_name(f"{self.path.name}-wal"),
+            self.path.with_name(f"{self.path.name}-shm"),
+        ):
+            path.unlink(missing_ok=True)
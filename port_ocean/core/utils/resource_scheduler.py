@@ -0,0 +1,139 @@
+import asyncio
+import json
+from typing import Any, Awaitable, Callable, Generic, TypeVar
+
+from loguru import logger
+
+from port_ocean.clients.port.client import PortClient
+from port_ocean.core.handlers.port_app_config.models import ResourceConfig
+from port_ocean.core.models import Blueprint
+
+T = TypeVar("T")
+
+
+def get_static_blueprint(resource: ResourceConfig) -> str | None:
+    """
+    The blueprint mapping is a JQ expression, so the blueprint of a resource can only be known
+    before the resync when the expression is a string literal (e.g. '"service"').
+    """
+    try:
+        blueprint = json.loads(resource.port.entity.mappings.blueprint)
+    except (TypeError, ValueError):
+        return None
+    return blueprint if isinstance(blueprint, str) else None
+
+
+async def resolve_resources_dependencies(
+    resources: list[ResourceConfig], port_client: PortClient
+) -> dict[int, set[int]]:
+    """
+    Calculate which resources must finish before each resource can start.
+
+    A resource depends on every resource that comes before it in the mapping when:
+    - both resources map to the same blueprint (the later mapping should override the earlier one)
+    - one of the blueprints has a relation to the other
+    - the blueprint of either resource can't be determined ahead of time
+    """
+    blueprints = [get_static_blueprint(resource) for resource in resources]
+    blueprint_identifiers = list({blueprint for blueprint in blueprints if blueprint})
+    fetched_blueprints = await asyncio.gather(
+        *(
+            port_client.get_blueprint(identifier, should_log=False)
+            for identifier in blueprint_identifiers
+        ),
+        return_exceptions=True,
+    )
+
+    relation_targets: dict[str, set[str]] = {}
+    for identifier, blueprint in zip(blueprint_identifiers, fetched_blueprints):
+        if isinstance(blueprint, Blueprint):
+            relation_targets[identifier] = {
+                relation.target for relation in blueprint.relations.values()
+            }
+        else:
+            logger.warning(
+                f"Failed to fetch blueprint {identifier}, resources mapped to it will run in mapping order",
+                error=str(blueprint),
+            )
+
+    def are_dependent(first: str | None, second: str | None) -> bool:
+        if first is None or second is None:
+            return True
+        if first not in relation_targets or second not in relation_targets:
+            return True
+        return (
+            first == second
+            or second in relation_targets[first]
+            or first in relation_targets[second]
+        )
+
+    return {
+        index: {
+            previous_index
+            for previous_index in range(index)
+            if are_dependent(blueprints[index], blueprints[previous_index])
+        }
+        for index in range(len(resources))
+    }
+
+
+class ResourceScheduler(Generic[T]):
+    """
+    Runs the resync of the mapping resources concurrently, bounded by a number of workers.
+
+    Resources that depend on each other keep the order in which they appear in the mapping,
+    while independent resources run side by side. The results are returned in the mapping order,
+    regardless of the order in which the resources finished.
+    """
+
+    def __init__(
+        self,
+        resources: list[ResourceConfig],
+        dependencies: dict[int, set[int]],
+        concurrency: int,
+    ) -> None:
+        self.resources = resources
+        self.dependencies = dependencies
+        self._semaphore = asyncio.Semaphore(max(1, concurrency))
+        self._finished: dict[int, asyncio.Event] = {
+            index: asyncio.Event() for index in range(len(resources))
+        }
+
+    async def _run_resource(
+        self,
+        index: int,
+        process: Callable[[ResourceConfig, int], Awaitable[T]],
+    ) -> T:
+        resource = self.resources[index]
+        try:
+            for dependency in sorted(self.dependencies.get(index, set())):
+                await self._finished[dependency].wait()
+
+            async with self._semaphore:
+                logger.info(
+                    f"Starting processing resource {resource.kind} with index {index}"
+                )
+                return await process(resource, index)
+        finally:
+            self._finished[index].set()
+
+    async def run(
+        self, process: Callable[[ResourceConfig, int], Awaitable[T]]
+    ) -> list[T]:
+        tasks: list[asyncio.Task[T]] = [
+            asyncio.create_task(self._run_resource(index, process))
+            for index in range(len(self.resources))
+        ]
+        try:
+            return list(await asyncio.gather(*tasks))
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            results: list[Any] = await asyncio.gather(*tasks, return_exceptions=True)
+            logger.debug(
+                "Cancelled the remaining resources processing",
+                cancelled=sum(
+                    isinstance(result, asyncio.CancelledError) for result in results
+                ),
+            )
+            raise
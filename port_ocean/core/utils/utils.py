@@ -8,7 +8,7 @@ from pydantic import parse_obj_as, ValidationError
 
 
 from port_ocean.clients.port.client import PortClient
-from port_ocean.core.models import Entity, Runtime
+from port_ocean.core.models import Entity, EntityRef, EntityT, Runtime
 from port_ocean.core.models import EntityPortDiff
 from port_ocean.core.ocean_types import RAW_RESULT
 from port_ocean.exceptions.core import (
@@ -37,6 +37,20 @@ def is_same_entity(first_entity: Entity, second_entity: Entity) -> bool:
     )
 
 
+def get_entity_key(entity: Entity | EntityRef) -> tuple[str, str]:
+    """A hashable key of the entity, equal for entities that are `is_same_entity`"""
+    identifier = (
+        entity.identifier
+        if isinstance(entity.identifier, str)
+        else json.dumps(entity.identifier, sort_keys=True)
+    )
+    return identifier, entity.blueprint
+
+
+def get_entities_keys(entities: Iterable[Entity | EntityRef]) -> set[tuple[str, str]]:
+    return {get_entity_key(entity) for entity in entities}
+
+
 async def validate_integration_runtime(
     port_client: PortClient,
     requested_runtime: Runtime,
@@ -79,12 +93,14 @@ async def gather_and_split_errors_from_results(
     return valid_items, errors
 
 
-def get_port_diff(before: Iterable[Entity], after: Iterable[Entity]) -> EntityPortDiff:
+def get_port_diff(
+    before: Iterable[EntityT], after: Iterable[EntityT]
+) -> EntityPortDiff[EntityT]:
     before_dict = {}
     after_dict = {}
-    created = []
-    modified = []
-    deleted = []
+    created: list[EntityT] = []
+    modified: list[EntityT] = []
+    deleted: list[EntityT] = []
 
     # Create dictionaries for before and after lists
     for entity in before:
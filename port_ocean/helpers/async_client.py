@@ -3,6 +3,10 @@ from typing import Any, Callable, Type
 import httpx
 from loguru import logger
 
+from port_ocean.helpers.response_cache import (
+    ConditionalRequestTransport,
+    HttpResponseCacheStore,
+)
 from port_ocean.helpers.retry import RetryTransport
 
 
@@ -11,18 +15,30 @@ class OceanAsyncClient(httpx.AsyncClient):
     This class is a wrapper around httpx.AsyncClient that uses a custom transport class.
     This is done to allow passing our custom transport class to the AsyncClient constructor while still allowing
     all the default AsyncClient behavior that is changed when passing a custom transport instance.
+
+    When a response cache store is passed, the GET requests are revalidated with conditional requests
+    (see ConditionalRequestTransport) on top of the custom transport.
     """
 
     def __init__(
         self,
         transport_class: Type[RetryTransport] = RetryTransport,
         transport_kwargs: dict[str, Any] | None = None,
+        response_cache_store: HttpResponseCacheStore | None = None,
         **kwargs: Any,
     ):
         self._transport_kwargs = transport_kwargs
         self._transport_class = transport_class
+        self._response_cache_store = response_cache_store
         super().__init__(**kwargs)
 
+    def _wrap_transport(
+        self, transport: httpx.AsyncBaseTransport
+    ) -> httpx.AsyncBaseTransport:
+        if self._response_cache_store is None:
+            return transport
+        return ConditionalRequestTransport(transport, self._response_cache_store)
+
     def _init_transport(  # type: ignore[override]
         self,
         transport: httpx.AsyncBaseTransport | None = None,
@@ -32,22 +48,26 @@ class OceanAsyncClient(httpx.AsyncClient):
         if transport is not None or app is not None:
             return super()._init_transport(transport=transport, app=app, **kwargs)
 
-        return self._transport_class(
-            wrapped_transport=httpx.AsyncHTTPTransport(
-                **kwargs,
-            ),
-            logger=logger,
-            **(self._transport_kwargs or {}),
+        return self._wrap_transport(
+            self._transport_class(
+                wrapped_transport=httpx.AsyncHTTPTransport(
+                    **kwargs,
+                ),
+                logger=logger,
+                **(self._transport_kwargs or {}),
+            )
         )
 
     def _init_proxy_transport(  # type: ignore[override]
         self, proxy: httpx.Proxy, **kwargs: Any
     ) -> httpx.AsyncBaseTransport:
-        return self._transport_class(
-            wrapped_transport=httpx.AsyncHTTPTransport(
-                proxy=proxy,
-                **kwargs,
-            ),
-            logger=logger,
-            **(self._transport_kwargs or {}),
+        return self._wrap_transport(
+            self._transport_class(
+                wrapped_transport=httpx.AsyncHTTPTransport(
+                    proxy=proxy,
+                    **kwargs,
+                ),
+                logger=logger,
+                **(self._transport_kwargs or {}),
+            )
         )
@@ -21,6 +21,7 @@ if TYPE_CHECKING:
 class MetricPhase:
     EXTRACT = "extract"
     TRANSFORM = "transform"
+    COMPARE = "compare"
     LOAD = "load"
     RESYNC = "resync"
     DELETE = "delete"
@@ -49,6 +50,15 @@ class MetricType:
     OBJECT_COUNT_NAME = "object_count"
     SUCCESS_NAME = "success"
     RATE_LIMIT_WAIT_NAME = "rate_limit_wait_seconds"
+    LIVE_EVENTS_QUEUE_SIZE_NAME = "live_events_queue_size"
+    LIVE_EVENTS_QUEUE_AGE_NAME = "live_events_queue_oldest_event_age_seconds"
+    LIVE_EVENTS_SHED_NAME = "live_events_shed_count"
+    RESYNC_PIPELINE_QUEUE_SIZE_NAME = "resync_pipeline_queue_size"
+    RESYNC_PIPELINE_IDLE_NAME = "resync_pipeline_idle_seconds"
+    CACHE_HITS_NAME = "cache_hits"
+    CACHE_MISSES_NAME = "cache_misses"
+    CACHE_EVICTIONS_NAME = "cache_evictions"
+    CACHE_SIZE_NAME = "cache_size_bytes"
 
 
 class SyncState:
@@ -85,6 +95,51 @@ _metrics_registry: Dict[str, Tuple[str, str, List[str]]] = {
         "rate_limit_wait description",
         ["kind", "phase", "endpoint"],
     ),
+    MetricType.LIVE_EVENTS_QUEUE_SIZE_NAME: (
+        MetricType.LIVE_EVENTS_QUEUE_SIZE_NAME,
+        "live_events_queue_size description",
+        ["webhook_path"],
+    ),
+    MetricType.LIVE_EVENTS_QUEUE_AGE_NAME: (
+        MetricType.LIVE_EVENTS_QUEUE_AGE_NAME,
+        "live_events_queue_oldest_event_age_seconds description",
+        ["webhook_path"],
+    ),
+    MetricType.LIVE_EVENTS_SHED_NAME: (
+        MetricType.LIVE_EVENTS_SHED_NAME,
+        "live_events_shed_count description",
+        ["webhook_path", "policy"],
+    ),
+    MetricType.RESYNC_PIPELINE_QUEUE_SIZE_NAME: (
+        MetricType.RESYNC_PIPELINE_QUEUE_SIZE_NAME,
+        "resync_pipeline_queue_size description",
+        ["kind", "phase"],
+    ),
+    MetricType.RESYNC_PIPELINE_IDLE_NAME: (
+        MetricType.RESYNC_PIPELINE_IDLE_NAME,
+        "resync_pipeline_idle_seconds description",
+        ["kind", "phase"],
+    ),
+    MetricType.CACHE_HITS_NAME: (
+        MetricType.CACHE_HITS_NAME,
+        "cache_hits description",
+        ["storage"],
+    ),
+    MetricType.CACHE_MISSES_NAME: (
+        MetricType.CACHE_MISSES_NAME,
+        "cache_misses description",
+        ["storage"],
+    ),
+    MetricType.CACHE_EVICTIONS_NAME: (
+        MetricType.CACHE_EVICTIONS_NAME,
+        "cache_evictions description",
+        ["storage"],
+    ),
+    MetricType.CACHE_SIZE_NAME: (
+        MetricType.CACHE_SIZE_NAME,
+        "cache_size_bytes description",
+        ["storage"],
+    ),
 }
 
 
@@ -130,7 +185,9 @@ class Metrics:
         self._integration_version: Optional[str] = None
         self._ocean_version: Optional[str] = None
         self.event_id = ""
-        self.sync_state = SyncState.PENDING
+        self._sync_state: str = SyncState.PENDING
+        # Resources can be synced concurrently, so the sync state is kept per resource kind as well
+        self._sync_states_by_kind: dict[str, str] = {}
 
     @property
     def event_id(self) -> str:
@@ -142,11 +199,16 @@ class Metrics:
 
     @property
     def sync_state(self) -> str:
-        return self._sync_state
+        return self.get_sync_state(self.current_resource_kind())
 
     @sync_state.setter
     def sync_state(self, value: str) -> None:
         self._sync_state = value
+        self._sync_states_by_kind[self.current_resource_kind()] = value
+
+    def get_sync_state(self, kind: str) -> str:
+        """The sync state of a resource kind, or the latest sync state for kinds that weren't synced"""
+        return self._sync_states_by_kind.get(kind, self._sync_state)
 
     @property
     def integration_version(self) -> str:
@@ -220,6 +282,8 @@ class Metrics:
         for kind in kind_blockes:
             self.set_metric(MetricType.SUCCESS_NAME, [kind, MetricPhase.RESYNC], 0)
             self.set_metric(MetricType.DURATION_NAME, [kind, MetricPhase.RESYNC], 0)
+            self.set_metric(MetricType.DURATION_NAME, [kind, MetricPhase.COMPARE], 0)
+            self.set_metric(MetricType.DURATION_NAME, [kind, MetricPhase.LOAD], 0)
 
             self.set_metric(
                 MetricType.OBJECT_COUNT_NAME,
@@ -389,7 +453,7 @@ class Metrics:
                     ),
                     "kindIndex": int(kind_key[-1]) if kind_key[-1].isdigit() else 0,
                     "eventId": self.event_id,
-                    "syncState": self.sync_state,
+                    "syncState": self.get_sync_state(kind_key),
                     "blueprint": blueprint if blueprint else "",
                     "metrics": metrics,
                 }
@@ -0,0 +1,277 @@
+import asyncio
+import hashlib
+import json
+import re
+import sqlite3
+import time
+from contextlib import closing, contextmanager
+from pathlib import Path
+from typing import Iterator, NamedTuple
+
+import httpx
+from loguru import logger
+
+
+class CachedResponse(NamedTuple):
+    status_code: int
+    headers: list[tuple[str, str]]
+    content: bytes
+    etag: str | None
+    last_modified: str | None
+    # The values the request had for the headers listed in the Vary header of the response
+    vary_headers: list[tuple[str, str]]
+
+
+class HttpResponseCacheStore:
+    """
+    A persistent store of the last response of every url that was fetched with a validator (ETag or Last-Modified),
+    so it can be served again when the server answers a conditional request with 304 Not Modified.
+
+    Responses are stored with their raw (still encoded) content and are keyed by the url, the credential headers
+    and the Accept headers of the request, so responses of different credentials are never mixed. The values of the
+    headers listed in the Vary header of a response are stored with it, and it's only served to requests that have
+    the same values.
+    Responses that weren't used for `max_age_seconds` are removed when the store is opened.
+
+    The store is a sqlite database in WAL mode, every operation opens its own connection so it
+    can be used by the resync subprocesses as well.
+    """
+
+    KEY_HEADERS = ("accept", "accept-encoding")
+    # Headers like Authorization, PRIVATE-TOKEN, X-Api-Key and Cookie
+    CREDENTIAL_HEADERS_PATTERN = re.compile(
+        r"auth|token|key|secret|password|cookie|session", re.IGNORECASE
+    )
+
+    def __init__(self, path: str | Path, max_age_seconds: int | None = None) -> None:
+        self.path = Path(path)
+        self.max_age_seconds = max_age_seconds
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS http_responses ("
+                "key TEXT PRIMARY KEY, status_code INTEGER NOT NULL, headers TEXT NOT NULL, "
+                "content BLOB NOT NULL, etag TEXT, last_modified TEXT, vary_headers TEXT NOT NULL, "
+                "used_at REAL NOT NULL) WITHOUT ROWID"
+            )
+            if max_age_seconds is not None:
+                connection.execute(
+                    "DELETE FROM http_responses WHERE used_at < ?",
+                    (time.time() - max_age_seconds,),
+                )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        with closing(sqlite3.connect(self.path, timeout=30)) as connection:
+            with connection:
+                yield connection
+
+    @classmethod
+    def get_key(cls, request: httpx.Request) -> str:
+        key_parts = [request.method, str(request.url)]
+        key_parts.extend(request.headers.get(header, "") for header in cls.KEY_HEADERS)
+        key_parts.extend(
+            f"{name}: {value}"
+            for name, value in sorted(request.headers.multi_items())
+            if cls.CREDENTIAL_HEADERS_PATTERN.search(name)
+        )
+        return hashlib.sha256("\n".join(key_parts).encode()).hexdigest()
+
+    @staticmethod
+    def get_vary_headers(
+        request: httpx.Request, response_headers: httpx.Headers
+    ) -> list[tuple[str, str]]:
+        """The values of the request for the headers that the response varies by"""
+        names = sorted(
+            {
+                name.lower()
+                for name in response_headers.get_list("vary", split_commas=True)
+                if name
+            }
+        )
+        return [(name, request.headers.get(name, "")) for name in names]
+
+    def get(self, key: str) -> CachedResponse | None:
+        with self._connect() as connection:
+            row = connection.execute(
+                "SELECT status_code, headers, content, etag, last_modified, vary_headers "
+                "FROM http_responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+        if row is None:
+            return None
+        status_code, headers, content, etag, last_modified, vary_headers = row
+        return CachedResponse(
+            status_code,
+            [(name, value) for name, value in json.loads(headers)],
+            content,
+            etag,
+            last_modified,
+            [(name, value) for name, value in json.loads(vary_headers)],
+        )
+
+    def set(self, key: str, response: CachedResponse) -> None:
+        with self._connect() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO http_responses "
+                "(key, status_code, headers, content, etag, last_modified, vary_headers, used_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    response.status_code,
+                    json.dumps(response.headers),
+                    response.content,
+                    response.etag,
+                    response.last_modified,
+                    json.dumps(response.vary_headers),
+                    time.time(),
+                ),
+            )
+
+    def delete(self, key: str) -> None:
+        with self._connect() as connection:
+            connection.execute("DELETE FROM http_responses WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        with self._connect() as connection:
+            connection.execute("DELETE FROM http_responses")
+
+
+class ConditionalRequestTransport(httpx.AsyncBaseTransport):
+    """
+    A transport that revalidates the responses of GET requests instead of fetching them again.
+
+    Successful responses that have an ETag or a Last-Modified header are stored in the given store, the following
+    requests of the same url are sent with If-None-Match / If-Modified-Since, and a 304 Not Modified response is
+    replaced with the stored response, updated with the headers of the 304 response.
+    Requests that already have conditional headers are passed through as they are.
+
+    Args:
+        wrapped_transport: The transport that sends the requests, usually the RetryTransport
+        store: The store of the responses
+    """
+
+    CONDITIONAL_HEADERS = frozenset(
+        ["if-none-match", "if-modified-since", "if-match", "if-unmodified-since"]
+    )
+
+    def __init__(
+        self, wrapped_transport: httpx.AsyncBaseTransport, store: HttpResponseCacheStore
+    ) -> None:
+        self._wrapped_transport = wrapped_transport
+        self._store = store
+
+    def _is_cacheable_request(self, request: httpx.Request) -> bool:
+        return request.method == "GET" and not any(
+            header in request.headers for header in self.CONDITIONAL_HEADERS
+        )
+
+    @staticmethod
+    def _is_cacheable_response(response: httpx.Response) -> bool:
+        cache_control = response.headers.get("cache-control", "").lower()
+        return (
+            response.status_code == 200
+            and ("etag" in response.headers or "last-modified" in response.headers)
+            and "no-store" not in cache_control
+            and response.headers.get("vary", "").strip() != "*"
+        )
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if not self._is_cacheable_request(request):
+            return await self._wrapped_transport.handle_async_request(request)
+
+        key = self._store.get_key(request)
+        cached_response = await asyncio.to_thread(self._store.get, key)
+        if cached_response is not None and cached_response.vary_headers != (
+            self._store.get_vary_headers(
+                request, httpx.Headers(cached_response.headers)
+            )
+        ):
+            # The stored response is of another representation, it's replaced by the response of this request
+            cached_response = None
+        if cached_response is not None:
+            if cached_response.etag is not None:
+                request.headers["If-None-Match"] = cached_response.etag
+            if cached_response.last_modified is not None:
+                request.headers["If-Modified-Since"] = cached_response.last_modified
+
+        response = await self._wrapped_transport.handle_async_request(request)
+
+        if cached_response is not None and response.status_code == 304:
+            await response.aclose()
+            logger.debug(f"Serving the stored response of {request.url}, not modified")
+            return await self._revalidate(key, request, response, cached_response)
+
+        if self._is_cacheable_response(response):
+            return await self._store_response(key, request, response)
+        if cached_response is not None and response.status_code == 200:
+            # The content changed and can't be revalidated anymore, errors keep the stored response
+            await asyncio.to_thread(self._store.delete, key)
+        return response
+
+    async def _store_response(
+        self, key: str, request: httpx.Request, response: httpx.Response
+    ) -> httpx.Response:
+        # Reading the raw stream keeps the content encoded, the client decodes it as usual
+        stream: httpx.AsyncByteStream = response.stream  # type: ignore[assignment]
+        try:
+            content = b"".join([chunk async for chunk in stream])
+        finally:
+            await response.aclose()
+
+        # The content is stored whole, so it is served with a Content-Length instead of in chunks
+        headers = [
+            (name, value)
+            for name, value in response.headers.multi_items()
+            if name.lower() != "transfer-encoding"
+        ]
+        await asyncio.to_thread(
+            self._store.set,
+            key,
+            CachedResponse(
+                response.status_code,
+                headers,
+                content,
+                response.headers.get("etag"),
+                response.headers.get("last-modified"),
+                self._store.get_vary_headers(request, response.headers),
+            ),
+        )
+        return httpx.Response(
+            response.status_code,
+            headers=headers,
+            content=content,
+            request=request,
+            extensions=response.extensions,
+        )
+
+    async def _revalidate(
+        self,
+        key: str,
+        request: httpx.Request,
+        not_modified_response: httpx.Response,
+        cached_response: CachedResponse,
+    ) -> httpx.Response:
+        headers = httpx.Headers(cached_response.headers)
+        for name, value in not_modified_response.headers.items():
+            # The 304 response describes the stored content, except for its length
+            if name.lower() not in ("content-length", "transfer-encoding"):
+                headers[name] = value
+
+        revalidated_response = cached_response._replace(
+            headers=headers.multi_items(),
+            etag=headers.get("etag"),
+            last_modified=headers.get("last-modified"),
+        )
+        await asyncio.to_thread(self._store.set, key, revalidated_response)
+        return httpx.Response(
+            revalidated_response.status_code,
+            headers=revalidated_response.headers,
+            content=revalidated_response.content,
+            request=request,
+            extensions=not_modified_response.extensions,
+        )
+
+    async def aclose(self) -> None:
+        await self._wrapped_transport.aclose()
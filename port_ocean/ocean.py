@@ -6,8 +6,10 @@ from typing import Any, AsyncIterator, Callable, Dict, Type
 
 from port_ocean.cache.base import CacheProvider
 from port_ocean.cache.disk import DiskCacheProvider
+from port_ocean.cache.lru import CacheStats, LRUCacheProvider
 from port_ocean.cache.memory import InMemoryCacheProvider
-from port_ocean.core.models import ProcessExecutionMode
+from port_ocean.core.models import LiveEventsQueueMode, ProcessExecutionMode
+from port_ocean.core.utils.entity_fingerprint_store import EntityFingerprintStore
 import port_ocean.helpers.metric.metric
 
 from fastapi import FastAPI, APIRouter
@@ -74,6 +76,9 @@ class Ocean:
         self.process_execution_mode: ProcessExecutionMode = (
             self._get_process_execution_mode()
         )
+        self.entity_fingerprint_store: EntityFingerprintStore | None = (
+            self._get_entity_fingerprint_store()
+        )
         self.metrics = port_ocean.helpers.metric.metric.Metrics(
             metrics_settings=self.config.metrics,
             integration_configuration=self.config.integration,
@@ -87,6 +92,17 @@ class Ocean:
             signal_handler,
             max_event_processing_seconds=self.config.max_event_processing_seconds,
             max_wait_seconds_before_shutdown=self.config.max_wait_seconds_before_shutdown,
+            event_workers_per_path=self.config.event_workers_per_path,
+            event_coalescing_window_seconds=self.config.event_coalescing_window_seconds,
+            event_queues_directory=(
+                f".ocean_cache/{self.config.integration.identifier}_live_events"
+                if self.config.live_events_queue_mode == LiveEventsQueueMode.disk
+                else None
+            ),
+            max_queue_size=self.config.live_events_max_queue_size,
+            max_queue_bytes=self.config.live_events_max_queue_bytes,
+            queue_overflow_policy=self.config.live_events_overflow_policy,
+            queue_retry_after_seconds=self.config.live_events_retry_after_seconds,
         )
 
         self.integration = (
@@ -103,17 +119,41 @@ class Ocean:
             return self.config.process_execution_mode
         return ProcessExecutionMode.single_process
 
+    def _get_entity_fingerprint_store(self) -> EntityFingerprintStore | None:
+        if not self.config.entity_fingerprint_store_enabled:
+            return None
+        return EntityFingerprintStore(
+            f".ocean_cache/{self.config.integration.identifier}_entity_fingerprints.sqlite",
+            reconcile_interval=self.config.entity_fingerprint_store_reconcile_interval,
+        )
+
+    def _report_cache_stats(self, stats: CacheStats) -> None:
+        metric_type = port_ocean.helpers.metric.metric.MetricType
+        labels: list[str] = [LRUCacheProvider.STORAGE_TYPE]
+        self.metrics.set_metric(metric_type.CACHE_HITS_NAME, labels, stats.hits)
+        self.metrics.set_metric(metric_type.CACHE_MISSES_NAME, labels, stats.misses)
+        self.metrics.set_metric(
+            metric_type.CACHE_EVICTIONS_NAME, labels, stats.evictions
+        )
+        self.metrics.set_metric(
+            metric_type.CACHE_SIZE_NAME, labels, stats.size_in_bytes
+        )
+
     def _get_caching_provider(self) -> CacheProvider:
-        if self.config.caching_storage_mode:
-            caching_type_to_provider = {
-                DiskCacheProvider.STORAGE_TYPE: DiskCacheProvider,
-                InMemoryCacheProvider.STORAGE_TYPE: InMemoryCacheProvider,
-            }
-            if self.config.caching_storage_mode in caching_type_to_provider:
-                return caching_type_to_provider[self.config.caching_storage_mode]()
+        if self.config.caching_storage_mode == LRUCacheProvider.STORAGE_TYPE:
+            return LRUCacheProvider(
+                max_entries=self.config.cache_max_entries,
+                max_size_in_bytes=self.config.cache_max_size_in_bytes,
+                ttl_seconds=self.config.cache_ttl_seconds,
+                on_stats_update=self._report_cache_stats,
+            )
+        if self.config.caching_storage_mode == DiskCacheProvider.STORAGE_TYPE:
+            return DiskCacheProvider(serializer=self.config.caching_serializer)
+        if self.config.caching_storage_mode == InMemoryCacheProvider.STORAGE_TYPE:
+            return InMemoryCacheProvider()
 
         if self.config.process_execution_mode == ProcessExecutionMode.multi_process:
-            return DiskCacheProvider()
+            return DiskCacheProvider(serializer=self.config.caching_serializer)
         return InMemoryCacheProvider()
 
     def is_saas(self) -> bool:
@@ -195,6 +235,7 @@ class Ocean:
         async def lifecycle(_: FastAPI) -> AsyncIterator[None]:
             try:
                 await self.integration.start()
+                signal_handler.register(self.integration.entity_processor.shutdown)
                 if self.base_url:
                     await self.webhook_manager.start_processing_event_messages()
                 else:
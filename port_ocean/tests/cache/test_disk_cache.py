@@ -7,6 +7,7 @@ from port_ocean.cache.disk import (
     FailedToReadCacheFileError,
     FailedToWriteCacheFileError,
 )
+from port_ocean.core.models import CachingSerializer
 
 
 @pytest.fixture
@@ -90,3 +91,78 @@ async def test_disk_cache_write_error(
 
     # Restore permissions
     os.chmod(tmp_path, 0o755)
+
+
+@pytest.mark.asyncio
+async def test_disk_cache_pages_are_written_and_read_one_at_a_time(
+    disk_cache: DiskCacheProvider, tmp_path: Path
+) -> None:
+    """Test that the pages of a result are stored as separate files and replayed in order."""
+    writer = disk_cache.open_pages_writer("test_key")
+    for i in range(3):
+        await writer.append([f"item_{i}_{j}" for j in range(2)])
+
+    # The pages aren't visible until the writer is committed
+    assert await disk_cache.get_pages("test_key") is None
+    await writer.commit()
+
+    assert len(list((tmp_path / "test_key.pages").glob("*.pkl"))) == 3
+    pages = await disk_cache.get_pages("test_key")
+    assert pages is not None
+    assert [page async for page in pages] == [
+        ["item_0_0", "item_0_1"],
+        ["item_1_0", "item_1_1"],
+        ["item_2_0", "item_2_1"],
+    ]
+
+
+@pytest.mark.asyncio
+async def test_disk_cache_aborted_pages_are_discarded(
+    disk_cache: DiskCacheProvider, tmp_path: Path
+) -> None:
+    """Test that aborting a writer leaves no pages behind, and that clear removes committed pages."""
+    aborted_writer = disk_cache.open_pages_writer("aborted_key")
+    await aborted_writer.append([1])
+    await aborted_writer.abort()
+
+    committed_writer = disk_cache.open_pages_writer("committed_key")
+    await committed_writer.append([1])
+    await committed_writer.commit()
+
+    assert await disk_cache.get_pages("aborted_key") is None
+    assert await disk_cache.get_pages("committed_key") is not None
+
+    await disk_cache.clear()
+    assert await disk_cache.get_pages("committed_key") is None
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.asyncio
+async def test_disk_cache_json_serializer(tmp_path: Path) -> None:
+    """Test that the json serializer round trips JSON values and rejects other values."""
+    disk_cache = DiskCacheProvider(
+        cache_dir=str(tmp_path), serializer=CachingSerializer.json
+    )
+    value = {"string": "hello", "list": [1, 2.5, None], "nested": {"a": True}}
+
+    await disk_cache.set("test_key", value)
+    assert await disk_cache.get("test_key") == value
+    assert (tmp_path / "test_key.json").exists()
+
+    with pytest.raises(FailedToWriteCacheFileError):
+        await disk_cache.set("invalid_key", {"set": {1, 2}})
+    assert await disk_cache.get("invalid_key") is None
+
+
+@pytest.mark.asyncio
+async def test_disk_cache_set_replaces_the_file_atomically(
+    disk_cache: DiskCacheProvider, tmp_path: Path
+) -> None:
+    """Test that a failed write keeps the previous value and leaves no temporary files."""
+    await disk_cache.set("test_key", "old_value")
+
+    with pytest.raises(FailedToWriteCacheFileError):
+        await disk_cache.set("test_key", lambda: "not picklable")
+
+    assert await disk_cache.get("test_key") == "old_value"
+    assert [path.name for path in tmp_path.iterdir()] == ["test_key.pkl"]
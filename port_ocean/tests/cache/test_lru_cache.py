@@ -0,0 +1,76 @@
+import asyncio
+
+import pytest
+
+from port_ocean.cache.lru import CacheStats, LRUCacheProvider, estimate_size_in_bytes
+
+
+@pytest.mark.asyncio
+async def test_lru_cache_evicts_the_least_recently_used_value() -> None:
+    """Test that the least recently used value is evicted once the max entries is exceeded."""
+    cache = LRUCacheProvider(max_entries=2)
+    await cache.set("key_1", "value_1")
+    await cache.set("key_2", "value_2")
+
+    # Reading key_1 makes key_2 the least recently used value
+    assert await cache.get("key_1") == "value_1"
+    await cache.set("key_3", "value_3")
+
+    assert await cache.get("key_2") is None
+    assert await cache.get("key_1") == "value_1"
+    assert await cache.get("key_3") == "value_3"
+    assert cache.stats.evictions == 1
+
+
+@pytest.mark.asyncio
+async def test_lru_cache_is_bounded_by_the_size_of_the_values() -> None:
+    """Test that values are evicted by their size, and that too large values aren't cached."""
+    value = [f"item_{index}" for index in range(100)]
+    value_size = estimate_size_in_bytes(value)
+    cache = LRUCacheProvider(max_size_in_bytes=value_size * 2)
+
+    for index in range(3):
+        await cache.set(f"key_{index}", list(value))
+
+    assert await cache.get("key_0") is None
+    assert await cache.get("key_2") == value
+    assert cache.stats.size_in_bytes <= value_size * 2
+
+    await cache.set("too_large", [f"other_item_{index}" for index in range(300)])
+    assert await cache.get("too_large") is None
+    assert await cache.get("key_2") == value
+
+
+@pytest.mark.asyncio
+async def test_lru_cache_expires_values_after_their_ttl() -> None:
+    """Test that values expire after the default or their own time to live."""
+    cache = LRUCacheProvider(ttl_seconds=0.05)
+    await cache.set("default_ttl", "value")
+    await cache.set("long_ttl", "value", ttl_seconds=10)
+
+    assert await cache.get("default_ttl") == "value"
+    await asyncio.sleep(0.1)
+
+    assert await cache.get("default_ttl") is None
+    assert await cache.get("long_ttl") == "value"
+    assert cache.stats.entries == 1
+
+
+@pytest.mark.asyncio
+async def test_lru_cache_reports_its_stats() -> None:
+    """Test that hits, misses and the size of the cache are reported."""
+    reported: list[CacheStats] = []
+    cache = LRUCacheProvider(on_stats_update=reported.append)
+
+    await cache.set("key", {"a": 1})
+    await cache.get("key")
+    await cache.get("missing_key")
+
+    assert reported[-1].hits == 1
+    assert reported[-1].misses == 1
+    assert reported[-1].entries == 1
+    assert reported[-1].size_in_bytes == estimate_size_in_bytes({"a": 1})
+
+    await cache.clear()
+    assert reported[-1].entries == 0
+    assert reported[-1].size_in_bytes == 0
@@ -1,11 +1,13 @@
+import json
 from typing import Any, List, Generator
 from unittest.mock import MagicMock, patch, AsyncMock
 
 import pytest
 
 from port_ocean.clients.port.mixins.entities import EntityClientMixin
+from port_ocean.clients.port.types import UserAgentType
 from port_ocean.core.models import Entity
-from httpx import ReadTimeout
+from httpx import ReadTimeout, Request, Response
 
 # Mock the ocean context at module level
 pytestmark = pytest.mark.usefixtures("mock_ocean")
@@ -61,73 +63,141 @@ async def entity_client(monkeypatch: Any) -> EntityClientMixin:
     return entity_client
 
 
-def test_calculate_entities_batch_size_empty_list(
-    entity_client: EntityClientMixin,
+async def test_batch_upsert_entities_splits_large_entities_by_size(
+    entity_client: EntityClientMixin, mock_ocean: MagicMock
 ) -> None:
-    """Test that empty list returns batch size of 1"""
-    assert entity_client.calculate_entities_batch_size([]) == 1
+    mock_ocean.config.upsert_entities_batch_max_size_in_bytes = 250 * 1024
+    entities = [
+        Entity(
+            identifier=f"large_{i}",
+            blueprint="test",
+            properties={"large": "x" * (100 * 1024)},  # 100KB per entity
+        )
+        for i in range(5)
+    ] + [Entity(identifier=f"small_{i}", blueprint="test") for i in range(30)]
 
+    result_entities = await entity_client.upsert_entities_in_batches(
+        entities=entities, request_options=MagicMock(), should_raise=False
+    )
 
-def test_calculate_entities_batch_size_small_entities(
-    entity_client: EntityClientMixin,
-) -> None:
-    """Test that small entities return max batch size"""
-    small_entities = [
-        Entity(identifier=f"small_{i}", blueprint="test", properties={"small": "value"})
-        for i in range(30)
+    bulks = [
+        [entity.identifier for entity in call.args[1]]
+        for call in entity_client.upsert_entities_bulk.call_args_list  # type: ignore
     ]
-    # Small entities should allow max batch size
-    assert entity_client.calculate_entities_batch_size(small_entities) == 20
+    assert [len(bulk) for bulk in bulks] == [2, 2, 20, 11]
+    assert len(result_entities) == 35
 
 
-def test_calculate_entities_batch_size_large_entities(
+async def test_batch_upsert_entities_retries_too_large_batches_in_smaller_batches(
     entity_client: EntityClientMixin,
 ) -> None:
-    """Test that large entities reduce batch size"""
-    large_entities = [
-        Entity(
-            identifier=f"large_{i}",
-            blueprint="test",
-            properties={"large": "x" * (100 * 1024)},  # 100KB per entity
+    entities = [Entity(identifier=str(i), blueprint="test") for i in range(8)]
+
+    async def post(url: str, **kwargs: Any) -> Response:
+        bulk = json.loads(kwargs["content"])["entities"]
+        request = Request("POST", url, content=kwargs["content"])
+        if len(bulk) > 2:
+            return Response(413, json={"ok": False}, request=request)
+        return Response(
+            200,
+            json={
+                "entities": [
+                    {"index": index, "identifier": entity["identifier"]}
+                    for index, entity in enumerate(bulk)
+                ],
+                "errors": [],
+            },
+            request=request,
         )
-        for i in range(30)
+
+    entity_client.upsert_entities_bulk = EntityClientMixin.upsert_entities_bulk.__get__(  # type: ignore
+        entity_client
+    )
+    entity_client.auth.headers = AsyncMock(return_value={})  # type: ignore
+    entity_client.client.post = AsyncMock(side_effect=post)  # type: ignore
+    entity_client.upsert_entity = AsyncMock()  # type: ignore
+
+    result_entities = await entity_client.upsert_entities_in_batches(
+        entities=entities,
+        request_options={
+            "merge": False,
+            "create_missing_related_entities": False,
+            "validation_only": False,
+        },  # type: ignore
+        should_raise=False,
+    )
+
+    # The rejected batches are split in halves until they are accepted, instead of upserting entity by entity
+    assert [
+        len(json.loads(call.kwargs["content"])["entities"])
+        for call in entity_client.client.post.call_args_list
+    ] == [8, 4, 4, 2, 2, 2, 2]
+    assert entity_client.upsert_entity.call_count == 0
+    assert sorted(entity.identifier for _, entity in result_entities) == [
+        str(i) for i in range(8)
     ]
-    # With 1MB limit and 100KB per entity (plus overhead), should get ~9 entities per batch
-    batch_size = entity_client.calculate_entities_batch_size(large_entities)
-    assert 5 <= batch_size <= 15
 
 
-def test_calculate_entities_batch_size_mixed_entities(
+async def test_batch_upsert_entities_encodes_every_entity_once(
     entity_client: EntityClientMixin,
 ) -> None:
-    """Test that mixed size entities calculate correct batch size"""
-    mixed_entities = [
-        Entity(identifier=f"small_{i}", blueprint="test", properties={"small": "value"})
-        for i in range(10)
-    ] + [
+    entities = [
         Entity(
-            identifier=f"large_{i}",
+            identifier=str(i),
             blueprint="test",
-            properties={"large": "x" * (50 * 1024)},  # 50KB per entity
+            properties={"name": f"entity {i}"},
+            relations={"owner": {"combinator": "and", "rules": []}},
         )
-        for i in range(10)
+        for i in range(30)
     ]
-    # With 1MB limit and mixed sizes, should get a reasonable batch size
-    batch_size = entity_client.calculate_entities_batch_size(mixed_entities)
-    assert 15 <= batch_size <= 20
 
+    async def post(url: str, **kwargs: Any) -> Response:
+        bulk = json.loads(kwargs["content"])["entities"]
+        return Response(
+            200,
+            json={
+                "entities": [
+                    {"index": index, "identifier": f"new-{entity['identifier']}"}
+                    for index, entity in enumerate(bulk)
+                ],
+                "errors": [],
+            },
+            request=Request("POST", url, content=kwargs["content"]),
+        )
 
-def test_calculate_entities_batch_size_single_large_entity(
-    entity_client: EntityClientMixin,
-) -> None:
-    """Test that single very large entity returns batch size of 1"""
-    large_entity = Entity(
-        identifier="huge",
-        blueprint="test",
-        properties={"huge": "x" * (2 * 1024 * 1024)},  # 2MB entity
+    entity_client.upsert_entities_bulk = EntityClientMixin.upsert_entities_bulk.__get__(  # type: ignore
+        entity_client
+    )
+    entity_client.auth.headers = AsyncMock(return_value={})  # type: ignore
+    entity_client.client.post = AsyncMock(side_effect=post)  # type: ignore
+
+    with patch.object(
+        EntityClientMixin,
+        "_encode_entity",
+        side_effect=EntityClientMixin._encode_entity,
+    ) as encode_entity:
+        result_entities = await entity_client.upsert_entities_in_batches(
+            entities=entities,
+            request_options={
+                "merge": False,
+                "create_missing_related_entities": False,
+                "validation_only": False,
+            },  # type: ignore
+        )
+
+    assert encode_entity.call_count == 30
+    posted_entities = [
+        entity
+        for call in entity_client.client.post.call_args_list
+        for entity in json.loads(call.kwargs["content"])["entities"]
+    ]
+    assert posted_entities == [
+        entity.dict(exclude_unset=True, by_alias=True) for entity in entities
+    ]
+    assert result_entities[0] == (
+        True,
+        Entity(identifier="new-0", blueprint="test", relations={"owner": None}),
     )
-    # Even though entity is larger than limit, we return 1 to ensure at least one entity is processed
-    assert entity_client.calculate_entities_batch_size([large_entity]) == 1
 
 
 async def test_batch_upsert_entities_read_timeout_should_raise_false(
@@ -172,3 +242,126 @@ async def test_batch_upsert_entities_read_timeout_should_raise_true(
             await entity_client.upsert_entities_in_batches(
                 entities=all_entities, request_options=MagicMock(), should_raise=True
             )
+
+
+def search_response(page: dict[str, Any]) -> Response:
+    return Response(200, json=page, request=Request("POST", "/v1/entities/search"))
+
+
+async def test_search_entities_in_batches_follows_the_next_cursor(
+    entity_client: EntityClientMixin,
+) -> None:
+    pages: list[dict[str, Any]] = [
+        {
+            "entities": [{"identifier": str(i), "blueprint": "test"} for i in range(5)],
+            "next": "cursor",
+        },
+        {"entities": [{"identifier": "5", "blueprint": "test"}]},
+    ]
+    entity_client.auth.headers = AsyncMock(return_value={})  # type: ignore
+    entity_client.client.post = AsyncMock(  # type: ignore
+        side_effect=[search_response(page) for page in pages]
+    )
+
+    batches = [
+        [entity.identifier for entity in entities]
+        async for entities in entity_client.search_entities_in_batches(
+            UserAgentType.exporter, batch_size=2
+        )
+    ]
+
+    assert batches == [["0", "1"], ["2", "3"], ["4"], ["5"]]
+    first_call, second_call = entity_client.client.post.call_args_list
+    assert first_call.kwargs["params"]["limit"] == 2
+    assert "from" not in first_call.kwargs["params"]
+    assert second_call.kwargs["params"]["from"] == "cursor"
+    assert first_call.kwargs["json"] == second_call.kwargs["json"]
+
+
+async def test_search_entities_collects_all_pages(
+    entity_client: EntityClientMixin,
+) -> None:
+    entity_client.auth.headers = AsyncMock(return_value={})  # type: ignore
+    entity_client.client.post = AsyncMock(  # type: ignore
+        return_value=search_response(
+            {"entities": [{"identifier": "a", "blueprint": "test"}]}
+        )
+    )
+
+    entities = await entity_client.search_entities(UserAgentType.exporter)
+
+    assert entities == [Entity(identifier="a", blueprint="test")]
+    entity_client.client.post.assert_called_once()
+
+
+async def test_delete_entities_in_batches_groups_entities_by_blueprint(
+    entity_client: EntityClientMixin,
+) -> None:
+    entities = [
+        Entity(identifier=str(i), blueprint="service" if i % 2 else "team")
+        for i in range(250)
+    ]
+
+    async def request(method: str, url: str, **kwargs: Any) -> Response:
+        identifiers = kwargs["json"]["entities"]
+        errors = [
+            {
+                "identifier": identifier,
+                "statusCode": status_code,
+                "error": "",
+                "message": "",
+            }
+            for identifier, status_code in (("1", 404), ("3", 422))
+            if identifier in identifiers
+        ]
+        return Response(
+            200,
+            json={"entities": identifiers, "errors": errors},
+            request=Request(method, url),
+        )
+
+    entity_client.auth.headers = AsyncMock(return_value={})  # type: ignore
+    entity_client.client.request = AsyncMock(side_effect=request)  # type: ignore
+
+    results = await entity_client.delete_entities_in_batches(
+        entities, {"delete_dependent_entities": True}, should_raise=False  # type: ignore
+    )
+
+    requests = entity_client.client.request.call_args_list
+    assert sorted(
+        (call.args[1].split("/")[-3], len(call.kwargs["json"]["entities"]))
+        for call in requests
+    ) == [("service", 25), ("service", 100), ("team", 25), ("team", 100)]
+    assert all(
+        call.kwargs["params"]["delete_dependents"] == "true" for call in requests
+    )
+    assert [entity.identifier for is_deleted, entity in results if not is_deleted] == [
+        "3"
+    ]
+    assert len(results) == 250
+
+
+async def test_delete_entities_in_batches_falls_back_to_individual_deletion(
+    entity_client: EntityClientMixin,
+) -> None:
+    entities = [Entity(identifier=str(i), blueprint="service") for i in range(3)]
+    entity_client.auth.headers = AsyncMock(return_value={})  # type: ignore
+    entity_client.client.request = AsyncMock(  # type: ignore
+        return_value=Response(
+            405, json={"ok": False}, request=Request("DELETE", "/bulk/entities")
+        )
+    )
+    entity_client.delete_entity = AsyncMock(  # type: ignore
+        side_effect=[None, ReadTimeout(""), None]
+    )
+
+    results = await entity_client.delete_entities_in_batches(
+        entities, {"delete_dependent_entities": False}, should_raise=False  # type: ignore
+    )
+
+    assert entity_client.delete_entity.call_count == 3
+    assert [(is_deleted, entity.identifier) for is_deleted, entity in results] == [
+        (True, "0"),
+        (False, "1"),
+        (True, "2"),
+    ]
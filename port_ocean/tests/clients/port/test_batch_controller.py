@@ -0,0 +1,92 @@
+import asyncio
+import time
+
+from port_ocean.clients.port.batch_controller import AdaptiveBatchController
+
+
+def create_controller(
+    initial_concurrency: int = 4, max_concurrency: int = 50
+) -> AdaptiveBatchController:
+    return AdaptiveBatchController(
+        max_batch_length=20,
+        max_batch_size_in_bytes=1600,
+        max_concurrency=max_concurrency,
+        initial_concurrency=initial_concurrency,
+    )
+
+
+def test_get_batch_end_is_bounded_by_length_and_bytes() -> None:
+    controller = create_controller()
+
+    assert controller.get_batch_end([10] * 30, 0) == 20
+    assert controller.get_batch_end([10] * 30, 20) == 30
+    assert controller.get_batch_end([10] * 30, 0, max_batch_length=5) == 5
+    assert controller.get_batch_end([500] * 10, 2) == 5
+    # An entity that is larger than the limit is still sent, in a batch of its own
+    assert controller.get_batch_end([5000, 10], 0) == 1
+
+
+def test_record_response_halves_the_batch_size_relative_to_the_rejected_payload() -> (
+    None
+):
+    controller = create_controller()
+    sent_at = time.monotonic()
+
+    controller.record_response(413, sent_at, 1200, 20)
+    controller.record_response(413, sent_at, 1200, 20)
+
+    assert controller.batch_size_in_bytes == 600
+    assert controller.batch_length == 10
+    assert controller.concurrency == 4
+
+
+def test_record_response_halves_the_concurrency_once_per_round_trip() -> None:
+    controller = create_controller(initial_concurrency=16)
+    sent_at = time.monotonic()
+
+    controller.record_response(429, sent_at, 100, 1)
+    controller.record_response(429, sent_at, 100, 1)
+    assert controller.concurrency == 8
+
+    controller.record_response(503, time.monotonic(), 100, 1)
+    assert controller.concurrency == 4
+
+
+def test_record_response_increases_the_limits_additively_after_congestion() -> None:
+    controller = create_controller()
+    controller.record_response(413, time.monotonic(), 800, 4)
+
+    # Slow start grows the concurrency by one for every successful response
+    controller.record_response(200, time.monotonic(), 100, 1)
+    assert controller.concurrency == 5
+    assert controller.batch_length == 3
+    assert controller.batch_size_in_bytes == 500
+
+    controller.record_congestion(time.monotonic())
+    assert controller.concurrency == 2
+    for _ in range(3):
+        controller.record_response(200, time.monotonic(), 100, 1)
+    # After congestion it grows by about one for every round trip
+    assert controller.concurrency == 3
+
+
+def test_record_response_treats_slow_requests_as_congestion() -> None:
+    controller = create_controller(initial_concurrency=8)
+    controller.record_response(200, time.monotonic() - 0.5, 100, 1)
+    assert controller.concurrency == 9
+
+    controller.record_response(200, time.monotonic() - 5, 100, 1)
+    assert controller.concurrency == 4
+
+
+async def test_acquire_waits_for_a_free_request() -> None:
+    controller = create_controller(initial_concurrency=2)
+    await controller.acquire()
+    await controller.acquire()
+
+    acquire_task = asyncio.create_task(controller.acquire())
+    await asyncio.sleep(0.01)
+    assert not acquire_task.done()
+
+    await controller.release()
+    await asyncio.wait_for(acquire_task, 1)
@@ -1,5 +1,6 @@
+import json
 from contextlib import asynccontextmanager
-from typing import Any, AsyncGenerator
+from typing import Any, AsyncGenerator, AsyncIterator
 from unittest.mock import MagicMock, AsyncMock, patch
 
 import pytest
@@ -38,7 +39,7 @@ def mock_http_client() -> MagicMock:
         if "/bulk" in url:
             success_entities = []
             failed_entities = []
-            entities_body = kwargs.get("json", {})
+            entities_body = json.loads(kwargs["content"])
             entities = entities_body.get("entities", [])
             for index, entity in enumerate(entities):
                 if entity.get("properties", {}).get("mock_is_to_fail", False):
@@ -107,6 +108,13 @@ def mock_port_client(mock_http_client: MagicMock) -> PortClient:
     )
 
     mock_port_client.search_entities = AsyncMock(return_value=[])  # type: ignore
+
+    async def search_entities_in_batches(
+        *args: Any, **kwargs: Any
+    ) -> AsyncIterator[list[Entity]]:
+        yield await mock_port_client.search_entities(*args, **kwargs)
+
+    mock_port_client.search_entities_in_batches = search_entities_in_batches  # type: ignore
     mock_port_client.client = mock_http_client
     return mock_port_client
 
@@ -120,9 +128,12 @@ def mock_ocean(mock_port_client: PortClient) -> Ocean:
         ocean_mock.config = MagicMock()
         ocean_mock.config.port = MagicMock()
         ocean_mock.config.port.port_app_config_cache_ttl = 60
+        ocean_mock.config.resync_resources_concurrency = 1
+        ocean_mock.config.resync_pipeline_enabled = False
         ocean_mock.port_client = mock_port_client
         ocean_mock.process_execution_mode = ProcessExecutionMode.single_process
         ocean_mock.cache_provider = InMemoryCacheProvider()
+        ocean_mock.entity_fingerprint_store = None
         metrics_settings = MetricsSettings(enabled=True)
         integration_settings = IntegrationSettings(type="test", identifier="test")
         ocean_mock.metrics = Metrics(
@@ -230,3 +241,27 @@ def create_entity(
     entity.relations = relation
     entity.properties = {"mock_is_to_fail": is_to_fail}
     return entity
+
+
+class CountingEntity:
+    """An entity that counts how many times the identifiers of all the entities were read"""
+
+    identifier_reads = 0
+
+    def __init__(
+        self, identifier: str, blueprint: str, relations: dict[str, Any] | None = None
+    ) -> None:
+        self._identifier = identifier
+        self.blueprint = blueprint
+        self.relations = relations or {}
+
+    @property
+    def identifier(self) -> str:
+        CountingEntity.identifier_reads += 1
+        return self._identifier
+
+
+@pytest.fixture
+def counting_entity() -> type[CountingEntity]:
+    CountingEntity.identifier_reads = 0
+    return CountingEntity
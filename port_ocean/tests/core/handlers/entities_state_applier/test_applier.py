@@ -1,14 +1,21 @@
+from pathlib import Path
+from typing import Any
 from unittest.mock import Mock, patch, AsyncMock
 import pytest
 from port_ocean.core.handlers.entities_state_applier.port.applier import (
     HttpEntitiesStateApplier,
 )
-from port_ocean.core.models import Entity
-from port_ocean.core.ocean_types import EntityDiff
+from port_ocean.core.handlers.entities_state_applier.port.get_related_entities import (
+    get_related_entities,
+)
+from port_ocean.core.models import Blueprint, BlueprintRelation, Entity, EntityRef
+from port_ocean.core.ocean_types import EntityDiff, EntityRefDiff
+from port_ocean.core.utils.entity_fingerprint_store import EntityFingerprintStore
+from port_ocean.core.utils.generated_entities_store import GeneratedEntitiesStore
 from port_ocean.clients.port.types import UserAgentType
 from port_ocean.ocean import Ocean
 from port_ocean.context.ocean import PortOceanContext
-from port_ocean.tests.core.conftest import create_entity
+from port_ocean.tests.core.conftest import CountingEntity, create_entity
 from port_ocean.core.handlers.port_app_config.models import PortAppConfig
 from port_ocean.context.event import event_context, EventType
 
@@ -52,6 +59,32 @@ async def test_delete_diff_below_threshold(mock_context: PortOceanContext) -> No
     assert mock_safe_delete.call_args[0][0][0].identifier == "3"
 
 
+@pytest.mark.asyncio
+async def test_delete_diff_of_entity_refs_deletes_entities(
+    mock_context: PortOceanContext,
+) -> None:
+    applier = HttpEntitiesStateApplier(mock_context)
+    entities = EntityRefDiff(
+        before=[
+            EntityRef("1", "test"),
+            EntityRef("2", "test"),
+            EntityRef("3", "test", {"owner": "1"}),
+        ],
+        after=[EntityRef("1", "test"), EntityRef("2", "test")],
+    )
+
+    with patch.object(applier, "_safe_delete") as mock_safe_delete:
+        await applier.delete_diff(
+            entities, UserAgentType.exporter, entity_deletion_threshold=0.9
+        )
+
+    mock_safe_delete.assert_called_once()
+    assert mock_safe_delete.call_args[0][0] == [
+        Entity(identifier="3", blueprint="test", relations={"owner": "1"})
+    ]
+    assert mock_safe_delete.call_args[0][1] == entities["after"]
+
+
 @pytest.mark.asyncio
 async def test_delete_diff_above_default_threshold(
     mock_context: PortOceanContext,
@@ -201,6 +234,41 @@ async def test_applier_error_upserting(
         event.entity_topological_sorter.register_entity.assert_called_once_with(entity)
 
 
+@pytest.mark.asyncio
+async def test_applier_upsert_doesnt_record_search_identifier_entities(
+    mock_ocean: Ocean,
+    mock_context: PortOceanContext,
+    mock_port_app_config: PortAppConfig,
+    tmp_path: Path,
+) -> None:
+    mock_ocean.entity_fingerprint_store = EntityFingerprintStore(
+        tmp_path / "fingerprints.sqlite"
+    )
+    applier = HttpEntitiesStateApplier(mock_context)
+    entity = Entity(identifier="test_entity", blueprint="test_blueprint")
+    search_entity = Entity(
+        identifier={"combinator": "and", "rules": []}, blueprint="test_blueprint"
+    )
+
+    async with event_context(EventType.RESYNC, trigger_type="machine") as event:
+        event.port_app_config = mock_port_app_config
+        mock_ocean.config.upsert_entities_batch_max_length = 100
+        mock_ocean.config.upsert_entities_batch_max_size_in_bytes = 1000
+        setattr(
+            mock_ocean.port_client,
+            "upsert_entities_bulk",
+            AsyncMock(return_value=[(True, entity), (True, search_entity)]),
+        )
+
+        result = await applier.upsert([entity, search_entity], UserAgentType.exporter)
+
+    assert result == [entity, search_entity]
+    # Entities that are identified by a search query aren't tracked by the store
+    assert mock_ocean.entity_fingerprint_store.filter_changed(
+        [entity, search_entity]
+    ) == [search_entity]
+
+
 @pytest.mark.asyncio
 async def test_using_create_entity_helper(
     mock_ocean: Ocean,
@@ -228,3 +296,208 @@ async def test_using_create_entity_helper(
 
         mock_upsert.assert_called_once()
         assert len(result) == 1
+
+
+@pytest.mark.asyncio
+async def test_delete_generated_entities_diff_deletes_in_batches(
+    mock_context: PortOceanContext,
+    mock_port_app_config: PortAppConfig,
+    tmp_path: Path,
+) -> None:
+    applier = HttpEntitiesStateApplier(mock_context)
+    applier.DELETE_BATCH_SIZE = 2
+    store = GeneratedEntitiesStore(tmp_path / "reconciliation.sqlite")
+    store.add_generated_entities(
+        [Entity(identifier=str(index), blueprint="test") for index in range(5)]
+    )
+    store.add_port_entities(
+        [Entity(identifier=str(index), blueprint="test") for index in range(10)]
+    )
+
+    async with event_context(EventType.RESYNC, trigger_type="machine") as event:
+        event.port_app_config = mock_port_app_config
+        with patch.object(applier, "delete") as mock_delete:
+            await applier.delete_generated_entities_diff(
+                store, UserAgentType.exporter, entity_deletion_threshold=0.9
+            )
+
+    assert [
+        [entity.identifier for entity in call.args[0]]
+        for call in mock_delete.call_args_list
+    ] == [["5", "6"], ["7", "8"], ["9"]]
+
+
+@pytest.mark.asyncio
+async def test_delete_generated_entities_diff_above_threshold_not_deleted(
+    mock_context: PortOceanContext,
+    tmp_path: Path,
+) -> None:
+    applier = HttpEntitiesStateApplier(mock_context)
+    store = GeneratedEntitiesStore(tmp_path / "reconciliation.sqlite")
+    store.add_port_entities(
+        [Entity(identifier=str(index), blueprint="test") for index in range(3)]
+    )
+
+    with patch.object(applier, "delete") as mock_delete:
+        await applier.delete_generated_entities_diff(
+            store, UserAgentType.exporter, entity_deletion_threshold=0.9
+        )
+
+    mock_delete.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_delete_generated_entities_diff_protects_related_entities(
+    mock_ocean: Ocean,
+    mock_context: PortOceanContext,
+    mock_port_app_config: PortAppConfig,
+    tmp_path: Path,
+) -> None:
+    applier = HttpEntitiesStateApplier(mock_context)
+    store = GeneratedEntitiesStore(tmp_path / "reconciliation.sqlite")
+    store.add_generated_entities(
+        [Entity(identifier="service", blueprint="service", relations={"owner": "a"})]
+    )
+    store.add_port_entities(
+        [
+            Entity(identifier="service", blueprint="service"),
+            Entity(identifier="a", blueprint="team"),
+            Entity(identifier="b", blueprint="team"),
+        ]
+    )
+    mock_blueprint = Mock()
+    mock_blueprint.identifier = "service"
+    mock_blueprint.relations = {"owner": Mock(target="team")}
+    setattr(
+        mock_ocean.port_client, "get_blueprint", AsyncMock(return_value=mock_blueprint)
+    )
+    mock_port_app_config.create_missing_related_entities = True
+
+    async with event_context(EventType.RESYNC, trigger_type="machine") as event:
+        event.port_app_config = mock_port_app_config
+        with patch.object(applier, "delete") as mock_delete:
+            await applier.delete_generated_entities_diff(
+                store, UserAgentType.exporter, entity_deletion_threshold=0.9
+            )
+
+    mock_delete.assert_called_once()
+    assert [
+        (entity.blueprint, entity.identifier) for entity in mock_delete.call_args[0][0]
+    ] == [("team", "b")]
+
+
+@pytest.mark.asyncio
+async def test_delete_deletes_dependent_entities_first_level_by_level(
+    mock_ocean: Ocean,
+    mock_context: PortOceanContext,
+    mock_port_app_config: PortAppConfig,
+) -> None:
+    applier = HttpEntitiesStateApplier(mock_context)
+    team = Entity(identifier="team", blueprint="team")
+    services = [
+        Entity(
+            identifier=f"service-{i}", blueprint="service", relations={"team": "team"}
+        )
+        for i in range(3)
+    ]
+    mock_port_app_config.delete_dependent_entities = False
+    mock_delete = AsyncMock(
+        side_effect=lambda entities, *args, **kwargs: [
+            (True, entity) for entity in entities
+        ]
+    )
+    setattr(mock_ocean.port_client, "delete_entities_in_batches", mock_delete)
+    mock_blueprint = Mock()
+    mock_blueprint.identifier = "service"
+    mock_blueprint.relations = {"team": Mock(target="team")}
+    setattr(
+        mock_ocean.port_client, "get_blueprint", AsyncMock(return_value=mock_blueprint)
+    )
+
+    async with event_context(EventType.RESYNC, trigger_type="machine") as event:
+        event.port_app_config = mock_port_app_config
+        await applier.delete([team, *services], UserAgentType.exporter)
+
+    assert [
+        sorted(entity.identifier for entity in call.args[0])
+        for call in mock_delete.call_args_list
+    ] == [["service-0", "service-1", "service-2"], ["team"]]
+
+
+def create_blueprint(identifier: str, relations: dict[str, str]) -> Blueprint:
+    return Blueprint(
+        identifier=identifier,
+        title=identifier,
+        team=None,
+        schema={},
+        relations={
+            name: BlueprintRelation(
+                many=False, required=False, target=target, title=name
+            )
+            for name, target in relations.items()
+        },
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_related_entities_groups_unsorted_blueprints_and_caches_them() -> (
+    None
+):
+    port_client = Mock()
+    blueprints = {
+        "service": create_blueprint("service", {"team": "team"}),
+        "repository": create_blueprint("repository", {"service": "service"}),
+    }
+    port_client.get_blueprint = AsyncMock(
+        side_effect=lambda identifier: blueprints[identifier]
+    )
+    entities = [
+        Entity(identifier="service-a", blueprint="service", relations={"team": "a"}),
+        Entity(identifier="repo", blueprint="repository", relations={"service": "s"}),
+        Entity(identifier="service-b", blueprint="service", relations={"team": "b"}),
+    ]
+
+    async with event_context(EventType.RESYNC, trigger_type="machine"):
+        related_entities = await get_related_entities(entities, port_client)
+        await get_related_entities(entities, port_client)
+
+    assert sorted(
+        (entity.blueprint, entity.identifier) for entity in related_entities
+    ) == [
+        ("service", "s"),
+        ("team", "a"),
+        ("team", "b"),
+    ]
+    assert port_client.get_blueprint.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_safe_delete_plans_large_deletions_in_linear_time(
+    mock_context: PortOceanContext,
+    mock_port_app_config: PortAppConfig,
+    counting_entity: type[CountingEntity],
+) -> None:
+    applier = HttpEntitiesStateApplier(mock_context)
+    entities_to_delete: list[Any] = [
+        counting_entity(f"entity-{index}", "service") for index in range(100_000)
+    ]
+    entities_to_protect: list[Any] = [
+        counting_entity(f"entity-{index}", "service")
+        for index in range(50_000, 150_000)
+    ]
+    mock_port_app_config.create_missing_related_entities = True
+    counting_entity.identifier_reads = 0
+
+    async with event_context(EventType.RESYNC, trigger_type="machine") as event:
+        event.port_app_config = mock_port_app_config
+        with patch.object(applier, "delete") as mock_delete:
+            await applier._safe_delete(
+                entities_to_delete, entities_to_protect, UserAgentType.exporter
+            )
+
+    assert len(mock_delete.call_args[0][0]) == 50_000
+    # Every entity is keyed a constant number of times and looked up in a set, comparing every entity to delete
+    # with every protected entity would read the identifiers 100_000 times per entity
+    assert counting_entity.identifier_reads <= 4 * (
+        len(entities_to_delete) + len(entities_to_protect)
+    )
@@ -0,0 +1,216 @@
+import json
+from typing import Any
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from port_ocean.context.ocean import PortOceanContext
+from port_ocean.core.handlers.entity_processor.jq_batch_entity_processor import (
+    JQBatchEntityProcessor,
+)
+from port_ocean.core.handlers.entity_processor.jq_entity_processor import (
+    JQEntityProcessor,
+)
+from port_ocean.core.models import Entity
+from port_ocean.core.ocean_types import CalculationResult
+from port_ocean.exceptions.core import EntityProcessorException
+
+RAW_RESULTS: list[dict[str, Any]] = [
+    {
+        "id": index,
+        "name": f"item-{index}",
+        "active": index % 3 != 0,
+        "owner": {"team": "platform"} if index % 2 else None,
+        "children": [{"id": f"{index}-{child}"} for child in range(index % 4)],
+    }
+    for index in range(20)
+]
+
+
+def sort_entities(entities: list[Entity]) -> list[Entity]:
+    # The JQEntityProcessor returns the entities in the order their mapping finished
+    return sorted(entities, key=lambda entity: json.dumps(entity.dict(), default=str))
+
+
+def create_mapping(
+    mappings: dict[str, Any], selector_query: str, items_to_parse: str | None = None
+) -> Mock:
+    mapping = Mock()
+    mapping.kind = "kind"
+    mapping.port.entity.mappings.dict.return_value = mappings
+    mapping.port.items_to_parse = items_to_parse
+    mapping.selector.query = selector_query
+    return mapping
+
+
+@pytest.mark.asyncio
+class TestJQBatchEntityProcessor:
+    @pytest.fixture
+    def mock_context(self, monkeypatch: Any) -> AsyncMock:
+        mock_context = AsyncMock()
+        monkeypatch.setattr(PortOceanContext, "app", mock_context)
+        return mock_context
+
+    @pytest.fixture
+    def batch_processor(self, mock_context: AsyncMock) -> JQBatchEntityProcessor:
+        return JQBatchEntityProcessor(mock_context)
+
+    @pytest.fixture
+    def processor(self, mock_context: AsyncMock) -> JQEntityProcessor:
+        return JQEntityProcessor(mock_context)
+
+    @staticmethod
+    def assert_same_results(
+        result: CalculationResult, expected: CalculationResult
+    ) -> None:
+        assert sort_entities(result.entity_selector_diff.passed) == sort_entities(
+            expected.entity_selector_diff.passed
+        )
+        assert sort_entities(result.entity_selector_diff.failed) == sort_entities(
+            expected.entity_selector_diff.failed
+        )
+        assert result.misonfigured_entity_keys == expected.misonfigured_entity_keys
+        assert sorted(str(error) for error in result.errors) == sorted(
+            str(error) for error in expected.errors
+        )
+
+    @pytest.mark.parametrize(
+        "mappings,selector_query,items_to_parse,parse_all",
+        [
+            (
+                {
+                    "identifier": ".id | tostring",
+                    "title": ".name",
+                    "blueprint": '"service"',
+                    "team": ".owner.team",
+                    "properties": {
+                        "name": ".name",
+                        "missing": ".not_there",
+                        "failing": ".name | tonumber",
+                        "multiple": ".children[].id",
+                        "commented": ".name # a comment",
+                    },
+                    "relations": {"owner": ".owner.team", "empty": ".nothing"},
+                },
+                ".active",
+                None,
+                False,
+            ),
+            (
+                {
+                    "identifier": ".id | tostring",
+                    "blueprint": '"service"',
+                    "properties": {"name": ".name"},
+                },
+                ".active",
+                None,
+                True,
+            ),
+            (
+                {
+                    "identifier": ".item.id",
+                    "title": ".name",
+                    "blueprint": '"child"',
+                    "properties": {"parent": ".id", "missing": ".item.name"},
+                },
+                '.item.id | endswith("1") | not',
+                ".children",
+                False,
+            ),
+            (
+                {
+                    "identifier": ".id | tostring",
+                    "blueprint": '"service"',
+                    "properties": {"name": ".name"},
+                },
+                "true",
+                ".owner",
+                False,
+            ),
+        ],
+    )
+    async def test_parse_items_matches_jq_entity_processor(
+        self,
+        batch_processor: JQBatchEntityProcessor,
+        processor: JQEntityProcessor,
+        mappings: dict[str, Any],
+        selector_query: str,
+        items_to_parse: str | None,
+        parse_all: bool,
+    ) -> None:
+        mapping = create_mapping(mappings, selector_query, items_to_parse)
+
+        result = await batch_processor._parse_items(mapping, RAW_RESULTS, parse_all)
+        expected = await processor._parse_items(mapping, RAW_RESULTS, parse_all)
+
+        self.assert_same_results(result, expected)
+
+    async def test_parse_items_with_invalid_selector_values(
+        self,
+        batch_processor: JQBatchEntityProcessor,
+        processor: JQEntityProcessor,
+    ) -> None:
+        mapping = create_mapping(
+            {"identifier": ".id | tostring", "blueprint": '"service"'},
+            'if .id < 5 then .name elif .id < 10 then error("bad") else .active end',
+        )
+
+        result = await batch_processor._parse_items(mapping, RAW_RESULTS)
+        expected = await processor._parse_items(mapping, RAW_RESULTS)
+
+        assert len(result.errors) == 10
+        assert all(
+            isinstance(error, EntityProcessorException) for error in result.errors
+        )
+        assert sort_entities(result.entity_selector_diff.passed) == sort_entities(
+            expected.entity_selector_diff.passed
+        )
+        assert len(result.errors) == len(expected.errors)
+
+    async def test_parse_items_sends_raw_data_examples(
+        self, batch_processor: JQBatchEntityProcessor
+    ) -> None:
+        mapping = create_mapping(
+            {"identifier": ".item.id", "blueprint": '"child"'},
+            "true",
+            ".children",
+        )
+
+        with patch.object(
+            batch_processor, "_send_examples", new=AsyncMock()
+        ) as send_examples:
+            await batch_processor._parse_items(
+                mapping, RAW_RESULTS, send_raw_data_examples_amount=2
+            )
+
+        examples = send_examples.call_args.args[0]
+        assert examples == [
+            {"item": RAW_RESULTS[1]["children"][0], **RAW_RESULTS[1]},
+            {"item": RAW_RESULTS[2]["children"][0], **RAW_RESULTS[2]},
+        ]
+
+    async def test_parse_items_falls_back_on_invalid_expression(
+        self,
+        batch_processor: JQBatchEntityProcessor,
+        processor: JQEntityProcessor,
+    ) -> None:
+        mapping = create_mapping(
+            {
+                "identifier": ".id | tostring",
+                "blueprint": '"service"',
+                "properties": {"invalid": ".name |"},
+            },
+            ".active",
+        )
+
+        with patch.object(
+            JQEntityProcessor,
+            "_calculate_entities",
+            wraps=processor._calculate_entities,
+        ) as calculate_entities:
+            result = await batch_processor._parse_items(mapping, RAW_RESULTS)
+
+        calculate_entities.assert_called_once()
+        expected = await processor._parse_items(mapping, RAW_RESULTS)
+        self.assert_same_results(result, expected)
+        assert result.misonfigured_entity_keys == {"invalid": ".name |"}
@@ -0,0 +1,219 @@
+import json
+from typing import Any, Iterator
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from port_ocean.context.ocean import PortOceanContext
+from port_ocean.core.handlers.entity_processor import jq_process_pool_entity_processor
+from port_ocean.core.handlers.entity_processor.jq_entity_processor import (
+    JQEntityProcessor,
+)
+from port_ocean.core.handlers.entity_processor.jq_process_pool_entity_processor import (
+    JQProcessPoolEntityProcessor,
+)
+from port_ocean.core.models import Entity
+
+RAW_RESULTS: list[dict[str, Any]] = [
+    {
+        "id": index,
+        "name": f"item-{index}",
+        "active": index % 3 != 0,
+        "children": [{"id": f"{index}-{child}"} for child in range(index % 3)],
+    }
+    for index in range(120)
+]
+
+
+def sort_entities(entities: list[Entity]) -> list[Entity]:
+    return sorted(entities, key=lambda entity: json.dumps(entity.dict(), default=str))
+
+
+def create_mapping(
+    mappings: dict[str, Any], selector_query: str, items_to_parse: str | None = None
+) -> Mock:
+    mapping = Mock()
+    mapping.kind = "kind"
+    mapping.port.entity.mappings.dict.return_value = mappings
+    mapping.port.items_to_parse = items_to_parse
+    mapping.selector.query = selector_query
+    return mapping
+
+
+@pytest.mark.asyncio
+class TestJQProcessPoolEntityProcessor:
+    @pytest.fixture
+    def mock_context(self, monkeypatch: Any) -> AsyncMock:
+        mock_context = AsyncMock()
+        mock_context.config.entity_processor_workers = 2
+        monkeypatch.setattr(PortOceanContext, "app", mock_context)
+        return mock_context
+
+    @pytest.fixture
+    def pool_processor(
+        self, mock_context: AsyncMock
+    ) -> Iterator[JQProcessPoolEntityProcessor]:
+        processor = JQProcessPoolEntityProcessor(mock_context)
+        processor.MIN_SHARD_SIZE = 10
+        yield processor
+        processor.shutdown()
+
+    @pytest.fixture
+    def processor(self, mock_context: AsyncMock) -> JQEntityProcessor:
+        return JQEntityProcessor(mock_context)
+
+    @pytest.mark.parametrize(
+        "mappings,selector_query,items_to_parse",
+        [
+            (
+                {
+                    "identifier": ".id | tostring",
+                    "title": ".name",
+                    "blueprint": '"service"',
+                    "properties": {"name": ".name", "missing": ".not_there"},
+                },
+                ".active",
+                None,
+            ),
+            (
+                {
+                    "identifier": ".item.id",
+                    "blueprint": '"child"',
+                    "properties": {"parent": ".id"},
+                },
+                "true",
+                ".children",
+            ),
+        ],
+    )
+    async def test_parse_items_matches_jq_entity_processor(
+        self,
+        pool_processor: JQProcessPoolEntityProcessor,
+        processor: JQEntityProcessor,
+        mappings: dict[str, Any],
+        selector_query: str,
+        items_to_parse: str | None,
+    ) -> None:
+        mapping = create_mapping(mappings, selector_query, items_to_parse)
+
+        result = await pool_processor._parse_items(mapping, RAW_RESULTS, True)
+        expected = await processor._parse_items(mapping, RAW_RESULTS, True)
+
+        assert sort_entities(result.entity_selector_diff.passed) == sort_entities(
+            expected.entity_selector_diff.passed
+        )
+        assert sort_entities(result.entity_selector_diff.failed) == sort_entities(
+            expected.entity_selector_diff.failed
+        )
+        assert result.misonfigured_entity_keys == expected.misonfigured_entity_keys
+        assert result.errors == expected.errors == []
+
+    async def test_shutdown_stops_the_worker_processes(
+        self, pool_processor: JQProcessPoolEntityProcessor
+    ) -> None:
+        mapping = create_mapping(
+            {"identifier": ".id | tostring", "blueprint": '"service"'}, "true"
+        )
+        await pool_processor._parse_items(mapping, RAW_RESULTS)
+        assert pool_processor._pool is not None
+        workers = list(pool_processor._pool._processes.values())
+        assert workers
+
+        pool_processor.shutdown()
+
+        for worker in workers:
+            worker.join(timeout=10)
+            assert not worker.is_alive()
+        assert pool_processor._pool is None
+
+    async def test_broken_pool_is_replaced_by_the_next_batch(
+        self, pool_processor: JQProcessPoolEntityProcessor
+    ) -> None:
+        mapping = create_mapping(
+            {"identifier": ".id | tostring", "blueprint": '"service"'}, "true"
+        )
+        expected = await pool_processor._parse_items(mapping, RAW_RESULTS)
+        assert pool_processor._pool is not None
+        broken_pool = pool_processor._pool
+        for worker in list(broken_pool._processes.values()):
+            worker.kill()
+            worker.join(timeout=10)
+
+        # The batch of the broken pool is parsed in the current process
+        fallback_result = await pool_processor._parse_items(mapping, RAW_RESULTS)
+        assert pool_processor._pool is None
+
+        result = await pool_processor._parse_items(mapping, RAW_RESULTS)
+        assert pool_processor._pool is not None
+        assert pool_processor._pool is not broken_pool
+        for calculation_result in (fallback_result, result):
+            assert sort_entities(
+                calculation_result.entity_selector_diff.passed
+            ) == sort_entities(expected.entity_selector_diff.passed)
+
+    async def test_parse_items_sends_examples_from_the_workers(
+        self, pool_processor: JQProcessPoolEntityProcessor
+    ) -> None:
+        mapping = create_mapping(
+            {"identifier": ".id | tostring", "blueprint": '"service"'}, "true"
+        )
+
+        with patch.object(
+            pool_processor, "_send_examples", new=AsyncMock()
+        ) as send_examples:
+            await pool_processor._parse_items(
+                mapping, RAW_RESULTS, send_raw_data_examples_amount=3
+            )
+
+        send_examples.assert_called_once_with(RAW_RESULTS[:3], "kind")
+
+    async def test_parse_items_falls_back_on_invalid_expression(
+        self, pool_processor: JQProcessPoolEntityProcessor
+    ) -> None:
+        mapping = create_mapping(
+            {"identifier": ".id | tostring", "blueprint": '"service"'}, ".active |"
+        )
+
+        with patch.object(
+            pool_processor, "_parse_shards", new=AsyncMock()
+        ) as parse_shards:
+            result = await pool_processor._parse_items(mapping, RAW_RESULTS[:5])
+
+        parse_shards.assert_not_called()
+        assert len(result.errors) == 5
+
+    async def test_parse_shard_caches_compiled_programs_by_hash(
+        self, mock_context: AsyncMock
+    ) -> None:
+        program = (
+            '[.[] | [[{"value": true}, {"identifier": .id, "blueprint": "service"}]]]'
+        )
+        worker_programs: dict[str, Any] = {}
+        with patch.object(
+            jq_process_pool_entity_processor, "_worker_programs", worker_programs
+        ):
+            for _ in range(2):
+                result = jq_process_pool_entity_processor._parse_shard(
+                    "program-hash",
+                    program,
+                    RAW_RESULTS[1:3],
+                    {"identifier": ".id", "blueprint": '"service"'},
+                    None,
+                    False,
+                    0,
+                )
+                assert len(result.calculation_result.entity_selector_diff.passed) == 2
+                assert list(worker_programs) == ["program-hash"]
+                compiled_program = worker_programs["program-hash"]
+
+            worker_programs["program-hash"] = Mock(wraps=compiled_program)
+            jq_process_pool_entity_processor._parse_shard(
+                "program-hash",
+                program,
+                RAW_RESULTS[1:3],
+                {"identifier": ".id", "blueprint": '"service"'},
+                None,
+                False,
+                0,
+            )
+            worker_programs["program-hash"].input_value.assert_called_once()
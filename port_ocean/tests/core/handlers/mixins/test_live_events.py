@@ -402,3 +402,119 @@ async def test_sync_raw_results_one_raw_result_entity_upserted(
         [entity], UserAgentType.exporter
     )
     mock_live_events_mixin.entities_state_applier.delete.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_parse_raw_event_results_to_entities_parses_all_items_of_resource_at_once(
+    mock_live_events_mixin: LiveEventsMixin,
+    mock_repository_resource_config: ResourceConfig,
+) -> None:
+    raw_results = WebhookEventRawResults(
+        updated_raw_results=[{"name": "repo-one"}, {"name": "repo-two"}],
+        deleted_raw_results=[{"name": "repo-two"}, {"name": "repo-three"}],
+    )
+    raw_results.resource = mock_repository_resource_config
+    mock_live_events_mixin.entity_processor.parse_items = AsyncMock(  # type: ignore
+        side_effect=lambda resource, raw_items, **_: CalculationResult(
+            entity_selector_diff=EntitySelectorDiff(
+                passed=[
+                    Entity(identifier=item["name"], blueprint="service")
+                    for item in raw_items
+                ],
+                failed=[],
+            ),
+            errors=[],
+            misonfigured_entity_keys={},
+        )
+    )
+
+    entities_to_create, entities_to_delete = (
+        await mock_live_events_mixin._parse_raw_event_results_to_entities([raw_results])
+    )
+
+    assert [entity.identifier for entity in entities_to_create] == [
+        "repo-one",
+        "repo-two",
+    ]
+    assert [entity.identifier for entity in entities_to_delete] == ["repo-three"]
+    assert mock_live_events_mixin.entity_processor.parse_items.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_delete_entities_searches_once_and_deletes_existing_entities(
+    mock_live_events_mixin: LiveEventsMixin,
+    mock_context: PortOceanContext,
+) -> None:
+    entities = [
+        Entity(identifier="repo-one", blueprint="service"),
+        Entity(identifier="repo-two", blueprint="service"),
+        Entity(identifier="team-one", blueprint="team"),
+    ]
+    searched_queries: list[dict[str, Any]] = []
+
+    async def search_entities_in_batches(
+        user_agent_type: UserAgentType, query: dict[str, Any], **kwargs: Any
+    ) -> Any:
+        searched_queries.append(query)
+        yield [entities[0]]
+        yield [entities[2]]
+
+    mock_context.port_client.search_entities_in_batches = search_entities_in_batches  # type: ignore
+    mock_live_events_mixin.entities_state_applier.delete = AsyncMock()  # type: ignore
+
+    await mock_live_events_mixin._delete_entities(entities)
+
+    assert len(searched_queries) == 1
+    assert searched_queries[0]["rules"][0]["rules"] == [
+        {
+            "combinator": "and",
+            "rules": [
+                {"property": "$blueprint", "operator": "=", "value": "service"},
+                {
+                    "property": "$identifier",
+                    "operator": "in",
+                    "value": ["repo-one", "repo-two"],
+                },
+            ],
+        },
+        {
+            "combinator": "and",
+            "rules": [
+                {"property": "$blueprint", "operator": "=", "value": "team"},
+                {"property": "$identifier", "operator": "in", "value": ["team-one"]},
+            ],
+        },
+    ]
+    mock_live_events_mixin.entities_state_applier.delete.assert_called_once_with(
+        [entities[0], entities[2]], UserAgentType.exporter
+    )
+
+
+@pytest.mark.asyncio
+async def test_delete_entities_closes_the_search_when_it_fails_midway(
+    mock_live_events_mixin: LiveEventsMixin,
+    mock_context: PortOceanContext,
+) -> None:
+    entities = [Entity(identifier="repo-one", blueprint="service")]
+    search_closed = False
+
+    async def search_entities_in_batches(
+        user_agent_type: UserAgentType, query: dict[str, Any], **kwargs: Any
+    ) -> Any:
+        nonlocal search_closed
+        try:
+            yield entities
+            yield entities
+        finally:
+            search_closed = True
+
+    mock_context.port_client.search_entities_in_batches = search_entities_in_batches  # type: ignore
+
+    with patch(
+        "port_ocean.core.integrations.mixins.live_events.get_entities_keys",
+        side_effect=ValueError("invalid entities"),
+    ):
+        with pytest.raises(ValueError):
+            await mock_live_events_mixin._delete_entities(entities)
+
+    assert search_closed
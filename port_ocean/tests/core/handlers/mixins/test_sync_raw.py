@@ -1,7 +1,13 @@
+import asyncio
+import json
+import time
 from graphlib import CycleError
-from typing import Any, AsyncGenerator
+from pathlib import Path
+from typing import Any, AsyncGenerator, cast
 
+from port_ocean.core.utils.entity_fingerprint_store import EntityFingerprintStore
 from port_ocean.core.utils.entity_topological_sorter import EntityTopologicalSorter
+from port_ocean.core.utils.generated_entities_store import GeneratedEntitiesStore
 from port_ocean.exceptions.core import OceanAbortException
 import pytest
 from unittest.mock import MagicMock, AsyncMock, patch
@@ -18,12 +24,15 @@ from port_ocean.core.handlers.entities_state_applier.port.applier import (
 from port_ocean.core.handlers.entity_processor.jq_entity_processor import (
     JQEntityProcessor,
 )
-from port_ocean.core.models import Entity
+from port_ocean.core import ocean_types
+from port_ocean.core.models import Entity, ProcessExecutionMode
 from port_ocean.context.event import event_context, EventType
+from port_ocean.context.resource import resource_context
 from port_ocean.clients.port.types import UserAgentType
 from dataclasses import dataclass
 from typing import List, Optional
 from port_ocean.tests.core.conftest import create_entity, no_op_event_context
+from port_ocean.utils.cache import cache_coroutine_result
 
 
 @pytest.fixture
@@ -117,8 +126,8 @@ async def test_sync_raw_mixin_self_dependency(
 
     mock_sync_raw_mixin.entity_processor.parse_items = AsyncMock(return_value=calc_result_mock)  # type: ignore
 
-    mock_order_by_entities_dependencies = MagicMock(
-        side_effect=EntityTopologicalSorter.order_by_entities_dependencies
+    mock_iter_dependency_levels = MagicMock(
+        side_effect=EntityTopologicalSorter.iter_dependency_levels
     )
     async with event_context(EventType.RESYNC, trigger_type="machine") as event:
         app_config = (
@@ -128,15 +137,15 @@ async def test_sync_raw_mixin_self_dependency(
         )
         event.port_app_config = app_config
         event.entity_topological_sorter.register_entity = MagicMock(side_effect=event.entity_topological_sorter.register_entity)  # type: ignore
-        event.entity_topological_sorter.get_entities = MagicMock(side_effect=event.entity_topological_sorter.get_entities)  # type: ignore
+        event.entity_topological_sorter.get_entities_levels = MagicMock(side_effect=event.entity_topological_sorter.get_entities_levels)  # type: ignore
 
         with patch(
             "port_ocean.core.integrations.mixins.sync_raw.event_context",
             lambda *args, **kwargs: no_op_event_context(event),
         ):
             with patch(
-                "port_ocean.core.utils.entity_topological_sorter.EntityTopologicalSorter.order_by_entities_dependencies",
-                mock_order_by_entities_dependencies,
+                "port_ocean.core.utils.entity_topological_sorter.EntityTopologicalSorter.iter_dependency_levels",
+                mock_iter_dependency_levels,
             ):
 
                 await mock_sync_raw_mixin.sync_raw_all(
@@ -147,12 +156,14 @@ async def test_sync_raw_mixin_self_dependency(
                     len(event.entity_topological_sorter.entities) == 1
                 ), "Expected one failed entity callback due to retry logic"
                 assert event.entity_topological_sorter.register_entity.call_count == 1
-                assert event.entity_topological_sorter.get_entities.call_count == 1
+                assert (
+                    event.entity_topological_sorter.get_entities_levels.call_count == 1
+                )
 
-                assert mock_order_by_entities_dependencies.call_count == 1
+                assert mock_iter_dependency_levels.call_count == 1
                 assert [
                     call[0][0][0].identifier
-                    for call in mock_order_by_entities_dependencies.call_args_list
+                    for call in mock_iter_dependency_levels.call_args_list
                 ] == [
                     entity.identifier
                     for entity in entities
@@ -237,8 +248,8 @@ async def test_sync_raw_mixin_circular_dependency(
 
     mock_sync_raw_mixin.entity_processor.parse_items = AsyncMock(return_value=calc_result_mock)  # type: ignore
 
-    mock_order_by_entities_dependencies = MagicMock(
-        side_effect=EntityTopologicalSorter.order_by_entities_dependencies
+    mock_iter_dependency_levels = MagicMock(
+        side_effect=EntityTopologicalSorter.iter_dependency_levels
     )
     async with event_context(EventType.RESYNC, trigger_type="machine") as event:
         app_config = (
@@ -256,24 +267,25 @@ async def test_sync_raw_mixin_circular_dependency(
 
         event.entity_topological_sorter.register_entity = MagicMock(side_effect=mock_register_entity)  # type: ignore
         raiesed_error_handle_failed = []
-        org_get_entities = event.entity_topological_sorter.get_entities
+        org_get_entities_levels = event.entity_topological_sorter.get_entities_levels
 
         def handle_failed_wrapper(*args: Any, **kwargs: Any) -> Any:
             try:
-                return list(org_get_entities(*args, **kwargs))
+                return list(org_get_entities_levels(*args, **kwargs))
             except Exception as e:
                 raiesed_error_handle_failed.append(e)
                 raise e
 
-        event.entity_topological_sorter.get_entities = MagicMock(side_effect=lambda *args, **kwargs: handle_failed_wrapper(*args, **kwargs))  # type: ignore
+        event.entity_topological_sorter.get_entities_levels = MagicMock(side_effect=lambda *args, **kwargs: handle_failed_wrapper(*args, **kwargs))  # type: ignore
+        event.entity_topological_sorter.get_entities = MagicMock(side_effect=event.entity_topological_sorter.get_entities)  # type: ignore
 
         with patch(
             "port_ocean.core.integrations.mixins.sync_raw.event_context",
             lambda *args, **kwargs: no_op_event_context(event),
         ):
             with patch(
-                "port_ocean.core.utils.entity_topological_sorter.EntityTopologicalSorter.order_by_entities_dependencies",
-                mock_order_by_entities_dependencies,
+                "port_ocean.core.utils.entity_topological_sorter.EntityTopologicalSorter.iter_dependency_levels",
+                mock_iter_dependency_levels,
             ):
 
                 await mock_sync_raw_mixin.sync_raw_all(
@@ -284,19 +296,18 @@ async def test_sync_raw_mixin_circular_dependency(
                     len(event.entity_topological_sorter.entities) == 2
                 ), "Expected one failed entity callback due to retry logic"
                 assert event.entity_topological_sorter.register_entity.call_count == 2
-                assert event.entity_topological_sorter.get_entities.call_count == 2
+                assert (
+                    event.entity_topological_sorter.get_entities_levels.call_count == 1
+                )
                 assert [
                     call[0]
                     for call in event.entity_topological_sorter.get_entities.call_args_list
-                ] == [(), (False,)]
+                ] == [(False,)]
                 assert len(raiesed_error_handle_failed) == 1
                 assert isinstance(raiesed_error_handle_failed[0], OceanAbortException)
                 assert isinstance(raiesed_error_handle_failed[0].__cause__, CycleError)
-                assert (
-                    len(mock_ocean.port_client.client.post.call_args_list)  # type: ignore
-                    - len(entities)
-                    == 1
-                )
+                # The unordered entities are upserted again in a single bulk request
+                assert len(mock_ocean.port_client.client.post.call_args_list) == 2  # type: ignore
 
                 # Add assertions for actual metrics
                 metrics = mock_ocean.metrics.generate_metrics()
@@ -381,8 +392,8 @@ async def test_sync_raw_mixin_dependency(
     # Mock the parse_items method to return our realistic mock
     mock_sync_raw_mixin.entity_processor.parse_items = AsyncMock(return_value=calc_result_mock)  # type: ignore
 
-    mock_order_by_entities_dependencies = MagicMock(
-        side_effect=EntityTopologicalSorter.order_by_entities_dependencies
+    mock_iter_dependency_levels = MagicMock(
+        side_effect=EntityTopologicalSorter.iter_dependency_levels
     )
     async with event_context(EventType.RESYNC, trigger_type="machine") as event:
         app_config = (
@@ -400,24 +411,26 @@ async def test_sync_raw_mixin_dependency(
 
         event.entity_topological_sorter.register_entity = MagicMock(side_effect=mock_register_entity)  # type: ignore
         raiesed_error_handle_failed = []
-        org_event_get_entities = event.entity_topological_sorter.get_entities
+        org_event_get_entities_levels = (
+            event.entity_topological_sorter.get_entities_levels
+        )
 
-        def get_entities_wrapper(*args: Any, **kwargs: Any) -> Any:
+        def get_entities_levels_wrapper(*args: Any, **kwargs: Any) -> Any:
             try:
-                return org_event_get_entities(*args, **kwargs)
+                return org_event_get_entities_levels(*args, **kwargs)
             except Exception as e:
                 raiesed_error_handle_failed.append(e)
                 raise e
 
-        event.entity_topological_sorter.get_entities = MagicMock(side_effect=lambda *args, **kwargs: get_entities_wrapper(*args, **kwargs))  # type: ignore
+        event.entity_topological_sorter.get_entities_levels = MagicMock(side_effect=lambda *args, **kwargs: get_entities_levels_wrapper(*args, **kwargs))  # type: ignore
 
         with patch(
             "port_ocean.core.integrations.mixins.sync_raw.event_context",
             lambda *args, **kwargs: no_op_event_context(event),
         ):
             with patch(
-                "port_ocean.core.utils.entity_topological_sorter.EntityTopologicalSorter.order_by_entities_dependencies",
-                mock_order_by_entities_dependencies,
+                "port_ocean.core.utils.entity_topological_sorter.EntityTopologicalSorter.iter_dependency_levels",
+                mock_iter_dependency_levels,
             ):
 
                 await mock_sync_raw_mixin.sync_raw_all(
@@ -428,28 +441,30 @@ async def test_sync_raw_mixin_dependency(
                 assert (
                     len(event.entity_topological_sorter.entities) == 5
                 ), "Expected one failed entity callback due to retry logic"
-                assert event.entity_topological_sorter.get_entities.call_count == 1
+                assert (
+                    event.entity_topological_sorter.get_entities_levels.call_count == 1
+                )
                 assert len(raiesed_error_handle_failed) == 0
-                assert mock_ocean.port_client.client.post.call_count == 6  # type: ignore
-                assert mock_order_by_entities_dependencies.call_count == 1
+                assert mock_ocean.port_client.client.post.call_count == 4  # type: ignore
+                assert mock_iter_dependency_levels.call_count == 1
 
                 result_bulk = mock_ocean.port_client.client.post.call_args_list[0]  # type: ignore
-                result_non_bulk = mock_ocean.port_client.client.post.call_args_list[1:6]  # type: ignore
+                result_levels = mock_ocean.port_client.client.post.call_args_list[1:4]  # type: ignore
 
                 assert "-".join(
                     [
                         entity.get("identifier")
-                        for entity in result_bulk[1].get("json").get("entities")
+                        for entity in json.loads(result_bulk[1]["content"])["entities"]
                     ]
                 ) == "-".join([entity.identifier for entity in entities])
-                assert "-".join(
-                    [call[1].get("json").get("identifier") for call in result_non_bulk]
-                ) in (
-                    "entity_3-entity_4-entity_1-entity_2-entity_5",
-                    "entity_3-entity_4-entity_1-entity_5-entity_2",
-                    "entity_3-entity_1-entity_4-entity_2-entity_5",
-                    "entity_3-entity_1-entity_4-entity_5-entity_2",
-                )
+                # Every dependency level is upserted in a single bulk request, after the previous level
+                assert [
+                    sorted(
+                        entity.get("identifier")
+                        for entity in json.loads(call[1]["content"])["entities"]
+                    )
+                    for call in result_levels
+                ] == [["entity_3"], ["entity_1", "entity_4"], ["entity_2", "entity_5"]]
 
                 # Add assertions for actual metrics
                 metrics = mock_ocean.metrics.generate_metrics()
@@ -751,6 +766,243 @@ async def test_map_entities_compared_with_port_with_multiple_batches_all_batches
             )  # Verify final diff was calculated once
 
 
+@pytest.mark.asyncio
+async def test_map_entities_compared_with_port_searches_batches_concurrently(
+    mock_sync_raw_mixin: SyncRawMixin,
+    mock_resource_config: ResourceConfig,
+) -> None:
+    entities = [create_entity(f"entity_{i}", "service", {}, False) for i in range(200)]
+    running = 0
+    max_running = 0
+
+    async def fetch_entities_batch(
+        entities_batch: list[Entity], *args: Any
+    ) -> list[Entity]:
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return entities_batch
+
+    with patch.object(
+        mock_sync_raw_mixin,
+        "_fetch_entities_batch_from_port",
+        side_effect=fetch_entities_batch,
+    ) as mock_fetch_entities_batch:
+        changed_entities = await mock_sync_raw_mixin._map_entities_compared_with_port(
+            entities, mock_resource_config, UserAgentType.exporter
+        )
+
+    assert changed_entities == []
+    assert mock_fetch_entities_batch.call_count == 4
+    assert max_running == 4
+
+
+def test_get_entities_compare_batches_adapts_to_entities_size(
+    mock_sync_raw_mixin: SyncRawMixin,
+) -> None:
+    small_entities = [
+        create_entity(f"entity_{i}", "service", {}, False) for i in range(120)
+    ]
+    large_entities = [
+        Entity(
+            identifier=f"entity_{i}",
+            blueprint="service",
+            properties={"readme": "a" * 100 * 1024},
+        )
+        for i in range(120)
+    ]
+
+    small_batches = mock_sync_raw_mixin._get_entities_compare_batches(small_entities)
+    large_batches = mock_sync_raw_mixin._get_entities_compare_batches(large_entities)
+
+    assert [len(batch) for batch in small_batches] == [50, 50, 20]
+    assert {len(batch) for batch in large_batches[:-1]} == {10}
+    assert sum(len(batch) for batch in large_batches) == 120
+
+
+@pytest.mark.asyncio
+async def test_register_in_batches_transforms_next_batch_while_loading(
+    mock_sync_raw_mixin: SyncRawMixin,
+    mock_port_app_config: PortAppConfig,
+) -> None:
+    resource = mock_port_app_config.resources[0]
+    steps: list[str] = []
+
+    async def raw_results_generator() -> AsyncGenerator[list[dict[str, Any]], None]:
+        for index in range(3):
+            yield [{"batch": index}]
+
+    async def calculate_raw(
+        raw_diff: list[tuple[ResourceConfig, list[dict[str, Any]]]], *args: Any
+    ) -> list[Any]:
+        batch = raw_diff[0][1][0]["batch"]
+        steps.append(f"transform-{batch}")
+        entity = Entity(identifier=str(batch), blueprint="service")
+        return [
+            ocean_types.CalculationResult(
+                ocean_types.EntitySelectorDiff(passed=[entity], failed=[]), []
+            )
+        ]
+
+    async def load_calculation_result(
+        resource: ResourceConfig, calculation_result: Any, *args: Any
+    ) -> Any:
+        batch = calculation_result.entity_selector_diff.passed[0].identifier
+        steps.append(f"load-start-{batch}")
+        await asyncio.sleep(0.01)
+        steps.append(f"load-end-{batch}")
+        return calculation_result
+
+    mock_sync_raw_mixin._get_resource_raw_results = AsyncMock(return_value=([raw_results_generator()], []))  # type: ignore
+    mock_sync_raw_mixin._calculate_raw = AsyncMock(side_effect=calculate_raw)  # type: ignore
+    mock_sync_raw_mixin._load_calculation_result = AsyncMock(side_effect=load_calculation_result)  # type: ignore
+
+    async with event_context(EventType.RESYNC, trigger_type="machine") as event:
+        event.port_app_config = mock_port_app_config
+        async with resource_context(resource, 0):
+            entities, errors = await mock_sync_raw_mixin._register_in_batches(
+                resource, UserAgentType.exporter
+            )
+
+    assert [entity.identifier for entity in entities] == ["0", "1", "2"]
+    assert errors == []
+    for batch in range(2):
+        # The next batch is transformed while the current batch is loading
+        assert steps.index(f"transform-{batch + 1}") < steps.index(f"load-end-{batch}")
+        # Only one batch is loaded at a time
+        assert steps.index(f"load-end-{batch}") < steps.index(f"load-start-{batch + 1}")
+
+
+@pytest.mark.asyncio
+async def test_register_in_batches_pipeline_overlaps_extract_transform_and_load(
+    mock_ocean: Ocean,
+    mock_sync_raw_mixin: SyncRawMixin,
+    mock_port_app_config: PortAppConfig,
+) -> None:
+    mock_ocean.config.resync_pipeline_enabled = True
+    mock_ocean.config.resync_pipeline_queue_size = 1
+    mock_ocean.config.resync_pipeline_extract_concurrency = 1
+    mock_ocean.config.resync_pipeline_transform_concurrency = 1
+    mock_ocean.config.resync_pipeline_load_concurrency = 1
+    resource = mock_port_app_config.resources[0]
+    steps: list[str] = []
+
+    async def raw_results_generator() -> AsyncGenerator[list[dict[str, Any]], None]:
+        for index in range(4):
+            steps.append(f"extract-{index}")
+            yield [{"batch": index}]
+
+    async def aborted_generator() -> AsyncGenerator[list[dict[str, Any]], None]:
+        raise ExceptionGroup("aborted", [OceanAbortException("aborted")])
+        yield []
+
+    async def calculate_raw(
+        raw_diff: list[tuple[ResourceConfig, list[dict[str, Any]]]], *args: Any
+    ) -> list[Any]:
+        batch = raw_diff[0][1][0]["batch"]
+        steps.append(f"transform-{batch}")
+        entity = Entity(identifier=str(batch), blueprint="service")
+        return [
+            ocean_types.CalculationResult(
+                ocean_types.EntitySelectorDiff(passed=[entity], failed=[]), []
+            )
+        ]
+
+    async def load_calculation_result(
+        resource: ResourceConfig, calculation_result: Any, *args: Any
+    ) -> Any:
+        batch = calculation_result.entity_selector_diff.passed[0].identifier
+        steps.append(f"load-start-{batch}")
+        await asyncio.sleep(0.01)
+        steps.append(f"load-end-{batch}")
+        return calculation_result
+
+    mock_sync_raw_mixin._get_resource_raw_results = AsyncMock(return_value=([aborted_generator(), raw_results_generator()], []))  # type: ignore
+    mock_sync_raw_mixin._calculate_raw = AsyncMock(side_effect=calculate_raw)  # type: ignore
+    mock_sync_raw_mixin._load_calculation_result = AsyncMock(side_effect=load_calculation_result)  # type: ignore
+
+    async with event_context(EventType.RESYNC, trigger_type="machine") as event:
+        event.port_app_config = mock_port_app_config
+        async with resource_context(resource, 0):
+            entities, errors = await mock_sync_raw_mixin._register_in_batches(
+                resource, UserAgentType.exporter
+            )
+
+    assert [entity.identifier for entity in entities] == ["0", "1", "2", "3"]
+    # The aborted generator fails the kind without stopping the rest of the generators
+    assert len(errors) == 1
+    for batch in range(3):
+        # The next batch is fetched and transformed while the current batch is loading
+        assert steps.index(f"extract-{batch + 1}") < steps.index(f"load-end-{batch}")
+        assert steps.index(f"transform-{batch + 1}") < steps.index(f"load-end-{batch}")
+    for stage in ("extract", "transform", "load"):
+        labels = {"kind": f"{resource.kind}-0", "phase": stage}
+        assert (
+            mock_ocean.metrics.registry.get_sample_value(
+                "resync_pipeline_idle_seconds", labels
+            )
+            is not None
+        )
+        assert (
+            mock_ocean.metrics.registry.get_sample_value(
+                "resync_pipeline_queue_size", labels
+            )
+            is not None
+        )
+    # The resync duration of the kind includes the pipeline
+    assert mock_ocean.metrics.registry.get_sample_value(
+        "duration_seconds", {"kind": f"{resource.kind}-0", "phase": "resync"}
+    )
+
+
+@pytest.mark.asyncio
+async def test_process_resource_streams_the_results_of_the_subprocess(
+    mock_ocean: Ocean,
+    mock_sync_raw_mixin: SyncRawMixin,
+    mock_port_app_config: PortAppConfig,
+) -> None:
+    mock_ocean.process_execution_mode = ProcessExecutionMode.multi_process
+    resource = mock_port_app_config.resources[0]
+
+    async def raw_results_generator() -> AsyncGenerator[list[dict[str, Any]], None]:
+        for index in range(3):
+            yield [{"batch": index}]
+
+    async def calculate_raw(
+        raw_diff: list[tuple[ResourceConfig, list[dict[str, Any]]]], *args: Any
+    ) -> list[Any]:
+        batch = raw_diff[0][1][0]["batch"]
+        entity = Entity(identifier=str(batch), blueprint="service")
+        return [
+            ocean_types.CalculationResult(
+                ocean_types.EntitySelectorDiff(passed=[entity], failed=[]), []
+            )
+        ]
+
+    async def load_calculation_result(
+        resource: ResourceConfig, calculation_result: Any, *args: Any
+    ) -> Any:
+        return calculation_result
+
+    mock_sync_raw_mixin._get_resource_raw_results = AsyncMock(return_value=([raw_results_generator()], []))  # type: ignore
+    mock_sync_raw_mixin._calculate_raw = AsyncMock(side_effect=calculate_raw)  # type: ignore
+    mock_sync_raw_mixin._load_calculation_result = AsyncMock(side_effect=load_calculation_result)  # type: ignore
+
+    async with event_context(EventType.RESYNC, trigger_type="machine") as event:
+        event.port_app_config = mock_port_app_config
+        started_at = time.monotonic()
+        entities, errors = await mock_sync_raw_mixin.process_resource(
+            resource, 0, UserAgentType.exporter
+        )
+
+    assert [entity.identifier for entity in entities] == ["0", "1", "2"]
+    assert errors == []
+    # The completion of the subprocess is awaited without polling
+    assert time.monotonic() - started_at < 2
+
+
 @dataclass
 class EntitySelectorDiff:
     passed: List[Entity]
@@ -780,7 +1032,7 @@ async def test_register_resource_raw_no_changes_upsert_not_called_entitiy_is_ret
 ) -> None:
     entity = Entity(identifier="1", blueprint="service")
     mock_sync_raw_mixin._calculate_raw = AsyncMock(return_value=[CalculationResult(entity_selector_diff=EntitySelectorDiff(passed=[entity], failed=[]), errors=[], misconfigurations=[], misonfigured_entity_keys=[])])  # type: ignore
-    mock_sync_raw_mixin._map_entities_compared_with_port = AsyncMock(return_value=([]))  # type: ignore
+    mock_sync_raw_mixin._map_entities_compared_with_port = AsyncMock(return_value=([]))
     mock_sync_raw_mixin.entities_state_applier.upsert = AsyncMock()  # type: ignore
 
     async with event_context(EventType.RESYNC, trigger_type="machine") as event:
@@ -807,7 +1059,9 @@ async def test_register_resource_raw_with_changes_upsert_called_and_entities_are
 ) -> None:
     entity = Entity(identifier="1", blueprint="service")
     mock_sync_raw_mixin._calculate_raw = AsyncMock(return_value=[CalculationResult(entity_selector_diff=EntitySelectorDiff(passed=[entity], failed=[]), errors=[], misconfigurations=[], misonfigured_entity_keys=[])])  # type: ignore
-    mock_sync_raw_mixin._map_entities_compared_with_port = AsyncMock(return_value=([entity]))  # type: ignore
+    mock_sync_raw_mixin._map_entities_compared_with_port = AsyncMock(
+        return_value=([entity])
+    )
     mock_sync_raw_mixin.entities_state_applier.upsert = AsyncMock(return_value=[entity])  # type: ignore
 
     async with event_context(EventType.RESYNC, trigger_type="machine") as event:
@@ -827,6 +1081,49 @@ async def test_register_resource_raw_with_changes_upsert_called_and_entities_are
         mock_sync_raw_mixin._map_entities_compared_with_port.assert_called_once()
 
 
+@pytest.mark.asyncio
+async def test_register_resource_raw_skips_unchanged_entities_of_fingerprint_store(
+    mock_sync_raw_mixin: SyncRawMixin,
+    mock_port_app_config: PortAppConfig,
+    mock_ocean: Ocean,
+    tmp_path: Path,
+) -> None:
+    mock_ocean.entity_fingerprint_store = EntityFingerprintStore(
+        tmp_path / "fingerprints.sqlite"
+    )
+    unchanged_entity = Entity(identifier="1", blueprint="service")
+    same_as_port_entity = Entity(identifier="2", blueprint="service")
+    changed_entity = Entity(identifier="3", blueprint="service")
+    mock_ocean.entity_fingerprint_store.record([unchanged_entity])
+    mock_sync_raw_mixin._calculate_raw = AsyncMock(return_value=[CalculationResult(entity_selector_diff=EntitySelectorDiff(passed=[unchanged_entity, same_as_port_entity, changed_entity], failed=[]), errors=[], misconfigurations=[], misonfigured_entity_keys=[])])  # type: ignore
+    mock_sync_raw_mixin._map_entities_compared_with_port = AsyncMock(
+        return_value=([changed_entity])
+    )
+    mock_sync_raw_mixin.entities_state_applier.upsert = AsyncMock(return_value=[changed_entity])  # type: ignore
+
+    async with event_context(EventType.RESYNC, trigger_type="machine") as event:
+        event.port_app_config = mock_port_app_config
+
+        result = await mock_sync_raw_mixin._register_resource_raw(
+            mock_port_app_config.resources[0],
+            [{"some": "data"}],
+            UserAgentType.exporter,
+        )
+
+    assert len(result.entity_selector_diff.passed) == 3
+    mock_sync_raw_mixin._map_entities_compared_with_port.assert_called_once_with(
+        [same_as_port_entity, changed_entity],
+        mock_port_app_config.resources[0],
+        UserAgentType.exporter,
+    )
+    mock_sync_raw_mixin.entities_state_applier.upsert.assert_called_once_with(
+        [changed_entity], UserAgentType.exporter
+    )
+    assert mock_ocean.entity_fingerprint_store.filter_changed(
+        [unchanged_entity, same_as_port_entity, changed_entity]
+    ) == [changed_entity]
+
+
 @pytest.mark.asyncio
 async def test_register_resource_raw_with_errors(
     mock_sync_raw_mixin: SyncRawMixin, mock_port_app_config: PortAppConfig
@@ -834,7 +1131,7 @@ async def test_register_resource_raw_with_errors(
     failed_entity = Entity(identifier="1", blueprint="service")
     error = Exception("Test error")
     mock_sync_raw_mixin._calculate_raw = AsyncMock(return_value=[CalculationResult(entity_selector_diff=EntitySelectorDiff(passed=[], failed=[failed_entity]), errors=[error], misconfigurations=[], misonfigured_entity_keys=[])])  # type: ignore
-    mock_sync_raw_mixin._map_entities_compared_with_port = AsyncMock(return_value=([]))  # type: ignore
+    mock_sync_raw_mixin._map_entities_compared_with_port = AsyncMock(return_value=([]))
     mock_sync_raw_mixin.entities_state_applier.upsert = AsyncMock()  # type: ignore
 
     async with event_context(EventType.RESYNC, trigger_type="machine") as event:
@@ -873,7 +1170,7 @@ async def test_register_resource_raw_skip_event_type_http_request_upsert_called_
         misonfigured_entity_keys=[],
     )
     mock_sync_raw_mixin._calculate_raw = AsyncMock(return_value=[calculation_result])  # type: ignore
-    mock_sync_raw_mixin._map_entities_compared_with_port = AsyncMock()  # type: ignore
+    mock_sync_raw_mixin._map_entities_compared_with_port = AsyncMock()
     mock_sync_raw_mixin.entities_state_applier.upsert = AsyncMock(return_value=[entity])  # type: ignore
 
     async with event_context(EventType.HTTP_REQUEST, trigger_type="machine") as event:
@@ -1081,3 +1378,163 @@ async def test_on_resync_start_hook_error_prevents_resync(
     assert (
         not resync_complete_called
     ), "on_resync_complete hook should not have been called after error"
+
+
+@pytest.mark.asyncio
+async def test_resync_reconciliation_deletes_entities_missing_from_generated_entities_store(
+    mock_sync_raw_mixin: SyncRawMixin,
+    mock_port_app_config: PortAppConfig,
+    mock_ocean: Ocean,
+    tmp_path: Path,
+) -> None:
+    async def search_entities_in_batches(
+        *args: Any, **kwargs: Any
+    ) -> AsyncGenerator[list[Entity], None]:
+        for start in range(0, 10, 4):
+            yield [
+                Entity(identifier=str(index), blueprint="service")
+                for index in range(start, min(start + 4, 10))
+            ]
+
+    mock_ocean.port_client.search_entities_in_batches = search_entities_in_batches  # type: ignore
+    mock_port_app_config.entity_deletion_threshold = 0.9
+
+    async with event_context(EventType.RESYNC, trigger_type="machine") as event:
+        event.port_app_config = mock_port_app_config
+        event.generated_entities_store = GeneratedEntitiesStore(
+            tmp_path / "reconciliation.sqlite"
+        )
+        event.generated_entities_store.add_generated_entities(
+            [Entity(identifier=str(index), blueprint="service") for index in range(8)]
+        )
+        with patch.object(
+            mock_sync_raw_mixin.entities_state_applier, "delete"
+        ) as mock_delete:
+            await mock_sync_raw_mixin.resync_reconciliation(
+                [([], [])], True, UserAgentType.exporter, mock_port_app_config
+            )
+
+    mock_delete.assert_called_once()
+    assert [entity.identifier for entity in mock_delete.call_args[0][0]] == ["8", "9"]
+
+
+@pytest.mark.asyncio
+async def test_sync_raw_kinds_processes_only_resources_of_given_kinds(
+    mock_sync_raw_mixin: SyncRawMixin,
+    mock_port_app_config: PortAppConfig,
+    mock_context: PortOceanContext,
+) -> None:
+    mock_port_app_config.resources = [
+        mock_port_app_config.resources[0].copy(update={"kind": kind})
+        for kind in ("project", "service", "project")
+    ]
+    mock_sync_raw_mixin.process_resource = AsyncMock(return_value=([], []))  # type: ignore
+    mock_sync_raw_mixin.entities_state_applier.delete = AsyncMock()  # type: ignore
+
+    async with event_context(EventType.RESYNC, trigger_type="machine") as event:
+        event.port_app_config = mock_port_app_config
+        await mock_sync_raw_mixin.sync_raw_kinds(["project"])
+
+    assert [
+        (call.args[0].kind, call.args[1])
+        for call in mock_sync_raw_mixin.process_resource.call_args_list
+    ] == [("project", 0), ("project", 2)]
+    mock_sync_raw_mixin.entities_state_applier.delete.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_sync_raw_kinds_waits_for_full_resync_and_bypasses_the_cache(
+    mock_sync_raw_mixin: SyncRawMixin,
+    mock_port_app_config: PortAppConfig,
+    mock_context: PortOceanContext,
+) -> None:
+    fetch_count = 0
+
+    @cache_coroutine_result()
+    async def fetch_projects() -> int:
+        nonlocal fetch_count
+        fetch_count += 1
+        return fetch_count
+
+    fetched_values: list[int] = []
+
+    async def process_resource(*args: Any) -> tuple[list[Entity], list[Exception]]:
+        fetched_values.append(await fetch_projects())
+        return [], []
+
+    mock_sync_raw_mixin.process_resource = process_resource  # type: ignore
+    assert await fetch_projects() == 1
+    await mock_context.app.cache_provider.set("services", ["cached"])
+
+    async with event_context(EventType.RESYNC, trigger_type="machine") as event:
+        event.port_app_config = mock_port_app_config
+        # A running full resync holds the lock until it's done
+        async with mock_sync_raw_mixin._resync_lock:
+            resync = asyncio.create_task(
+                mock_sync_raw_mixin.sync_raw_kinds(["project"])
+            )
+            await asyncio.sleep(0.05)
+            assert not resync.done()
+            assert not fetched_values
+        await resync
+
+    assert fetched_values == [2]
+    # The fresh result replaced the cached one, and the rest of the cache was kept
+    assert await fetch_projects() == 2
+    assert await mock_context.app.cache_provider.get("services") == ["cached"]
+
+
+@pytest.mark.asyncio
+async def test_sync_raw_all_aborts_the_running_resync(
+    mock_sync_raw_mixin: SyncRawMixin,
+    mock_port_app_config: PortAppConfig,
+    mock_ocean: Ocean,
+) -> None:
+    started = asyncio.Event()
+    calls = 0
+
+    async def get_resource_raw_results(*args: Any) -> tuple[list[Any], list[Any]]:
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            started.set()
+            # The first resync runs until it's aborted
+            await asyncio.Event().wait()
+        return [], []
+
+    mock_sync_raw_mixin._get_resource_raw_results = get_resource_raw_results  # type: ignore
+    mock_ocean.metrics.report_sync_metrics = AsyncMock(return_value=None)  # type: ignore
+    mock_ocean.metrics.report_kind_sync_metrics = AsyncMock(return_value=None)  # type: ignore
+    mock_ocean.metrics.send_metrics_to_webhook = AsyncMock(return_value=None)  # type: ignore
+
+    async with event_context(EventType.RESYNC, trigger_type="machine") as event:
+        event.port_app_config = mock_port_app_config
+        first_resync = asyncio.create_task(mock_sync_raw_mixin.sync_raw_all())
+        await asyncio.wait_for(started.wait(), timeout=5)
+        await asyncio.wait_for(mock_sync_raw_mixin.sync_raw_all(), timeout=5)
+
+    assert first_resync.done()
+    with pytest.raises(asyncio.CancelledError):
+        await first_resync
+    assert calls == 2
+
+
+@pytest.mark.asyncio
+async def test_sync_raw_all_invalidates_the_port_app_config_before_waiting_for_the_running_resync(
+    mock_sync_raw_mixin: SyncRawMixin,
+    mock_port_app_config: PortAppConfig,
+) -> None:
+    invalidate_cache = cast(
+        MagicMock, mock_sync_raw_mixin.port_app_config_handler.invalidate_cache
+    )
+
+    async with mock_sync_raw_mixin._resync_lock:
+        async with event_context(EventType.RESYNC, trigger_type="machine") as event:
+            event.port_app_config = mock_port_app_config
+            resync = asyncio.create_task(mock_sync_raw_mixin.sync_raw_all())
+            await asyncio.sleep(0.05)
+
+            invalidate_cache.assert_called_once()
+            assert not resync.done()
+            resync.cancel()
+            await asyncio.gather(resync, return_exceptions=True)
@@ -277,3 +277,18 @@ async def test_get_port_app_config_fetch_error(
     async with event_context(EventType.RESYNC, trigger_type="machine"):
         with pytest.raises(EmptyPortAppConfigError, match="Port app config is empty"):
             await port_app_config_handler.get_port_app_config()
+
+
+@pytest.mark.asyncio
+async def test_get_port_app_config_after_invalidate_cache_fetches_config(
+    port_app_config_handler: MockPortAppConfig,
+) -> None:
+    port_app_config_handler.mock_get_port_app_config.return_value = {"resources": []}
+
+    async with event_context(EventType.RESYNC, trigger_type="machine"):
+        await port_app_config_handler.get_port_app_config()
+        await port_app_config_handler.get_port_app_config()
+        port_app_config_handler.invalidate_cache()
+        await port_app_config_handler.get_port_app_config()
+
+    assert port_app_config_handler.mock_get_port_app_config.call_count == 2
@@ -0,0 +1,137 @@
+import asyncio
+import sqlite3
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+
+from port_ocean.core.handlers.queue.disk_queue import DiskQueue
+
+
+@dataclass
+class MockMessage:
+    """Example message type for testing"""
+
+    id: str
+    data: str
+
+
+def create_queue(path: Path) -> DiskQueue[MockMessage]:
+    return DiskQueue(
+        path / "queue.sqlite",
+        serialize=asdict,
+        deserialize=lambda data: MockMessage(**data),
+    )
+
+
+class TestDiskQueue:
+    @pytest.fixture
+    def queue(self, tmp_path: Path) -> DiskQueue[MockMessage]:
+        return create_queue(tmp_path)
+
+    async def test_fifo_order(self, queue: DiskQueue[MockMessage]) -> None:
+        messages = [MockMessage(id=str(i), data=f"test_{i}") for i in range(3)]
+
+        for message in messages:
+            await queue.put(message)
+
+        assert queue.size() == 3
+        for expected in messages:
+            assert await queue.get() == expected
+            await queue.commit()
+        assert queue.size() == 0
+        assert queue.oldest_item_age_seconds() is None
+
+    async def test_get_waits_for_put(self, queue: DiskQueue[MockMessage]) -> None:
+        getter = asyncio.create_task(queue.get())
+        await asyncio.sleep(0.05)
+        assert not getter.done()
+
+        await queue.put(MockMessage(id="1", data="test"))
+
+        assert await asyncio.wait_for(getter, timeout=1) == MockMessage(
+            id="1", data="test"
+        )
+
+    async def test_uncommitted_messages_replayed_after_restart(
+        self, tmp_path: Path
+    ) -> None:
+        queue = create_queue(tmp_path)
+        for i in range(3):
+            await queue.put(MockMessage(id=str(i), data=f"test_{i}"))
+        await queue.get()
+        await queue.commit()
+        await queue.get()
+
+        restarted_queue = create_queue(tmp_path)
+
+        assert restarted_queue.size() == 2
+        assert restarted_queue.oldest_item_age_seconds() is not None
+        assert [(await restarted_queue.get()).id for _ in range(2)] == ["1", "2"]
+
+    async def test_concurrent_puts_written_in_a_single_transaction(
+        self, queue: DiskQueue[MockMessage]
+    ) -> None:
+        original_write = queue._write
+        writes: list[Any] = []
+
+        def write(*args: Any) -> Any:
+            writes.append(args)
+            return original_write(*args)
+
+        with patch.object(queue, "_write", side_effect=write):
+            await asyncio.gather(
+                *(queue.put(MockMessage(id=str(i), data="test")) for i in range(50))
+            )
+
+        assert queue.size() == 50
+        assert len(writes) < 50
+        assert [(await queue.get()).id for _ in range(50)] == [
+            str(i) for i in range(50)
+        ]
+
+    async def test_teardown_waits_for_commits(
+        self, queue: DiskQueue[MockMessage]
+    ) -> None:
+        await queue.put(MockMessage(id="1", data="test"))
+        teardown = asyncio.create_task(queue.teardown())
+        await queue.get()
+        await asyncio.sleep(0.05)
+        assert not teardown.done()
+
+        await queue.commit()
+
+        await asyncio.wait_for(teardown, timeout=1)
+
+    async def test_failed_write_fails_the_put_and_teardown_closes_the_queue(
+        self, queue: DiskQueue[MockMessage]
+    ) -> None:
+        with patch.object(
+            queue, "_write", side_effect=sqlite3.OperationalError("disk I/O error")
+        ):
+            with pytest.raises(sqlite3.OperationalError):
+                await queue.put(MockMessage(id="1", data="test"))
+
+        assert queue.size() == 0
+        await asyncio.wait_for(queue.teardown(), timeout=1)
+        with pytest.raises(sqlite3.ProgrammingError):
+            queue._connection.execute("SELECT 1")
+
+    async def test_drop_oldest_drops_the_oldest_item_that_wasnt_taken(
+        self, queue: DiskQueue[MockMessage]
+    ) -> None:
+        for i in range(3):
+            await queue.put(MockMessage(id=str(i), data="test"))
+        assert (await queue.get()).id == "0"
+
+        assert await queue.drop_oldest()
+        assert queue.size() == 2
+        assert (await queue.get()).id == "2"
+        assert not await queue.drop_oldest()
+
+        await queue.commit()
+        await queue.commit()
+        await asyncio.wait_for(queue.teardown(), timeout=1)
+        assert queue.size() == 0
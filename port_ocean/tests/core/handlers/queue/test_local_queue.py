@@ -88,3 +88,34 @@ class TestLocalQueue:
         await processor
 
         assert processed_count == message_count
+
+    async def test_size_and_age(self, queue: LocalQueue[MockMessage]) -> None:
+        assert queue.oldest_item_age_seconds() is None
+
+        await queue.put(MockMessage(id="1", data="test"))
+        await queue.get()
+
+        assert queue.size() == 1
+        assert queue.oldest_item_age_seconds() is not None
+
+        await queue.commit()
+
+        assert queue.size() == 0
+
+    async def test_drop_oldest_drops_the_oldest_item_that_wasnt_taken(
+        self,
+    ) -> None:
+        queue = LocalQueue[MockMessage](sizeof=lambda message: len(message.data))
+        for i in range(3):
+            await queue.put(MockMessage(id=str(i), data="x" * (i + 1)))
+        assert (await queue.get()).id == "0"
+
+        assert await queue.drop_oldest()
+        assert queue.size() == 2
+        assert queue.size_bytes() == 4
+        assert (await queue.get()).id == "2"
+        assert not await queue.drop_oldest()
+
+        await queue.commit()
+        await queue.commit()
+        await asyncio.wait_for(queue.teardown(), timeout=1)
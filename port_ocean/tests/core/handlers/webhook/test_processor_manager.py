@@ -39,6 +39,9 @@ from port_ocean.core.integrations.mixins.live_events import LiveEventsMixin
 from port_ocean.core.models import Entity
 from port_ocean.exceptions.webhook_processor import RetryableError
 from port_ocean.core.handlers.queue import LocalQueue
+from port_ocean.config.settings import IntegrationSettings, MetricsSettings
+from port_ocean.helpers.metric.metric import Metrics
+from port_ocean.core.models import LiveEventsOverflowPolicy
 
 
 class MockProcessor(AbstractWebhookProcessor):
@@ -297,6 +300,13 @@ def mock_ocean(mock_port_client: PortClient) -> Ocean:
         ocean_mock.config.port = MagicMock()
         ocean_mock.config.port.port_app_config_cache_ttl = 60
         ocean_mock.port_client = mock_port_client
+        ocean_mock.metrics = Metrics(
+            metrics_settings=MetricsSettings(enabled=True),
+            integration_configuration=IntegrationSettings(
+                type="test", identifier="test"
+            ),
+            port_client=mock_port_client,
+        )
         ocean_mock.integration_router = APIRouter()
         ocean_mock.fast_api_app = FastAPI()
         return ocean_mock
@@ -1459,3 +1469,368 @@ async def test_integrationTest_postRequestSent_oneProcessorThrowsException_onlyS
     mock_delete.assert_not_called()
 
     await mock_context.app.webhook_manager.shutdown()
+
+
+class GroupedProcessor(AbstractWebhookProcessor):
+    """Records the events it handles, the events are grouped by their repository"""
+
+    handled_events: list[tuple[str, str, int]] = []
+    release: asyncio.Event
+
+    @classmethod
+    def get_event_group_id(cls, event: WebhookEvent) -> str | None:
+        return event.payload["repository"]
+
+    async def authenticate(self, payload: EventPayload, headers: EventHeaders) -> bool:
+        return True
+
+    async def validate_payload(self, payload: EventPayload) -> bool:
+        return True
+
+    async def handle_event(
+        self, payload: EventPayload, resource: ResourceConfig
+    ) -> WebhookEventRawResults:
+        self.handled_events.append(("start", payload["repository"], payload["seq"]))
+        await self.release.wait()
+        await asyncio.sleep(0.01)
+        self.handled_events.append(("end", payload["repository"], payload["seq"]))
+        return WebhookEventRawResults(updated_raw_results=[], deleted_raw_results=[])
+
+    async def should_process_event(self, event: WebhookEvent) -> bool:
+        return True
+
+    async def get_matching_kinds(self, event: WebhookEvent) -> list[str]:
+        return ["repository"]
+
+
+async def process_grouped_events(
+    mock_context: PortOceanContext,
+    mock_port_app_config: PortAppConfig,
+    monkeypatch: pytest.MonkeyPatch,
+    payloads: list[dict[str, Any]],
+    event_workers_per_path: int = 1,
+    event_coalescing_window_seconds: float = 0.0,
+) -> list[tuple[str, str, int]]:
+    monkeypatch.setattr(LiveEventsMixin, "sync_raw_results", AsyncMock())
+    port_app_config_handler = AsyncMock()
+    port_app_config_handler.get_port_app_config.return_value = mock_port_app_config
+    monkeypatch.setattr(
+        HandlerMixin, "port_app_config_handler", port_app_config_handler
+    )
+    monkeypatch.setattr(EventContext, "port_app_config", mock_port_app_config)
+    mock_context.app.integration = BaseIntegration(ocean)
+    manager = LiveEventsProcessorManager(
+        APIRouter(),
+        SignalHandler(),
+        max_event_processing_seconds=3,
+        max_wait_seconds_before_shutdown=3,
+        event_workers_per_path=event_workers_per_path,
+        event_coalescing_window_seconds=event_coalescing_window_seconds,
+    )
+    GroupedProcessor.handled_events = []
+    GroupedProcessor.release = asyncio.Event()
+    manager.register_processor("/webhook-test", GroupedProcessor)
+    await manager.start_processing_event_messages()
+
+    queue = manager._event_queues["/webhook-test"]
+    for index, payload in enumerate(payloads):
+        await queue.put(WebhookEvent(trace_id=str(index), payload=payload, headers={}))
+    # Let the dispatcher route all the events before the workers finish any of them
+    await asyncio.sleep(0.05)
+    GroupedProcessor.release.set()
+    await asyncio.wait_for(queue.teardown(), timeout=5)
+    await manager.shutdown()
+
+    port_app_config_handler.get_port_app_config.assert_awaited_with()
+    return GroupedProcessor.handled_events
+
+
+@pytest.mark.asyncio
+async def test_processQueue_multipleWorkers_groupsProcessedConcurrentlyInOrder(
+    mock_context: PortOceanContext,
+    mock_port_app_config: PortAppConfig,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    payloads = [
+        {"repository": f"repo-{index % 4}", "seq": index} for index in range(12)
+    ]
+
+    handled_events = await process_grouped_events(
+        mock_context,
+        mock_port_app_config,
+        monkeypatch,
+        payloads,
+        event_workers_per_path=4,
+    )
+
+    assert len(handled_events) == 24
+    for repository in {payload["repository"] for payload in payloads}:
+        assert [
+            (step, seq) for step, repo, seq in handled_events if repo == repository
+        ] == [
+            (step, payload["seq"])
+            for payload in payloads
+            if payload["repository"] == repository
+            for step in ("start", "end")
+        ]
+    # Events of different groups started before any event finished
+    first_end = next(
+        index for index, (step, _, _) in enumerate(handled_events) if step == "end"
+    )
+    assert first_end > 1
+
+
+@pytest.mark.asyncio
+async def test_processQueue_singleWorker_eventsProcessedSerially(
+    mock_context: PortOceanContext,
+    mock_port_app_config: PortAppConfig,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    payloads = [{"repository": f"repo-{index}", "seq": index} for index in range(3)]
+
+    handled_events = await process_grouped_events(
+        mock_context, mock_port_app_config, monkeypatch, payloads
+    )
+
+    assert handled_events == [
+        (step, f"repo-{index}", index)
+        for index in range(3)
+        for step in ("start", "end")
+    ]
+
+
+@pytest.mark.asyncio
+async def test_processQueue_duplicateEventsWithinWindow_coalesced(
+    mock_context: PortOceanContext,
+    mock_port_app_config: PortAppConfig,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    payloads = [
+        {"repository": "repo-a", "seq": 0},
+        {"repository": "repo-b", "seq": 1},
+        {"repository": "repo-b", "seq": 1},
+        {"repository": "repo-b", "seq": 2},
+        {"repository": "repo-b", "seq": 1},
+    ]
+
+    handled_events = await process_grouped_events(
+        mock_context,
+        mock_port_app_config,
+        monkeypatch,
+        payloads,
+        event_coalescing_window_seconds=10,
+    )
+
+    assert [
+        (repository, seq) for step, repository, seq in handled_events if step == "end"
+    ] == [("repo-a", 0), ("repo-b", 1), ("repo-b", 2), ("repo-b", 1)]
+
+
+@pytest.mark.asyncio
+async def test_processQueue_eventGroupCantBeFound_eventDroppedAndCommitted(
+    mock_context: PortOceanContext,
+    mock_port_app_config: PortAppConfig,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    # The group of the first event raises a KeyError, as it has no repository
+    payloads: list[dict[str, Any]] = [{"seq": 0}, {"repository": "repo", "seq": 1}]
+
+    handled_events = await process_grouped_events(
+        mock_context, mock_port_app_config, monkeypatch, payloads
+    )
+
+    assert handled_events == [("start", "repo", 1), ("end", "repo", 1)]
+
+
+@pytest.mark.asyncio
+async def test_commitEvent_eventsProcessedOutOfOrder_committedInOrder(
+    processor_manager: LiveEventsProcessorManager,
+    mock_context: PortOceanContext,
+) -> None:
+    processor_manager.register_processor("/webhook-test", MockProcessor)
+    queue = MagicMock()
+    queue.commit = AsyncMock()
+    queue.size.return_value = 0
+    queue.oldest_item_age_seconds.return_value = None
+    processor_manager._event_queues["/webhook-test"] = queue
+    for sequence in range(3):
+        processor_manager._uncommitted_events["/webhook-test"][sequence] = False
+
+    await processor_manager._commit_event("/webhook-test", 1)
+    await processor_manager._commit_event("/webhook-test", 2)
+    assert queue.commit.await_count == 0
+
+    await processor_manager._commit_event("/webhook-test", 0)
+    assert queue.commit.await_count == 3
+    assert not processor_manager._uncommitted_events["/webhook-test"]
+
+
+@pytest.mark.asyncio
+async def test_processQueue_diskQueue_eventsProcessedAndCommitted(
+    mock_context: PortOceanContext,
+    mock_port_app_config: PortAppConfig,
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Any,
+) -> None:
+    monkeypatch.setattr(LiveEventsMixin, "sync_raw_results", AsyncMock())
+    monkeypatch.setattr(
+        HandlerMixin,
+        "port_app_config_handler",
+        AsyncMock(return_value=mock_port_app_config),
+    )
+    monkeypatch.setattr(EventContext, "port_app_config", mock_port_app_config)
+    mock_context.app.integration = BaseIntegration(ocean)
+    manager = LiveEventsProcessorManager(
+        APIRouter(),
+        SignalHandler(),
+        max_event_processing_seconds=3,
+        max_wait_seconds_before_shutdown=3,
+        event_queues_directory=str(tmp_path),
+    )
+    GroupedProcessor.handled_events = []
+    GroupedProcessor.release = asyncio.Event()
+    GroupedProcessor.release.set()
+    manager.register_processor("/webhook-test", GroupedProcessor)
+    await manager.start_processing_event_messages()
+
+    queue = manager._event_queues["/webhook-test"]
+    for index in range(3):
+        await queue.put(
+            WebhookEvent(
+                trace_id=str(index),
+                payload={"repository": "repo", "seq": index},
+                headers={},
+            )
+        )
+    await asyncio.wait_for(queue.teardown(), timeout=5)
+    await manager.shutdown()
+
+    assert [seq for step, _, seq in GroupedProcessor.handled_events] == [
+        0,
+        0,
+        1,
+        1,
+        2,
+        2,
+    ]
+    assert queue.size() == 0
+    assert list(tmp_path.iterdir())
+
+
+async def post_events_to_full_queue(
+    mock_context: PortOceanContext,
+    mock_port_app_config: PortAppConfig,
+    monkeypatch: pytest.MonkeyPatch,
+    queue_overflow_policy: LiveEventsOverflowPolicy,
+    number_of_events: int,
+) -> tuple[LiveEventsProcessorManager, list[Response]]:
+    monkeypatch.setattr(LiveEventsMixin, "sync_raw_results", AsyncMock())
+    monkeypatch.setattr(
+        HandlerMixin,
+        "port_app_config_handler",
+        AsyncMock(return_value=mock_port_app_config),
+    )
+    monkeypatch.setattr(EventContext, "port_app_config", mock_port_app_config)
+    mock_context.app.integration = BaseIntegration(ocean)
+    manager = LiveEventsProcessorManager(
+        APIRouter(),
+        SignalHandler(),
+        max_event_processing_seconds=3,
+        max_wait_seconds_before_shutdown=3,
+        max_queue_size=2,
+        queue_overflow_policy=queue_overflow_policy,
+        queue_retry_after_seconds=7,
+    )
+    GroupedProcessor.handled_events = []
+    GroupedProcessor.release = asyncio.Event()
+    GroupedProcessor.release.set()
+    manager.register_processor("/webhook-test", GroupedProcessor)
+    app = FastAPI()
+    app.include_router(manager._router)
+    client = TestClient(app)
+
+    responses = [
+        client.post("/webhook-test", json={"repository": "repo", "seq": index})
+        for index in range(number_of_events)
+    ]
+    return manager, responses
+
+
+async def process_queued_events(manager: LiveEventsProcessorManager) -> None:
+    await manager.start_processing_event_messages()
+    await asyncio.wait_for(manager._event_queues["/webhook-test"].teardown(), 5)
+    await manager.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_handleWebhook_queueFullWithRejectPolicy_rejectedWithRetryAfter(
+    mock_context: PortOceanContext,
+    mock_port_app_config: PortAppConfig,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    manager, responses = await post_events_to_full_queue(
+        mock_context,
+        mock_port_app_config,
+        monkeypatch,
+        LiveEventsOverflowPolicy.reject,
+        number_of_events=3,
+    )
+
+    assert [response.status_code for response in responses] == [200, 200, 429]
+    assert responses[2].headers["Retry-After"] == "7"
+    assert manager._event_queues["/webhook-test"].size() == 2
+    assert "live_events_shed_count" in mock_context.app.metrics.generate_latest()
+
+    await process_queued_events(manager)
+    assert [seq for step, _, seq in GroupedProcessor.handled_events] == [0, 0, 1, 1]
+
+
+@pytest.mark.asyncio
+async def test_handleWebhook_queueFullWithDropOldestPolicy_oldestEventDropped(
+    mock_context: PortOceanContext,
+    mock_port_app_config: PortAppConfig,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    manager, responses = await post_events_to_full_queue(
+        mock_context,
+        mock_port_app_config,
+        monkeypatch,
+        LiveEventsOverflowPolicy.drop_oldest,
+        number_of_events=3,
+    )
+
+    assert [response.status_code for response in responses] == [200, 200, 200]
+    assert manager._event_queues["/webhook-test"].size() <= 2
+
+    await process_queued_events(manager)
+    assert [seq for step, _, seq in GroupedProcessor.handled_events] == [1, 1, 2, 2]
+
+
+@pytest.mark.asyncio
+async def test_handleWebhook_queueFullWithDirtyKindsPolicy_kindsResyncedOnceDrained(
+    mock_context: PortOceanContext,
+    mock_port_app_config: PortAppConfig,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    manager, responses = await post_events_to_full_queue(
+        mock_context,
+        mock_port_app_config,
+        monkeypatch,
+        LiveEventsOverflowPolicy.dirty_kinds,
+        number_of_events=3,
+    )
+    sync_raw_kinds = AsyncMock()
+    monkeypatch.setattr(mock_context.app.integration, "sync_raw_kinds", sync_raw_kinds)
+
+    assert [response.status_code for response in responses] == [200, 200, 200]
+    assert manager._dirty_kinds == {"repository"}
+
+    await manager.start_processing_event_messages()
+    await asyncio.wait_for(manager._event_queues["/webhook-test"].teardown(), 5)
+    assert manager._dirty_kinds_resync_task is not None
+    await manager._dirty_kinds_resync_task
+    await manager.shutdown()
+
+    assert [seq for step, _, seq in GroupedProcessor.handled_events] == [0, 0, 1, 1]
+    sync_raw_kinds.assert_awaited_once_with({"repository"})
+    assert not manager._dirty_kinds
@@ -0,0 +1,70 @@
+import pickle
+import tracemalloc
+
+from port_ocean.core.models import Entity, EntityRef
+from port_ocean.core.utils.utils import get_entity_key, get_port_diff
+
+
+def test_entity_ref_keeps_the_identifiers_of_the_related_entities() -> None:
+    entity = Entity(
+        identifier="service",
+        blueprint="service",
+        title="Service",
+        properties={"url": "https://example.com"},
+        relations={
+            "team": "platform",
+            "owners": ["a", "b"],
+            "repository": {"combinator": "and", "rules": []},
+        },
+    )
+
+    entity_ref = EntityRef.from_entity(entity)
+
+    assert entity_ref.relations == {
+        "team": "platform",
+        "owners": ["a", "b"],
+        "repository": None,
+    }
+    assert get_entity_key(entity_ref) == get_entity_key(entity)
+    assert entity_ref.to_entity() == Entity(
+        identifier="service", blueprint="service", relations=entity_ref.relations
+    )
+
+
+def test_entity_ref_without_relations() -> None:
+    entity_ref = EntityRef.from_entity(Entity(identifier="1", blueprint="service"))
+
+    assert entity_ref.relations == {}
+    assert not entity_ref.is_using_search_identifier
+    assert pickle.loads(pickle.dumps(entity_ref)) == entity_ref
+
+
+def test_get_port_diff_of_entity_refs() -> None:
+    diff = get_port_diff(
+        [EntityRef("1", "service"), EntityRef("2", "service")],
+        [EntityRef("2", "service"), EntityRef("3", "service")],
+    )
+
+    assert diff.deleted == [EntityRef("1", "service")]
+    assert diff.modified == [EntityRef("2", "service")]
+    assert diff.created == [EntityRef("3", "service")]
+
+
+def test_entity_ref_takes_less_memory_than_a_reduced_entity() -> None:
+    identifiers = [str(index) for index in range(10_000)]
+
+    tracemalloc.start()
+    entities = [
+        Entity(identifier=identifier, blueprint="service") for identifier in identifiers
+    ]
+    entities_memory, _ = tracemalloc.get_traced_memory()
+    del entities
+    tracemalloc.stop()
+
+    tracemalloc.start()
+    entity_refs = [EntityRef(identifier, "service") for identifier in identifiers]
+    entity_refs_memory, _ = tracemalloc.get_traced_memory()
+    del entity_refs
+    tracemalloc.stop()
+
+    assert entity_refs_memory * 5 < entities_memory
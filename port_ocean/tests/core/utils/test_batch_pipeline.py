@@ -0,0 +1,118 @@
+import asyncio
+from typing import AsyncIterator
+
+import pytest
+
+from port_ocean.core.utils.batch_pipeline import BatchPipeline
+
+
+async def generate(name: str, count: int) -> AsyncIterator[str]:
+    for index in range(count):
+        await asyncio.sleep(0)
+        yield f"{name}-{index}"
+
+
+async def test_run_loads_batches_in_order_with_a_worker_per_stage() -> None:
+    loaded: list[str] = []
+
+    async def transform(batch: str) -> str:
+        return batch.upper()
+
+    async def load(batch: str) -> None:
+        loaded.append(batch)
+
+    pipeline = BatchPipeline(transform, load, queue_size=2)
+    await pipeline.run([generate("a", 3), generate("b", 2)])
+
+    assert loaded == ["A-0", "A-1", "A-2", "B-0", "B-1"]
+
+
+async def test_run_bounds_the_batches_waiting_between_stages() -> None:
+    extracted = 0
+    release_load = asyncio.Event()
+
+    async def counting_generator() -> AsyncIterator[int]:
+        nonlocal extracted
+        for index in range(10):
+            extracted += 1
+            yield index
+
+    async def transform(batch: int) -> int:
+        return batch
+
+    async def load(batch: int) -> None:
+        await release_load.wait()
+
+    pipeline = BatchPipeline(transform, load, queue_size=1)
+    run_task = asyncio.create_task(pipeline.run([counting_generator()]))
+    await asyncio.sleep(0.01)
+
+    # One batch is loading, one waits for the load stage, one is transformed and one waits for the transform stage
+    assert extracted <= 5
+    release_load.set()
+    await run_task
+    assert extracted == 10
+
+
+async def test_run_transforms_batches_concurrently() -> None:
+    in_flight = 0
+    max_in_flight = 0
+    loaded: list[str] = []
+
+    async def transform(batch: str) -> str:
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return batch
+
+    async def load(batch: str) -> None:
+        loaded.append(batch)
+
+    pipeline = BatchPipeline(transform, load, queue_size=4, transform_concurrency=3)
+    await pipeline.run([generate("a", 6)])
+
+    assert max_in_flight == 3
+    assert sorted(loaded) == [f"a-{index}" for index in range(6)]
+
+
+async def test_run_raises_the_error_of_a_stage_and_cancels_the_rest() -> None:
+    async def endless_generator() -> AsyncIterator[int]:
+        index = 0
+        while True:
+            yield index
+            index += 1
+
+    async def transform(batch: int) -> int:
+        return batch
+
+    async def load(batch: int) -> None:
+        if batch == 3:
+            raise ValueError("load failed")
+
+    pipeline = BatchPipeline(transform, load, queue_size=1)
+    with pytest.raises(ExceptionGroup) as error:
+        await asyncio.wait_for(pipeline.run([endless_generator()]), 1)
+
+    assert [str(inner) for inner in error.value.exceptions] == ["load failed"]
+
+
+async def test_run_reports_the_idle_time_of_every_stage() -> None:
+    updates: dict[str, tuple[int, float]] = {}
+
+    async def transform(batch: str) -> str:
+        return batch
+
+    async def load(batch: str) -> None:
+        await asyncio.sleep(0.01)
+
+    def on_stage_update(stage: str, waiting: int, idle_seconds: float) -> None:
+        updates[stage] = (waiting, idle_seconds)
+
+    pipeline = BatchPipeline(transform, load, on_stage_update=on_stage_update)
+    await pipeline.run([generate("a", 10)])
+
+    assert set(updates) == {"extract", "transform", "load"}
+    # The load stage is the bottleneck, so the extract stage waits for it more than the load stage waits for batches
+    assert pipeline.idle_seconds["extract"] > pipeline.idle_seconds["load"]
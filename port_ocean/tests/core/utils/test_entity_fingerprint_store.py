@@ -0,0 +1,109 @@
+from pathlib import Path
+from unittest.mock import patch
+
+from port_ocean.core.models import Entity
+from port_ocean.core.utils.entity_fingerprint_store import EntityFingerprintStore
+from port_ocean.core.utils.generated_entities_store import GeneratedEntitiesStore
+
+
+def create_entity(identifier: str, title: str = "title") -> Entity:
+    return Entity(
+        identifier=identifier,
+        blueprint="service",
+        title=title,
+        properties={"name": identifier},
+    )
+
+
+def test_filter_changed_skips_recorded_entities(tmp_path: Path) -> None:
+    store = EntityFingerprintStore(tmp_path / "fingerprints.sqlite")
+    entities = [create_entity(str(index)) for index in range(1000)]
+
+    assert store.filter_changed(entities) == entities
+
+    store.record(entities)
+    changed_entity = create_entity("1", title="new title")
+    new_entity = create_entity("new")
+
+    assert store.filter_changed([*entities, changed_entity, new_entity]) == [
+        changed_entity,
+        new_entity,
+    ]
+
+
+def test_filter_changed_keeps_search_identifier_entities(tmp_path: Path) -> None:
+    store = EntityFingerprintStore(tmp_path / "fingerprints.sqlite")
+    entity = Entity(
+        identifier={"combinator": "and", "rules": []},
+        blueprint="service",
+        title="title",
+    )
+
+    store.record([entity])
+
+    assert store.filter_changed([entity]) == [entity]
+
+
+def test_store_is_persisted(tmp_path: Path) -> None:
+    entities = [create_entity("1"), create_entity("2")]
+    EntityFingerprintStore(tmp_path / "fingerprints.sqlite").record(entities)
+
+    store = EntityFingerprintStore(tmp_path / "fingerprints.sqlite")
+
+    assert store.filter_changed(entities) == []
+
+
+def test_forget_and_retain(tmp_path: Path) -> None:
+    store = EntityFingerprintStore(tmp_path / "fingerprints.sqlite")
+    entities = [create_entity(str(index)) for index in range(4)]
+    store.record(entities)
+
+    store.forget([entities[0]])
+    store.retain([entities[1], entities[2]])
+
+    assert store.filter_changed(entities) == [entities[0], entities[3]]
+
+
+def test_retain_streams_the_existing_entities(tmp_path: Path) -> None:
+    store = EntityFingerprintStore(tmp_path / "fingerprints.sqlite")
+    entities = [create_entity(str(index)) for index in range(2000)]
+    store.record(entities)
+
+    # The entities in Port are passed as a generator, and the store can be retained again afterwards
+    store.retain(entity for entity in entities if int(entity.identifier) % 2 == 0)
+    store.retain(entity for entity in entities if int(entity.identifier) % 4 == 0)
+
+    assert store.filter_changed(entities) == [
+        entity for entity in entities if int(entity.identifier) % 4 != 0
+    ]
+
+
+def test_retain_database_entities(tmp_path: Path) -> None:
+    store = EntityFingerprintStore(tmp_path / "fingerprints.sqlite")
+    generated_entities_store = GeneratedEntitiesStore(
+        tmp_path / "reconciliation.sqlite"
+    )
+    entities = [create_entity(str(index)) for index in range(4)]
+    store.record(entities)
+    generated_entities_store.add_port_entities([entities[1], entities[2]])
+
+    store.retain_database_entities(generated_entities_store.path, "port_entities")
+
+    assert store.filter_changed(entities) == [entities[0], entities[3]]
+
+
+def test_reconcile_if_due(tmp_path: Path) -> None:
+    store = EntityFingerprintStore(
+        tmp_path / "fingerprints.sqlite", reconcile_interval=60
+    )
+    entities = [create_entity("1")]
+
+    with patch("time.time", return_value=1000):
+        assert store.reconcile_if_due() is True
+        store.record(entities)
+    with patch("time.time", return_value=1030):
+        assert store.reconcile_if_due() is False
+        assert store.filter_changed(entities) == []
+    with patch("time.time", return_value=1060):
+        assert store.reconcile_if_due() is True
+        assert store.filter_changed(entities) == entities
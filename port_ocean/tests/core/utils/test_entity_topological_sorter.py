@@ -1,6 +1,10 @@
+from typing import Any
+
+import pytest
 from port_ocean.core.models import Entity
 from port_ocean.core.utils.entity_topological_sorter import EntityTopologicalSorter
 from unittest.mock import MagicMock
+from port_ocean.tests.core.conftest import CountingEntity
 from port_ocean.exceptions.core import (
     OceanAbortException,
 )
@@ -97,3 +101,84 @@ def test_handle_failed_with_circular_dependencies() -> None:
             e.args[0]
             == "Cannot order entities due to cyclic dependencies. \nIf you do want to have cyclic dependencies, please make sure to set the keys 'createMissingRelatedEntities' and 'deleteDependentEntities' in the integration config in Port."
         )
+
+
+def test_get_dependency_levels() -> None:
+    entity_a = create_entity("entity_a", "buleprint_a")
+    entity_b = create_entity("entity_b", "buleprint_a", {"dep_name_1": "entity_a"})
+    entity_c = create_entity("entity_c", "buleprint_b", {"dep_name_2": "entity_b"})
+    entity_d = create_entity("entity_d", "buleprint_b", {"dep_name_2": "entity_a"})
+    entity_e = create_entity("entity_e", "buleprint_b")
+
+    levels = EntityTopologicalSorter.get_dependency_levels(
+        [entity_c, entity_d, entity_b, entity_e, entity_a]
+    )
+
+    assert [sorted(entity.identifier for entity in level) for level in levels] == [
+        ["entity_a", "entity_e"],
+        ["entity_b", "entity_d"],
+        ["entity_c"],
+    ]
+
+
+def test_get_dependency_levels_with_cycle() -> None:
+    entity_a = create_entity("entity_a", "buleprint_a", {"dep_name_1": "entity_b"})
+    entity_b = create_entity("entity_b", "buleprint_a", {"dep_name_1": "entity_a"})
+
+    with pytest.raises(OceanAbortException):
+        EntityTopologicalSorter.get_dependency_levels([entity_a, entity_b])
+
+
+def test_get_entities_levels() -> None:
+    entity_a = create_entity("entity_a", "buleprint_a")
+    entity_b = create_entity("entity_b", "buleprint_a", {"dep_name_1": "entity_a"})
+    entity_c = create_entity("entity_c", "buleprint_b", {"dep_name_2": "entity_a"})
+
+    entity_topological_sort = EntityTopologicalSorter()
+    entity_topological_sort.register_entity(entity_c)
+    entity_topological_sort.register_entity(entity_b)
+    entity_topological_sort.register_entity(entity_a)
+
+    assert [
+        sorted(entity.identifier for entity in level)
+        for level in entity_topological_sort.get_entities_levels()
+    ] == [["entity_a"], ["entity_b", "entity_c"]]
+
+
+def test_relation_targets_relate_entities_of_the_target_blueprint_only() -> None:
+    service = create_entity("shared", "service")
+    team = create_entity("shared", "team")
+    user = create_entity("user", "user", {"team": "shared"})
+
+    levels = EntityTopologicalSorter.get_dependency_levels(
+        [user, service, team], relation_targets={("user", "team"): "team"}
+    )
+
+    assert [
+        sorted(f"{entity.identifier}-{entity.blueprint}" for entity in level)
+        for level in levels
+    ] == [["shared-service", "shared-team"], ["user-user"]]
+
+
+def test_order_by_entities_dependencies_scales_linearly(
+    counting_entity: type[CountingEntity],
+) -> None:
+    number_of_entities = 100_000
+    # Every entity relates to the previous one and to the first one, forming a long dependency chain
+    entities: list[Any] = [
+        counting_entity(
+            f"entity_{index}",
+            "service",
+            {"parent": f"entity_{index - 1}", "root": ["entity_0"]},
+        )
+        for index in range(number_of_entities)
+    ]
+    counting_entity.identifier_reads = 0
+
+    ordered_entities = EntityTopologicalSorter.order_by_entities_dependencies(entities)
+
+    assert ordered_entities[0].identifier == "entity_0"
+    assert ordered_entities[-1].identifier == f"entity_{number_of_entities - 1}"
+    # The related entities are looked up by their identifier instead of comparing them with every entity,
+    # which would read the identifiers number_of_entities times per relation
+    assert counting_entity.identifier_reads < number_of_entities * 5
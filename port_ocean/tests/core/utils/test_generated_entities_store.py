@@ -0,0 +1,101 @@
+from pathlib import Path
+
+from port_ocean.core.models import Entity
+from port_ocean.core.utils.generated_entities_store import GeneratedEntitiesStore
+
+
+def get_keys(batches: list[list[Entity]]) -> list[tuple[str, str]]:
+    return [
+        (entity.blueprint, entity.identifier) for batch in batches for entity in batch
+    ]
+
+
+def test_iter_deleted_entities_returns_port_entities_that_were_not_generated(
+    tmp_path: Path,
+) -> None:
+    store = GeneratedEntitiesStore(tmp_path / "reconciliation.sqlite")
+    store.add_generated_entities(
+        Entity(identifier=str(index), blueprint="service") for index in range(0, 100, 2)
+    )
+    store.add_port_entities(
+        Entity(identifier=str(index), blueprint="service") for index in range(100)
+    )
+    store.add_port_entities([Entity(identifier="1", blueprint="repository")])
+
+    batches = list(store.iter_deleted_entities(batch_size=7))
+
+    assert all(len(batch) <= 7 for batch in batches)
+    assert get_keys(batches) == [("repository", "1")] + sorted(
+        ("service", str(index)) for index in range(1, 100, 2)
+    )
+    assert store.count_port_entities() == 101
+    assert store.count_generated_entities() == 50
+    assert store.count_deleted_entities() == 51
+
+
+def test_add_generated_entities_from_multiple_batches_ignores_duplicates(
+    tmp_path: Path,
+) -> None:
+    store = GeneratedEntitiesStore(tmp_path / "reconciliation.sqlite")
+    entities = [Entity(identifier="1", blueprint="service")]
+
+    store.add_generated_entities(entities)
+    store.add_generated_entities(entities)
+
+    assert store.count_generated_entities() == 1
+
+
+def test_search_identifier_entities_are_not_stored(tmp_path: Path) -> None:
+    store = GeneratedEntitiesStore(tmp_path / "reconciliation.sqlite")
+    entity = Entity(
+        identifier={"combinator": "and", "rules": []},
+        blueprint="service",
+    )
+
+    store.add_generated_entities([entity])
+    store.add_port_entities([entity])
+
+    assert store.count_generated_entities() == 0
+    assert store.count_port_entities() == 0
+
+
+def test_related_entities_are_excluded_from_deletion(tmp_path: Path) -> None:
+    store = GeneratedEntitiesStore(tmp_path / "reconciliation.sqlite")
+    store.add_generated_entities(
+        [
+            Entity(
+                identifier="service",
+                blueprint="service",
+                relations={"owners": ["team-a", "team-b"], "repository": "repo"},
+            )
+        ]
+    )
+    store.add_port_entities(
+        [
+            Entity(identifier="team-a", blueprint="team"),
+            Entity(identifier="team-c", blueprint="team"),
+            Entity(identifier="repo", blueprint="repository"),
+        ]
+    )
+
+    assert sorted(store.get_relations()) == [
+        ("service", "owners"),
+        ("service", "repository"),
+    ]
+    store.add_related_entities({("service", "owners"): "team"})
+
+    assert get_keys(list(store.iter_deleted_entities(exclude_related=True))) == [
+        ("repository", "repo"),
+        ("team", "team-c"),
+    ]
+    assert store.count_deleted_entities() == 3
+    assert store.count_deleted_entities(exclude_related=True) == 2
+
+
+def test_remove_deletes_the_database(tmp_path: Path) -> None:
+    store = GeneratedEntitiesStore(tmp_path / "reconciliation.sqlite")
+    store.add_port_entities([Entity(identifier="1", blueprint="service")])
+
+    store.remove()
+
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,181 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from port_ocean.core.handlers.port_app_config.models import (
+    EntityMapping,
+    MappingsConfig,
+    PortResourceConfig,
+    ResourceConfig,
+    Selector,
+)
+from port_ocean.core.models import Blueprint, BlueprintRelation
+from port_ocean.core.utils.resource_scheduler import (
+    ResourceScheduler,
+    get_static_blueprint,
+    resolve_resources_dependencies,
+)
+
+
+def create_resource(kind: str, blueprint: str) -> ResourceConfig:
+    return ResourceConfig(
+        kind=kind,
+        selector=Selector(query="true"),
+        port=PortResourceConfig(
+            entity=MappingsConfig(
+                mappings=EntityMapping(
+                    identifier=".id",
+                    title=".name",
+                    blueprint=blueprint,
+                    properties={},
+                    relations={},
+                )
+            )
+        ),
+    )
+
+
+def create_blueprint(identifier: str, targets: list[str]) -> Blueprint:
+    return Blueprint(
+        identifier=identifier,
+        title=identifier,
+        team=None,
+        schema={},
+        relations={
+            target: BlueprintRelation(
+                many=False, required=False, target=target, title=target
+            )
+            for target in targets
+        },
+    )
+
+
+def create_port_client(blueprints: list[Blueprint]) -> MagicMock:
+    blueprints_by_identifier = {
+        blueprint.identifier: blueprint for blueprint in blueprints
+    }
+
+    async def get_blueprint(identifier: str, should_log: bool = True) -> Blueprint:
+        return blueprints_by_identifier[identifier]
+
+    port_client = MagicMock()
+    port_client.get_blueprint = AsyncMock(side_effect=get_blueprint)
+    return port_client
+
+
+def test_get_static_blueprint() -> None:
+    assert get_static_blueprint(create_resource("repo", '"service"')) == "service"
+    assert get_static_blueprint(create_resource("repo", ".blueprint")) is None
+    assert get_static_blueprint(create_resource("repo", '"a" + "b"')) is None
+
+
+@pytest.mark.asyncio
+async def test_resolve_resources_dependencies_by_blueprint_relations() -> None:
+    resources = [
+        create_resource("repository", '"service"'),
+        create_resource("issue", '"issue"'),
+        create_resource("team", '"team"'),
+        create_resource("pull-request", '"pullRequest"'),
+        create_resource("other-repository", '"service"'),
+    ]
+    port_client = create_port_client(
+        [
+            create_blueprint("service", []),
+            create_blueprint("issue", []),
+            create_blueprint("team", []),
+            create_blueprint("pullRequest", ["service"]),
+        ]
+    )
+
+    dependencies = await resolve_resources_dependencies(resources, port_client)
+
+    assert dependencies == {
+        0: set(),
+        1: set(),
+        2: set(),
+        3: {0},
+        4: {0, 3},
+    }
+
+
+@pytest.mark.asyncio
+async def test_resolve_resources_dependencies_unknown_blueprint() -> None:
+    resources = [
+        create_resource("repository", '"service"'),
+        create_resource("issue", ".blueprint"),
+        create_resource("team", '"team"'),
+    ]
+    port_client = create_port_client(
+        [create_blueprint("service", []), create_blueprint("team", [])]
+    )
+
+    dependencies = await resolve_resources_dependencies(resources, port_client)
+
+    assert dependencies == {0: set(), 1: {0}, 2: {1}}
+
+
+@pytest.mark.asyncio
+async def test_resolve_resources_dependencies_failed_blueprint_fetch() -> None:
+    resources = [
+        create_resource("repository", '"service"'),
+        create_resource("team", '"team"'),
+    ]
+    port_client = MagicMock()
+    port_client.get_blueprint = AsyncMock(side_effect=Exception("Port is down"))
+
+    dependencies = await resolve_resources_dependencies(resources, port_client)
+
+    assert dependencies == {0: set(), 1: {0}}
+
+
+@pytest.mark.asyncio
+async def test_resource_scheduler_respects_concurrency_and_dependencies() -> None:
+    resources = [create_resource(f"kind-{index}", '"service"') for index in range(4)]
+    running: set[int] = set()
+    max_running = 0
+    finished_order: list[int] = []
+
+    async def process(resource: ResourceConfig, index: int) -> int:
+        nonlocal max_running
+        running.add(index)
+        max_running = max(max_running, len(running))
+        # The first resource is the slowest, so independent resources finish before it
+        await asyncio.sleep(0.05 if index == 0 else 0.01)
+        running.discard(index)
+        finished_order.append(index)
+        return index
+
+    scheduler: ResourceScheduler[int] = ResourceScheduler(
+        resources, {0: set(), 1: set(), 2: set(), 3: {0}}, concurrency=2
+    )
+    results = await scheduler.run(process)
+
+    assert results == [0, 1, 2, 3]
+    assert max_running == 2
+    assert finished_order.index(3) > finished_order.index(0)
+    assert finished_order.index(1) < finished_order.index(0)
+
+
+@pytest.mark.asyncio
+async def test_resource_scheduler_cancels_remaining_resources_on_failure() -> None:
+    resources = [create_resource(f"kind-{index}", '"service"') for index in range(3)]
+    cancelled: list[int] = []
+
+    async def process(resource: ResourceConfig, index: int) -> int:
+        if index == 0:
+            raise ValueError("Failed to process resource")
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(index)
+            raise
+        return index
+
+    scheduler: ResourceScheduler[int] = ResourceScheduler(
+        resources, {0: set(), 1: set(), 2: set()}, concurrency=3
+    )
+    with pytest.raises(ValueError):
+        await scheduler.run(process)
+
+    assert sorted(cancelled) == [1, 2]
@@ -0,0 +1,199 @@
+import gzip
+from pathlib import Path
+
+import httpx
+
+from port_ocean.helpers.async_client import OceanAsyncClient
+from port_ocean.helpers.response_cache import (
+    ConditionalRequestTransport,
+    HttpResponseCacheStore,
+)
+
+
+class FakeServer:
+    """Answers conditional requests with 304 as long as the content of the url didn't change"""
+
+    def __init__(self) -> None:
+        self.version = 1
+        self.requests: list[httpx.Request] = []
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        etag = f'"v{self.version}"'
+        if request.headers.get("if-none-match") == etag:
+            return httpx.Response(
+                304, headers={"ETag": etag, "X-RateLimit-Remaining": "99"}
+            )
+        return httpx.Response(
+            200,
+            headers={"ETag": etag, "Content-Encoding": "gzip"},
+            content=gzip.compress(f'{{"version": {self.version}}}'.encode()),
+        )
+
+
+def create_client(
+    server: FakeServer, store: HttpResponseCacheStore
+) -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        transport=ConditionalRequestTransport(httpx.MockTransport(server.handle), store)
+    )
+
+
+async def test_not_modified_responses_are_served_from_the_store(tmp_path: Path) -> None:
+    server = FakeServer()
+    store = HttpResponseCacheStore(tmp_path / "http_responses.sqlite")
+
+    async with create_client(server, store) as client:
+        first_response = await client.get("https://api.example.com/projects")
+    # A new client, like in the next resync, reuses the stored response
+    async with create_client(server, store) as client:
+        second_response = await client.get("https://api.example.com/projects")
+
+    assert "if-none-match" not in server.requests[0].headers
+    assert server.requests[1].headers["if-none-match"] == '"v1"'
+    assert first_response.json() == second_response.json() == {"version": 1}
+    assert second_response.status_code == 200
+    assert second_response.headers["x-ratelimit-remaining"] == "99"
+
+
+async def test_modified_responses_replace_the_stored_response(tmp_path: Path) -> None:
+    server = FakeServer()
+    store = HttpResponseCacheStore(tmp_path / "http_responses.sqlite")
+
+    async with create_client(server, store) as client:
+        await client.get("https://api.example.com/projects")
+        server.version = 2
+        modified_response = await client.get("https://api.example.com/projects")
+        not_modified_response = await client.get("https://api.example.com/projects")
+
+    assert modified_response.json() == {"version": 2}
+    assert not_modified_response.json() == {"version": 2}
+    assert server.requests[2].headers["if-none-match"] == '"v2"'
+
+
+async def test_responses_are_stored_per_url_and_credentials(tmp_path: Path) -> None:
+    server = FakeServer()
+    store = HttpResponseCacheStore(tmp_path / "http_responses.sqlite")
+
+    async with create_client(server, store) as client:
+        await client.get("https://api.example.com/projects", params={"page": 1})
+        await client.get("https://api.example.com/projects", params={"page": 2})
+        await client.get(
+            "https://api.example.com/projects",
+            params={"page": 1},
+            headers={"Authorization": "Bearer other-token"},
+        )
+
+    assert all("if-none-match" not in request.headers for request in server.requests)
+
+
+async def test_responses_are_stored_per_credential_header(tmp_path: Path) -> None:
+    server = FakeServer()
+    store = HttpResponseCacheStore(tmp_path / "http_responses.sqlite")
+
+    async with create_client(server, store) as client:
+        await client.get(
+            "https://gitlab.example.com/api/v4/projects",
+            headers={"PRIVATE-TOKEN": "first-token"},
+        )
+        await client.get(
+            "https://gitlab.example.com/api/v4/projects",
+            headers={"PRIVATE-TOKEN": "second-token"},
+        )
+        await client.get(
+            "https://gitlab.example.com/api/v4/projects",
+            headers={"PRIVATE-TOKEN": "first-token"},
+        )
+
+    assert [request.headers.get("if-none-match") for request in server.requests] == [
+        None,
+        None,
+        '"v1"',
+    ]
+
+
+async def test_responses_are_served_only_to_requests_of_the_same_vary_values(
+    tmp_path: Path,
+) -> None:
+    requests: list[httpx.Request] = []
+
+    def handle(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        etag = f'"{request.headers.get("x-tenant", "")}"'
+        if request.headers.get("if-none-match") == etag:
+            return httpx.Response(304, headers={"ETag": etag})
+        return httpx.Response(
+            200,
+            headers={"ETag": etag, "Vary": "X-Tenant, Accept"},
+            json={"tenant": request.headers.get("x-tenant")},
+        )
+
+    store = HttpResponseCacheStore(tmp_path / "http_responses.sqlite")
+    async with httpx.AsyncClient(
+        transport=ConditionalRequestTransport(httpx.MockTransport(handle), store)
+    ) as client:
+        first_response = await client.get(
+            "https://api.example.com/projects", headers={"X-Tenant": "first"}
+        )
+        second_response = await client.get(
+            "https://api.example.com/projects", headers={"X-Tenant": "second"}
+        )
+        third_response = await client.get(
+            "https://api.example.com/projects", headers={"X-Tenant": "second"}
+        )
+
+    assert first_response.json() == {"tenant": "first"}
+    assert second_response.json() == {"tenant": "second"}
+    assert third_response.json() == {"tenant": "second"}
+    assert [request.headers.get("if-none-match") for request in requests] == [
+        None,
+        None,
+        '"second"',
+    ]
+
+
+async def test_uncacheable_requests_are_passed_through(tmp_path: Path) -> None:
+    server = FakeServer()
+    store = HttpResponseCacheStore(tmp_path / "http_responses.sqlite")
+
+    async with create_client(server, store) as client:
+        await client.post("https://api.example.com/graphql", json={})
+        await client.post("https://api.example.com/graphql", json={})
+        await client.get("https://api.example.com/projects")
+        response = await client.get(
+            "https://api.example.com/projects", headers={"If-None-Match": '"v1"'}
+        )
+
+    assert "if-none-match" not in server.requests[1].headers
+    # Requests that are already conditional get the 304 response of the server
+    assert response.status_code == 304
+
+
+async def test_unused_responses_are_removed_after_their_max_age(tmp_path: Path) -> None:
+    server = FakeServer()
+    path = tmp_path / "http_responses.sqlite"
+
+    async with create_client(server, HttpResponseCacheStore(path)) as client:
+        await client.get("https://api.example.com/projects")
+
+    store = HttpResponseCacheStore(path, max_age_seconds=60)
+    key = store.get_key(server.requests[0])
+    assert store.get(key) is not None
+
+    with store._connect() as connection:
+        connection.execute("UPDATE http_responses SET used_at = 0")
+
+    store = HttpResponseCacheStore(path, max_age_seconds=60)
+    assert store.get(key) is None
+
+
+def test_ocean_async_client_wraps_its_transport_with_the_response_cache(
+    tmp_path: Path,
+) -> None:
+    store = HttpResponseCacheStore(tmp_path / "http_responses.sqlite")
+
+    assert isinstance(
+        OceanAsyncClient(response_cache_store=store)._transport,
+        ConditionalRequestTransport,
+    )
+    assert not isinstance(OceanAsyncClient()._transport, ConditionalRequestTransport)
@@ -1,6 +1,13 @@
 import ast
+import asyncio
+from unittest.mock import MagicMock
+
 import pytest
 
+from port_ocean.config.settings import IntegrationSettings, MetricsSettings
+from port_ocean.context.metric_resource import metric_resource_context
+from port_ocean.helpers.metric.metric import Metrics, SyncState
+
 
 @pytest.mark.metric
 @pytest.mark.skip(reason="Skipping metric test until we have a way to test the metrics")
@@ -178,3 +185,32 @@ def test_metrics() -> None:
         assert (
             obj.get(key, 0) == expected_val
         ), f"Expected {expected_val} for '{key}', got {obj.get(key)}"
+
+
+async def test_sync_state_is_kept_per_resource_kind() -> None:
+    """Test that resources that are synced concurrently don't overwrite each other's sync state."""
+    metrics = Metrics(
+        metrics_settings=MetricsSettings(enabled=True),
+        integration_configuration=IntegrationSettings(type="test", identifier="test"),
+        port_client=MagicMock(),
+    )
+    first_resource_failed = asyncio.Event()
+
+    async def sync_failing_resource() -> None:
+        async with metric_resource_context("repository", 0):
+            metrics.sync_state = SyncState.SYNCING
+            metrics.sync_state = SyncState.FAILED
+            first_resource_failed.set()
+            await asyncio.sleep(0.01)
+            assert metrics.sync_state == SyncState.FAILED
+
+    async def sync_completed_resource() -> None:
+        async with metric_resource_context("project", 1):
+            await first_resource_failed.wait()
+            metrics.sync_state = SyncState.SYNCING
+            metrics.sync_state = SyncState.COMPLETED
+
+    await asyncio.gather(sync_failing_resource(), sync_completed_resource())
+
+    assert metrics.get_sync_state("repository") == SyncState.FAILED
+    assert metrics.get_sync_state("project") == SyncState.COMPLETED
@@ -5,7 +5,10 @@ import pytest
 from typing import AsyncGenerator, AsyncIterator, List, TypeVar
 from unittest.mock import AsyncMock
 from port_ocean.cache.errors import FailedToReadCacheError, FailedToWriteCacheError
+from port_ocean.cache.disk import DiskCacheProvider
+from port_ocean.cache.lru import LRUCacheProvider, estimate_size_in_bytes
 from port_ocean.cache.memory import InMemoryCacheProvider
+from port_ocean.context.event import EventType, event_context
 
 
 @pytest.fixture
@@ -272,3 +275,262 @@ async def test_cache_failures_dont_affect_execution(
     # Verify that both read and write errors were raised
     assert isinstance(mock_cache_provider.get.side_effect, FailedToReadCacheError)
     assert isinstance(mock_cache_provider.set.side_effect, FailedToWriteCacheError)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("storage", ["memory", "disk"])
+async def test_cache_iterator_result_replays_the_original_pages(
+    mock_ocean: Any, monkeypatch: Any, tmp_path: Any, storage: str
+) -> None:
+    if storage == "disk":
+        mock_ocean.app.cache_provider = DiskCacheProvider(cache_dir=str(tmp_path))
+    monkeypatch.setattr(cache, "ocean", mock_ocean)
+
+    call_count = 0
+
+    @cache.cache_iterator_result()
+    async def sample_iterator(x: int) -> AsyncGenerator[List[int], None]:
+        nonlocal call_count
+        call_count += 1
+        for i in range(x):
+            yield [i, i]
+
+    result1 = [page async for page in sample_iterator(3)]
+    result2 = [page async for page in sample_iterator(3)]
+
+    assert result1 == result2 == [[0, 0], [1, 1], [2, 2]]
+    assert call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_cache_iterator_result_doesnt_cache_an_interrupted_iteration(
+    mock_ocean: Any, monkeypatch: Any, tmp_path: Any
+) -> None:
+    mock_ocean.app.cache_provider = DiskCacheProvider(cache_dir=str(tmp_path))
+    monkeypatch.setattr(cache, "ocean", mock_ocean)
+
+    call_count = 0
+
+    @cache.cache_iterator_result()
+    async def failing_iterator() -> AsyncGenerator[List[int], None]:
+        nonlocal call_count
+        call_count += 1
+        yield [0]
+        if call_count == 1:
+            raise ValueError("fetch failed")
+        yield [1]
+
+    with pytest.raises(ValueError):
+        await collect_iterator_results(failing_iterator())
+
+    assert await collect_iterator_results(failing_iterator()) == [0, 1]
+    assert await collect_iterator_results(failing_iterator()) == [0, 1]
+    assert call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_cache_coroutine_result_coalesces_concurrent_calls(
+    mock_ocean: Any, monkeypatch: Any
+) -> None:
+    monkeypatch.setattr(cache, "ocean", mock_ocean)
+
+    call_count = 0
+
+    @cache.cache_coroutine_result()
+    async def sample_coroutine(x: int) -> int:
+        nonlocal call_count
+        call_count += 1
+        await asyncio.sleep(0.1)
+        return x * 2
+
+    results = await asyncio.gather(
+        *(sample_coroutine(2) for _ in range(5)), sample_coroutine(3)
+    )
+
+    assert results == [4, 4, 4, 4, 4, 6]
+    assert call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_cache_coroutine_result_keeps_the_call_running_when_a_caller_is_cancelled(
+    mock_ocean: Any, monkeypatch: Any
+) -> None:
+    monkeypatch.setattr(cache, "ocean", mock_ocean)
+
+    call_count = 0
+
+    @cache.cache_coroutine_result()
+    async def sample_coroutine(x: int) -> int:
+        nonlocal call_count
+        call_count += 1
+        await asyncio.sleep(0.1)
+        return x * 2
+
+    first_caller: asyncio.Future[int] = asyncio.ensure_future(sample_coroutine(2))
+    second_caller: asyncio.Future[int] = asyncio.ensure_future(sample_coroutine(2))
+    await asyncio.sleep(0.01)
+    first_caller.cancel()
+
+    assert await second_caller == 4
+    assert first_caller.cancelled()
+    assert call_count == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("storage", ["memory", "disk"])
+async def test_cache_iterator_result_fans_out_concurrent_iterations(
+    mock_ocean: Any, monkeypatch: Any, tmp_path: Any, storage: str
+) -> None:
+    if storage == "disk":
+        mock_ocean.app.cache_provider = DiskCacheProvider(cache_dir=str(tmp_path))
+    monkeypatch.setattr(cache, "ocean", mock_ocean)
+
+    call_count = 0
+
+    @cache.cache_iterator_result()
+    async def sample_iterator(x: int) -> AsyncGenerator[List[int], None]:
+        nonlocal call_count
+        call_count += 1
+        for i in range(x):
+            await asyncio.sleep(0.01)
+            yield [i]
+
+    results = await asyncio.gather(
+        *(collect_iterator_results(sample_iterator(3)) for _ in range(3))
+    )
+
+    assert results == [[0, 1, 2]] * 3
+    assert call_count == 1
+    # The shared iteration was cached once all of its consumers finished
+    assert await collect_iterator_results(sample_iterator(3)) == [0, 1, 2]
+    assert call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_cache_iterator_result_late_consumer_reads_the_cached_result(
+    mock_ocean: Any, monkeypatch: Any
+) -> None:
+    monkeypatch.setattr(cache, "ocean", mock_ocean)
+    monkeypatch.setattr(cache, "SHARED_ITERATION_MAX_BUFFERED_PAGES", 1)
+
+    call_count = 0
+
+    @cache.cache_iterator_result()
+    async def sample_iterator(x: int) -> AsyncGenerator[List[int], None]:
+        nonlocal call_count
+        call_count += 1
+        for i in range(x):
+            await asyncio.sleep(0.01)
+            yield [i]
+
+    first_iteration = sample_iterator(5)
+    assert await anext(first_iteration) == [0]
+    assert await anext(first_iteration) == [1]
+
+    # The first pages were already released, so the late consumer waits for the iteration to be cached
+    late_consumer = asyncio.create_task(collect_iterator_results(sample_iterator(5)))
+    assert [page async for page in first_iteration] == [[2], [3], [4]]
+
+    assert await late_consumer == [0, 1, 2, 3, 4]
+    assert call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_cache_iterator_result_propagates_errors_to_every_consumer(
+    mock_ocean: Any, monkeypatch: Any
+) -> None:
+    monkeypatch.setattr(cache, "ocean", mock_ocean)
+
+    @cache.cache_iterator_result()
+    async def failing_iterator() -> AsyncGenerator[List[int], None]:
+        await asyncio.sleep(0.01)
+        yield [0]
+        raise ValueError("fetch failed")
+
+    results = await asyncio.gather(
+        collect_iterator_results(failing_iterator()),
+        collect_iterator_results(failing_iterator()),
+        return_exceptions=True,
+    )
+
+    assert [str(result) for result in results] == ["fetch failed", "fetch failed"]
+
+
+@pytest.mark.asyncio
+async def test_cache_iterator_result_single_consumer_doesnt_read_ahead(
+    mock_ocean: Any, monkeypatch: Any
+) -> None:
+    monkeypatch.setattr(cache, "ocean", mock_ocean)
+
+    fetched_pages = 0
+
+    @cache.cache_iterator_result()
+    async def sample_iterator(x: int) -> AsyncGenerator[List[int], None]:
+        nonlocal fetched_pages
+        for i in range(x):
+            fetched_pages += 1
+            yield [i]
+
+    iteration = sample_iterator(5)
+    assert await anext(iteration) == [0]
+    await asyncio.sleep(0.05)
+    # The next page is fetched only once the consumer asks for it
+    assert fetched_pages == 1
+
+    assert await anext(iteration) == [1]
+    await asyncio.sleep(0.05)
+    assert fetched_pages == 2
+    assert [page async for page in iteration] == [[2], [3], [4]]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("storage", ["memory", "disk"])
+async def test_cache_iterator_result_bypasses_the_cache_in_events_that_ask_for_it(
+    mock_ocean: Any, monkeypatch: Any, tmp_path: Any, storage: str
+) -> None:
+    if storage == "disk":
+        mock_ocean.app.cache_provider = DiskCacheProvider(cache_dir=str(tmp_path))
+    monkeypatch.setattr(cache, "ocean", mock_ocean)
+
+    call_count = 0
+
+    @cache.cache_iterator_result()
+    async def sample_iterator() -> AsyncGenerator[List[int], None]:
+        nonlocal call_count
+        call_count += 1
+        yield [call_count]
+
+    assert await collect_iterator_results(sample_iterator()) == [1]
+    async with event_context(
+        EventType.RESYNC, attributes={cache.BYPASS_CACHE_ATTRIBUTE: True}
+    ):
+        assert await collect_iterator_results(sample_iterator()) == [2]
+
+    # The result of the call that bypassed the cache replaced the cached result
+    assert await collect_iterator_results(sample_iterator()) == [2]
+    assert call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_cache_iterator_result_stops_buffering_results_larger_than_the_cache(
+    mock_ocean: Any, monkeypatch: Any
+) -> None:
+    page = list(range(100))
+    mock_ocean.app.cache_provider = LRUCacheProvider(
+        max_size_in_bytes=estimate_size_in_bytes(page) * 2
+    )
+    monkeypatch.setattr(cache, "ocean", mock_ocean)
+    set_spy = AsyncMock(wraps=mock_ocean.app.cache_provider.set)
+    monkeypatch.setattr(mock_ocean.app.cache_provider, "set", set_spy)
+
+    @cache.cache_iterator_result()
+    async def sample_iterator(pages: int) -> AsyncGenerator[List[int], None]:
+        for _ in range(pages):
+            yield page
+
+    assert await collect_iterator_results(sample_iterator(5)) == page * 5
+    # The result exceeded the max size of the cache, so its pages were released instead of being cached
+    set_spy.assert_not_called()
+
+    assert await collect_iterator_results(sample_iterator(1)) == page
+    set_spy.assert_called_once()
@@ -0,0 +1,120 @@
+import asyncio
+import multiprocessing
+import os
+import pickle
+import struct
+import time
+from typing import Any
+
+from port_ocean.utils.ipc import FileIPC, PipeIPC
+
+
+def send_batches(ipc: PipeIPC, batches: int, delay: float) -> None:
+    for index in range(batches):
+        ipc.send(("batch", [{"identifier": f"{index}-{item}"} for item in range(1000)]))
+        time.sleep(delay)
+
+
+async def test_pipe_ipc_streams_objects_while_the_subprocess_runs() -> None:
+    ipc = PipeIPC()
+    process = multiprocessing.get_context("fork").Process(
+        target=send_batches, args=(ipc, 3, 0.2)
+    )
+    process.start()
+    ipc.close_sender()
+
+    received: list[Any] = []
+    first_received_while_running = None
+    async for message in ipc.receive():
+        if first_received_while_running is None:
+            first_received_while_running = process.is_alive()
+        received.append(message)
+    process.join()
+
+    assert first_received_while_running is True
+    assert [message[0] for message in received] == ["batch"] * 3
+    assert received[2][1][999] == {"identifier": "2-999"}
+
+
+async def test_pipe_ipc_ends_the_stream_when_the_subprocess_exits_without_sending() -> (
+    None
+):
+    ipc = PipeIPC()
+    process = multiprocessing.get_context("fork").Process(
+        target=send_batches, args=(ipc, 0, 0)
+    )
+    process.start()
+    ipc.close_sender()
+
+    received = [message async for message in ipc.receive()]
+    process.join()
+
+    assert received == []
+
+
+async def test_pipe_ipc_doesnt_block_the_event_loop_while_waiting() -> None:
+    ipc = PipeIPC()
+    process = multiprocessing.get_context("fork").Process(
+        target=send_batches, args=(ipc, 1, 0.3)
+    )
+    ticks = 0
+
+    async def tick() -> None:
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.01)
+
+    process.start()
+    ipc.close_sender()
+    tick_task = asyncio.create_task(tick())
+    received = [message async for message in ipc.receive()]
+    tick_task.cancel()
+    process.join()
+
+    assert len(received) == 1
+    assert ticks > 5
+
+
+async def test_file_ipc_saves_and_loads_off_the_event_loop() -> None:
+    file_ipc = FileIPC("test_file_ipc", "result", default_return=[])
+    assert await file_ipc.load_async() == []
+
+    await file_ipc.save_async({"entities": [1, 2, 3]})
+
+    assert await file_ipc.load_async() == {"entities": [1, 2, 3]}
+    file_ipc.delete()
+
+
+def send_frame_slowly(ipc: PipeIPC, delay: float) -> None:
+    # Writes a frame in two parts, like a large frame that doesn't fit in the pipe buffer
+    data = pickle.dumps({"identifier": "slow"})
+    fd = ipc._sender.fileno()
+    os.write(fd, struct.pack("!i", len(data)) + data[:5])
+    time.sleep(delay)
+    os.write(fd, data[5:])
+
+
+async def test_pipe_ipc_reads_frames_off_the_event_loop() -> None:
+    ipc = PipeIPC()
+    process = multiprocessing.get_context("fork").Process(
+        target=send_frame_slowly, args=(ipc, 0.5)
+    )
+    tick_times: list[float] = []
+
+    async def tick() -> None:
+        while True:
+            tick_times.append(time.monotonic())
+            await asyncio.sleep(0.01)
+
+    process.start()
+    ipc.close_sender()
+    tick_task = asyncio.create_task(tick())
+    received = [message async for message in ipc.receive()]
+    tick_task.cancel()
+    process.join()
+
+    assert received == [{"identifier": "slow"}]
+    assert (
+        max(later - earlier for earlier, later in zip(tick_times, tick_times[1:])) < 0.2
+    )
@@ -0,0 +1,23 @@
+import json
+from datetime import datetime
+
+from port_ocean.utils.serialization import dumps_json, loads_json
+
+
+def test_dumps_json_is_compact_and_round_trips() -> None:
+    value = {"identifier": "a", "properties": {"name": "ü", "values": [1, 2.5, None]}}
+
+    encoded = dumps_json(value)
+
+    assert isinstance(encoded, bytes)
+    assert b" " not in encoded
+    assert loads_json(encoded) == value
+    assert json.loads(encoded) == value
+
+
+def test_dumps_json_serializes_unknown_values_by_their_string() -> None:
+    created_at = datetime(2024, 1, 1)
+
+    assert loads_json(dumps_json({"created_at": created_at})) == {
+        "created_at": str(created_at)
+    }
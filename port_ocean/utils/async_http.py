@@ -3,17 +3,28 @@ from werkzeug.local import LocalStack, LocalProxy
 
 from port_ocean.context.ocean import ocean
 from port_ocean.helpers.async_client import OceanAsyncClient
+from port_ocean.helpers.response_cache import HttpResponseCacheStore
 from port_ocean.helpers.retry import RetryTransport
 
 _http_client: LocalStack[httpx.AsyncClient] = LocalStack()
 
 
+def _get_response_cache_store() -> HttpResponseCacheStore | None:
+    if not ocean.config.http_response_cache_enabled:
+        return None
+    return HttpResponseCacheStore(
+        f".ocean_cache/{ocean.config.integration.identifier}_http_responses.sqlite",
+        max_age_seconds=ocean.config.http_response_cache_max_age_seconds,
+    )
+
+
 def _get_http_client_context() -> httpx.AsyncClient:
     client = _http_client.top
     if client is None:
         client = OceanAsyncClient(
             RetryTransport,
             timeout=ocean.config.client_timeout,
+            response_cache_store=_get_response_cache_store(),
         )
         _http_client.push(client)
 
@@ -24,6 +35,8 @@ def _get_http_client_context() -> httpx.AsyncClient:
 Utilize this client for all outbound integration requests to the third-party application. It functions as a wrapper
 around the httpx.AsyncClient, incorporating retry logic at the transport layer for handling retries on 5xx errors and
 connection errors.
+When http_response_cache_enabled is set, GET responses are also revalidated with conditional requests and served from a
+local store when they weren't modified.
 
 The client is instantiated lazily, only coming into existence upon its initial access. It should not be closed when in
 use, as it operates as a singleton shared across all events in the thread. It also takes care of recreating the client
@@ -1,13 +1,25 @@
+import asyncio
 import functools
 import hashlib
 import base64
-from typing import Callable, AsyncIterator, Awaitable, Any
+from typing import Callable, AsyncGenerator, AsyncIterator, Awaitable, Any, TypeVar
+from weakref import WeakKeyDictionary
+from port_ocean.cache.base import CachePagesWriter, PagedCacheProvider
 from port_ocean.cache.errors import FailedToReadCacheError, FailedToWriteCacheError
+from port_ocean.cache.lru import LRUCacheProvider, estimate_size_in_bytes
+from port_ocean.context.event import event
 from port_ocean.context.ocean import ocean
+from port_ocean.exceptions.context import EventContextNotFoundError
 from loguru import logger
 
 AsyncIteratorCallable = Callable[..., AsyncIterator[list[Any]]]
 AsyncCallable = Callable[..., Awaitable[Any]]
+T = TypeVar("T")
+
+# The max number of pages a shared iteration fetches ahead of its slowest consumer
+SHARED_ITERATION_MAX_BUFFERED_PAGES = 10
+# Calls made in the scope of an event with this attribute don't read the cache, their results still replace it
+BYPASS_CACHE_ATTRIBUTE = "bypass_cache"
 
 
 def hash_func(function_name: str, *args: Any, **kwargs: Any) -> str:
@@ -24,6 +36,8 @@ def cache_iterator_result() -> Callable[[AsyncIteratorCallable], AsyncIteratorCa
     """
     This decorator caches the results of an async iterator function. It checks if the result is already in the cache
     and if not, it fetches the all the data and caches it at the end of the iteration.
+    Cache hits are yielded in the same pages as the original result, cache providers that store results as pages
+    (e.g. the disk cache) write the pages as they arrive and read them back one at a time.
 
     The cache will be stored in the scope of the running event and will be removed when the event is finished.
     If a database is configured, the cache will also be stored in the database.
@@ -46,36 +60,285 @@ def cache_iterator_result() -> Callable[[AsyncIteratorCallable], AsyncIteratorCa
         @functools.wraps(func)
         async def wrapper(*args: Any, **kwargs: Any) -> Any:
             cache_key = hash_func(func.__name__, *args, **kwargs)
+            bypass_cache = _should_bypass_cache()
+            in_flight_key = _get_in_flight_key(cache_key, bypass_cache)
+            in_flight_iterations = _get_in_flight(_in_flight_iterations)
 
-            # Check if the result is already in the cache
-            try:
-                if cache := await ocean.app.cache_provider.get(cache_key):
-                    yield cache
+            # Concurrent calls with the same arguments share a single iteration
+            if (iteration := in_flight_iterations.get(in_flight_key)) is not None:
+                if iteration.can_join:
+                    async for page in iteration.join():
+                        yield page
                     return
-            except FailedToReadCacheError as e:
-                logger.warning(f"Failed to read cache for {cache_key}: {str(e)}")
+                # The iteration released pages that this call missed, it reads the cached result once it completes
+                await iteration.wait()
 
-            # If not in cache, fetch the data
-            cached_results = list()
-            async for result in func(*args, **kwargs):
-                cached_results.extend(result)
-                yield result
-
-            # Cache the results
-            try:
-                await ocean.app.cache_provider.set(
+            iteration = _SharedIteration(
+                _iterate_with_cache(
                     cache_key,
-                    cached_results,
+                    lambda: func(*args, **kwargs),
+                    read_cache=not bypass_cache,
                 )
-            except FailedToWriteCacheError as e:
-                logger.warning(f"Failed to write cache for {cache_key}: {str(e)}")
-            return
+            )
+            in_flight_iterations[in_flight_key] = iteration
+            iteration.on_done(
+                lambda: _remove_in_flight(
+                    in_flight_iterations, in_flight_key, iteration
+                )
+            )
+            async for page in iteration.join():
+                yield page
 
         return wrapper
 
     return decorator
 
 
+def _should_bypass_cache() -> bool:
+    try:
+        return bool(event.attributes.get(BYPASS_CACHE_ATTRIBUTE))
+    except EventContextNotFoundError:
+        return False
+
+
+def _get_in_flight_key(cache_key: str, bypass_cache: bool) -> str:
+    """Calls that bypass the cache don't share the calls that may read it"""
+    return f"{cache_key}_bypass" if bypass_cache else cache_key
+
+
+def _get_in_flight(
+    registry: "WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, T]]",
+) -> dict[str, T]:
+    """Get the in flight calls of the running event loop, futures and tasks can't be shared between loops"""
+    return registry.setdefault(asyncio.get_running_loop(), {})
+
+
+def _remove_in_flight(in_flight: dict[str, T], cache_key: str, value: T) -> None:
+    if in_flight.get(cache_key) is value:
+        del in_flight[cache_key]
+
+
+class _SharedIteration:
+    """
+    Fans out the pages of a single iteration to every consumer that joins it.
+
+    With several consumers the iteration runs ahead of its slowest consumer by at most
+    SHARED_ITERATION_MAX_BUFFERED_PAGES pages, while a single consumer gets the next page only once it asks for it,
+    like a call of its own. Pages are released once every consumer read them. Consumers can join until the first
+    page is released, and the iteration stops once all of its consumers left, so a result that wasn't fully
+    consumed isn't cached.
+    """
+
+    def __init__(self, source: AsyncGenerator[list[Any], None]) -> None:
+        self._source = source
+        self._pages: list[list[Any]] = []
+        # The index of the first page in the buffer, the pages before it were released
+        self._released = 0
+        self._positions: dict[object, int] = {}
+        # The consumers that are waiting for a page
+        self._waiting: set[object] = set()
+        self._done = False
+        self._error: BaseException | None = None
+        self._condition = asyncio.Condition()
+        self._producer = asyncio.create_task(self._produce())
+
+    @property
+    def can_join(self) -> bool:
+        return self._released == 0 and not self._done
+
+    def on_done(self, callback: Callable[[], Any]) -> None:
+        self._producer.add_done_callback(lambda _: callback())
+
+    async def wait(self) -> None:
+        await asyncio.wait({self._producer})
+
+    def _release_read_pages(self) -> None:
+        if not self._positions:
+            return
+        released = min(self._positions.values())
+        del self._pages[: released - self._released]
+        self._released = released
+
+    def _should_produce(self) -> bool:
+        if not self._positions:
+            return True
+        if len(self._pages) >= SHARED_ITERATION_MAX_BUFFERED_PAGES:
+            return False
+        return len(self._positions) > 1 or any(
+            self._positions[consumer] >= self._released + len(self._pages)
+            for consumer in self._waiting
+        )
+
+    async def _produce(self) -> None:
+        try:
+            async for page in self._source:
+                async with self._condition:
+                    self._pages.append(page)
+                    self._condition.notify_all()
+                    await self._condition.wait_for(self._should_produce)
+                    if not self._positions:
+                        break
+        except BaseException as e:
+            self._error = e
+            if not isinstance(e, Exception):
+                raise
+        finally:
+            await self._source.aclose()
+            async with self._condition:
+                self._done = True
+                self._condition.notify_all()
+
+    def join(self) -> AsyncIterator[list[Any]]:
+        consumer = object()
+        self._positions[consumer] = self._released
+        return self._consume(consumer)
+
+    async def _consume(self, consumer: object) -> AsyncIterator[list[Any]]:
+        try:
+            while True:
+                async with self._condition:
+                    self._waiting.add(consumer)
+                    # Wakes up the producer in case the consumer read all of its pages
+                    self._condition.notify_all()
+                    try:
+                        await self._condition.wait_for(
+                            lambda: self._positions[consumer]
+                            < self._released + len(self._pages)
+                            or self._done
+                        )
+                    finally:
+                        self._waiting.discard(consumer)
+                    position = self._positions[consumer]
+                    if position >= self._released + len(self._pages):
+                        if self._error is not None:
+                            raise self._error
+                        return
+                    page = self._pages[position - self._released]
+                    self._positions[consumer] = position + 1
+                    self._release_read_pages()
+                    self._condition.notify_all()
+                yield page
+        finally:
+            async with self._condition:
+                self._positions.pop(consumer, None)
+                self._release_read_pages()
+                self._condition.notify_all()
+
+
+# The in flight calls and iterations of the decorated functions, by their cache key
+_in_flight_calls: (
+    "WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, asyncio.Task[Any]]]"
+) = WeakKeyDictionary()
+_in_flight_iterations: (
+    "WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, _SharedIteration]]"
+) = WeakKeyDictionary()
+
+
+async def _iterate_with_cache(
+    cache_key: str, fetch: AsyncIteratorCallable, read_cache: bool = True
+) -> AsyncGenerator[list[Any], None]:
+    cache_provider = ocean.app.cache_provider
+    if isinstance(cache_provider, PagedCacheProvider):
+        async for page in _iterate_with_paged_cache(
+            cache_provider, cache_key, fetch, read_cache
+        ):
+            yield page
+        return
+
+    # Check if the result is already in the cache
+    try:
+        if read_cache and (cache := await cache_provider.get(cache_key)):
+            for page in cache:
+                yield page
+            return
+    except FailedToReadCacheError as e:
+        logger.warning(f"Failed to read cache for {cache_key}: {str(e)}")
+
+    # If not in cache, fetch the data. A size bounded cache would skip a result larger than its max size,
+    # so the pages stop being buffered once they exceed it
+    max_size_in_bytes = (
+        cache_provider.max_size_in_bytes
+        if isinstance(cache_provider, LRUCacheProvider)
+        else None
+    )
+    cached_pages: list[list[Any]] | None = list()
+    size_in_bytes = 0
+    async for result in fetch():
+        if cached_pages is not None:
+            cached_pages.append(result)
+            if max_size_in_bytes is not None:
+                size_in_bytes += estimate_size_in_bytes(result)
+                if size_in_bytes > max_size_in_bytes:
+                    logger.debug(
+                        f"Skipping caching {cache_key}, its size exceeds the max cache size",
+                        max_size_in_bytes=max_size_in_bytes,
+                    )
+                    cached_pages = None
+        yield result
+
+    if cached_pages is None:
+        return
+
+    # Cache the results
+    try:
+        await cache_provider.set(
+            cache_key,
+            cached_pages,
+        )
+    except FailedToWriteCacheError as e:
+        logger.warning(f"Failed to write cache for {cache_key}: {str(e)}")
+
+
+async def _iterate_with_paged_cache(
+    cache_provider: PagedCacheProvider,
+    cache_key: str,
+    fetch: AsyncIteratorCallable,
+    read_cache: bool = True,
+) -> AsyncIterator[list[Any]]:
+    """
+    Replay the cached pages of a result one at a time, or fetch the result and write its pages
+    to the cache as they arrive. The result is cached only when the iteration completes.
+    """
+    pages_yielded = 0
+    try:
+        if (
+            read_cache
+            and (cached_pages := await cache_provider.get_pages(cache_key)) is not None
+        ):
+            async for page in cached_pages:
+                yield page
+                pages_yielded += 1
+            return
+    except FailedToReadCacheError as e:
+        # The pages that were already yielded can't be taken back
+        if pages_yielded:
+            raise
+        logger.warning(f"Failed to read cache for {cache_key}: {str(e)}")
+
+    writer: CachePagesWriter | None = cache_provider.open_pages_writer(cache_key)
+    try:
+        async for page in fetch():
+            if writer:
+                try:
+                    await writer.append(page)
+                except FailedToWriteCacheError as e:
+                    logger.warning(f"Failed to write cache for {cache_key}: {str(e)}")
+                    await writer.abort()
+                    writer = None
+            yield page
+
+        if writer:
+            try:
+                await writer.commit()
+            except FailedToWriteCacheError as e:
+                logger.warning(f"Failed to write cache for {cache_key}: {str(e)}")
+                await writer.abort()
+            writer = None
+    finally:
+        if writer:
+            await writer.abort()
+
+
 def cache_coroutine_result() -> Callable[[AsyncCallable], AsyncCallable]:
     """Coroutine version of `cache_iterator_result` from port_ocean.utils.cache
 
@@ -96,11 +359,13 @@ def cache_coroutine_result() -> Callable[[AsyncCallable], AsyncCallable]:
     """
 
     def decorator(func: AsyncCallable) -> AsyncCallable:
-        @functools.wraps(func)
-        async def wrapper(*args: Any, **kwargs: Any) -> Any:
-            cache_key = hash_func(func.__name__, *args, **kwargs)
+        async def fetch_and_cache(
+            cache_key: str, read_cache: bool, *args: Any, **kwargs: Any
+        ) -> Any:
             try:
-                if cache := await ocean.app.cache_provider.get(cache_key):
+                if read_cache and (
+                    cache := await ocean.app.cache_provider.get(cache_key)
+                ):
                     return cache
             except FailedToReadCacheError as e:
                 logger.warning(f"Failed to read cache for {cache_key}: {str(e)}")
@@ -115,6 +380,25 @@ def cache_coroutine_result() -> Callable[[AsyncCallable], AsyncCallable]:
                 logger.warning(f"Failed to write cache for {cache_key}: {str(e)}")
             return result
 
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            cache_key = hash_func(func.__name__, *args, **kwargs)
+            bypass_cache = _should_bypass_cache()
+            in_flight_key = _get_in_flight_key(cache_key, bypass_cache)
+            in_flight_calls = _get_in_flight(_in_flight_calls)
+
+            # Concurrent calls with the same arguments await the same call, which keeps running
+            # for the rest of the callers when one of them is cancelled
+            if (call := in_flight_calls.get(in_flight_key)) is None:
+                call = asyncio.create_task(
+                    fetch_and_cache(cache_key, not bypass_cache, *args, **kwargs)
+                )
+                in_flight_calls[in_flight_key] = call
+                call.add_done_callback(
+                    lambda task: _remove_in_flight(in_flight_calls, in_flight_key, task)
+                )
+            return await asyncio.shield(call)
+
         return wrapper
 
     return decorator
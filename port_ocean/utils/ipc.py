@@ -1,6 +1,8 @@
+import asyncio
+import multiprocessing
 import pickle
 import os
-from typing import Any
+from typing import Any, AsyncIterator
 
 
 class FileIPC:
@@ -16,8 +18,11 @@ class FileIPC:
         self.delete()
 
     def save(self, object: Any) -> None:
-        with open(self.file_path, "wb") as f:
-            pickle.dump(object, f)
+        # Written to a temporary file and renamed, so a reader never loads a partially written file
+        temp_path = f"{self.file_path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as f:
+            pickle.dump(object, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, self.file_path)
 
     def load(self) -> Any:
         if not os.path.exists(self.file_path):
@@ -25,6 +30,69 @@ class FileIPC:
         with open(self.file_path, "rb") as f:
             return pickle.load(f)
 
+    async def save_async(self, object: Any) -> None:
+        """Save off the event loop, large objects take a while to pickle and write"""
+        await asyncio.to_thread(self.save, object)
+
+    async def load_async(self) -> Any:
+        return await asyncio.to_thread(self.load)
+
     def delete(self) -> None:
         if os.path.exists(self.file_path):
             os.remove(self.file_path)
+
+
+class PipeIPC:
+    """
+    Streams objects from a forked subprocess to its parent through a pipe.
+
+    Every object is pickled to a length prefixed frame of its own as soon as it's sent, so the parent consumes
+    the results while the subprocess still produces them, without writing them to the disk. The parent is woken
+    up by the event loop when a frame starts arriving and reads it in a thread, and the stream ends once the
+    subprocess exits and its end of the pipe is closed.
+    """
+
+    def __init__(self) -> None:
+        self._receiver, self._sender = multiprocessing.Pipe(duplex=False)
+
+    def send(self, value: Any) -> None:
+        """Send an object to the parent, blocks while the pipe is full"""
+        self._sender.send(value)
+
+    def close_sender(self) -> None:
+        """
+        Close the end of the pipe of the parent once the subprocess started,
+        otherwise the stream doesn't end when the subprocess exits
+        """
+        self._sender.close()
+
+    async def _wait_until_readable(self) -> None:
+        loop = asyncio.get_running_loop()
+        readable: asyncio.Future[None] = loop.create_future()
+        fd = self._receiver.fileno()
+
+        def on_readable() -> None:
+            if not readable.done():
+                readable.set_result(None)
+
+        loop.add_reader(fd, on_readable)
+        try:
+            await readable
+        finally:
+            loop.remove_reader(fd)
+
+    async def receive(self) -> AsyncIterator[Any]:
+        """Yield the objects sent by the subprocess until it closes its end of the pipe"""
+        try:
+            while True:
+                # poll returns True at the end of the stream as well
+                if not self._receiver.poll():
+                    await self._wait_until_readable()
+                try:
+                    # A frame may be large and arrive in parts, so it's read off the event loop
+                    value = await asyncio.to_thread(self._receiver.recv)
+                except EOFError:
+                    return
+                yield value
+        finally:
+            self._receiver.close()
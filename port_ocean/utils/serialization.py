@@ -0,0 +1,27 @@
+import json
+from typing import Any, Callable
+
+try:
+    import orjson  # type: ignore[import-not-found, unused-ignore]
+except ImportError:
+    orjson = None  # type: ignore[assignment, unused-ignore]
+
+
+def dumps_json(value: Any, default: Callable[[Any], Any] | None = str) -> bytes:
+    """
+    Serialize a value to compact JSON bytes.
+    orjson is used when it's installed, since it's several times faster than the standard json module
+    and encodes straight to bytes. Values that aren't JSON serializable are serialized by `default`,
+    their string by default, and raise a TypeError when it's None.
+    """
+    if orjson is not None:
+        return orjson.dumps(value, default=default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(
+        value, default=default, ensure_ascii=False, separators=(",", ":")
+    ).encode()
+
+
+def loads_json(value: bytes | str) -> Any:
+    if orjson is not None:
+        return orjson.loads(value)
+    return json.loads(value)
@@ -0,0 +1,111 @@
+"""
+Benchmark the throughput of the disk cache with every serializer, and how long it blocks the event loop.
+
+Usage:
+    python scripts/benchmark-disk-cache.py [--items 200000] [--page-size 100]
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+from typing import Any, Awaitable, Callable
+
+from port_ocean.cache.disk import DiskCacheProvider
+from port_ocean.core.models import CachingSerializer
+
+try:
+    import orjson  # type: ignore[import-not-found, unused-ignore]
+except ImportError:
+    orjson = None  # type: ignore[assignment, unused-ignore]
+
+
+def generate_items(count: int) -> list[dict[str, Any]]:
+    return [
+        {
+            "id": index,
+            "name": f"project-{index}",
+            "description": "A project that is used to benchmark the disk cache " * 2,
+            "tags": [f"tag-{tag}" for tag in range(5)],
+            "owner": {"id": index % 100, "login": f"user-{index % 100}"},
+            "archived": index % 7 == 0,
+        }
+        for index in range(count)
+    ]
+
+
+async def measure(operation: Callable[[], Awaitable[Any]]) -> tuple[float, float]:
+    """Return the duration of the operation and the longest time the event loop was blocked while it ran"""
+    max_lag = 0.0
+    running = True
+
+    async def monitor_lag() -> None:
+        nonlocal max_lag
+        while running:
+            started_at = time.perf_counter()
+            await asyncio.sleep(0.001)
+            max_lag = max(max_lag, time.perf_counter() - started_at - 0.001)
+
+    monitor = asyncio.create_task(monitor_lag())
+    await asyncio.sleep(0)
+    started_at = time.perf_counter()
+    await operation()
+    duration = time.perf_counter() - started_at
+    running = False
+    await monitor
+    return duration, max_lag
+
+
+async def benchmark(
+    serializer: CachingSerializer, items: list[dict[str, Any]], page_size: int
+) -> None:
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = DiskCacheProvider(cache_dir=cache_dir, serializer=serializer)
+
+        set_duration, set_lag = await measure(lambda: cache.set("value", items))
+        get_duration, get_lag = await measure(lambda: cache.get("value"))
+
+        async def write_pages() -> None:
+            writer = cache.open_pages_writer("pages")
+            for start in range(0, len(items), page_size):
+                await writer.append(items[start : start + page_size])
+            await writer.commit()
+
+        async def read_pages() -> None:
+            pages = await cache.get_pages("pages")
+            assert pages is not None
+            async for _ in pages:
+                pass
+
+        write_pages_duration, write_pages_lag = await measure(write_pages)
+        read_pages_duration, read_pages_lag = await measure(read_pages)
+
+    for operation, duration, lag in (
+        ("set", set_duration, set_lag),
+        ("get", get_duration, get_lag),
+        ("write pages", write_pages_duration, write_pages_lag),
+        ("read pages", read_pages_duration, read_pages_lag),
+    ):
+        print(
+            f"{serializer:<8}{operation:<13}{len(items) / duration:>14,.0f} items/s"
+            f"{duration * 1000:>10.0f} ms{lag * 1000:>10.1f} ms"
+        )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=200_000)
+    parser.add_argument("--page-size", type=int, default=100)
+    args = parser.parse_args()
+
+    items = generate_items(args.items)
+    print(f"{args.items} items, orjson {'installed' if orjson else 'not installed'}")
+    print(
+        f"{'':<8}{'operation':<13}{'throughput':>20}{'duration':>13}{'max loop lag':>13}"
+    )
+    for serializer in CachingSerializer:
+        await benchmark(serializer, items, args.page_size)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())